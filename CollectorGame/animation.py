@@ -0,0 +1,62 @@
+"""
+animation.py -- global animation clock
+======================================
+This is module, which turns elapsed time into frame indices of animated
+sprite sequences.
+
+Clock is ticked once per rendered frame and updates current frame of
+every registered sequence, so animation costs O(number of sequences) per
+frame. Game objects only look their frame up (with their own phase).
+"""
+
+from typing import Dict, List
+
+import CollectorGame.utils as ut
+import CollectorGame.images as images
+
+
+# sequences registered by register_defaults()
+ANIMATED: List[str] = ['MAN_IMG', 'LMAN_IMG', 'FMAN_IMG', 'MONEY_IMG',
+                       'ENEMY_IMG', 'BBOMB_IMG', 'BOOM_IMG']
+
+
+class AnimationClock:
+    """Time-based source of frame indices for sprite sequences"""
+
+    def __init__(self, fps: float = ut.ANIMATION_FPS) -> None:
+        """Initialise clock with given number of sprite frames per second"""
+        self.fps: float = fps
+        self.step: int = 0
+        # id(sequence) -> sequence / its current frame index
+        self.sequences: Dict[int, List[ut.Image]] = {}
+        self.frames: Dict[int, int] = {}
+
+    def register(self, sequence: List[ut.Image]) -> None:
+        """Add sequence, whose frame index is computed on every tick"""
+        self.sequences[id(sequence)] = sequence
+        self.frames[id(sequence)] = self.step % len(sequence)
+
+    def register_defaults(self) -> None:
+        """Register all animated sequences of the game"""
+        for name in ANIMATED:
+            self.register(images.load(name))
+
+    def tick(self, now_ms: int) -> None:
+        """Update frame indices for given time (in milliseconds)"""
+        step = int(now_ms * self.fps / 1000)
+        if step == self.step:
+            return
+        self.step = step
+        frames = self.frames
+        for key, sequence in self.sequences.items():
+            frames[key] = step % len(sequence)
+
+    def frame(self, sequence: List[ut.Image], phase: int = 0) -> ut.Image:
+        """Get current frame of sequence shifted by object's phase"""
+        idx = self.frames.get(id(sequence))
+        if idx is None:
+            idx = self.step  # sequence is not registered
+        return sequence[(idx + phase) % len(sequence)]
+
+
+CLOCK: AnimationClock = AnimationClock()
@@ -0,0 +1,77 @@
+"""
+assets.py -- background asset loading
+=====================================
+This is module, which loads sprites, fonts and dialogs on a background
+thread, so the game window can be shown right away.
+
+Sprites of the first level are loaded first; as soon as they are ready
+the game may start, while GUI images and dialog fonts keep loading.
+"""
+
+import threading
+from typing import List, Optional
+
+import CollectorGame.utils as ut
+import CollectorGame.images as images
+import CollectorGame.gui as gui
+
+
+class AssetLoader:
+    """Background loader of all game resources"""
+
+    def __init__(self) -> None:
+        """Initialise loader (nothing is loaded until start())"""
+        self.image_names: List[str] = images.all_names()
+        self.total: int = len(self.image_names) + 1  # +1 for dialogs
+        self.done: int = 0
+        self.first_level_ready: threading.Event = threading.Event()
+        self.all_ready: threading.Event = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start loading in background thread"""
+        self.thread = threading.Thread(target=self.run, name='assets',
+                                       daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        """Load everything (runs in background thread)"""
+        try:
+            images.preload(self.image_names, self.on_loaded)
+            self.prepare_dialogs()
+            self.done += 1
+        except BaseException as error:
+            self.error = error
+            raise
+        finally:
+            # on error the game falls back to loading on first access
+            self.first_level_ready.set()
+            self.all_ready.set()
+
+    def on_loaded(self, name: str) -> None:
+        """Count loaded image and check if the first level can start"""
+        self.done += 1
+        if all(images.is_loaded(name) for name in images.FIRST_LEVEL):
+            self.first_level_ready.set()
+
+    def prepare_dialogs(self) -> None:
+        """Build every dialog once, so fonts for them get cached"""
+        gui.CloseDialog()
+        gui.HelpScreen()
+        for text in ut.UselessAdvices:
+            gui.SplashScreen('Поражение', 'Вы проиграли',
+                             'СОВЕТ:' + text)
+        for text in ut.UselessCongrats:
+            for title in ['Вы собрали всё золото!',
+                          'Вы зверски всех убили!',
+                          'Вы достигли цели!']:
+                gui.SplashScreen('Победа', title, text)
+
+    def progress(self) -> float:
+        """Get loaded fraction of all resources (from 0 to 1)"""
+        return min(1.0, self.done / self.total)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything is loaded"""
+        return self.all_ready.wait(timeout)
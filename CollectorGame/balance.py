@@ -0,0 +1,249 @@
+"""
+balance.py -- Monte Carlo difficulty estimation
+===============================================
+This is module, which rates difficulty of levels by letting the reference
+bot (bot.AutoPilot) play them many times in parallel processes.
+
+Win rate is estimated with Wilson confidence interval and time to win
+with normal one. Games are played in batches until the interval gets
+narrow enough, so easy and hopeless levels are rated quickly. Generator
+parameters (ut.LevelConfig) may also be searched for target win rate.
+
+Handmade levels are sent to worker processes as Level tuples, which keep
+terrain, gold, enemies and start of player (other map objects, e.g.
+bombs, are not sent).
+"""
+
+import argparse
+import math
+import multiprocessing
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import CollectorGame.utils as ut
+import CollectorGame.objects as objs
+import CollectorGame.terrain as terrain
+import CollectorGame.modes as modes
+import CollectorGame.bot as bot
+
+
+# z-score of 95% confidence
+Z_95: float = 1.96
+
+
+class Estimate(NamedTuple):
+    """Difficulty of level (or level generator)"""
+    config: ut.LevelConfig
+    games: int
+    wins: int
+    win_rate: float
+    win_low: float
+    win_high: float
+    mean_ticks: float  # mean time to win (in ticks)
+    ticks_margin: float  # half-width of its confidence interval
+
+
+class Level(NamedTuple):
+    """Handmade level, which can be sent to worker processes"""
+    terrain: terrain.TerrainGrid
+    gold: List[Tuple[ut.Coord, int]]  # gold objects: positions and values
+    enemies: List[Tuple[ut.Coord, ut.Coord]]  # positions and speeds
+    player: ut.Coord
+
+
+class Job(NamedTuple):
+    """One simulated game"""
+    config: ut.LevelConfig
+    level_seed: int
+    bot_seed: int
+    noise: float
+    max_ticks: int
+    level: Optional[Level] = None
+
+
+def level_of(game: modes.CollectorGame) -> Level:
+    """Get current level of the game (without bombs and other objects)"""
+    return Level(game.terrain.copy(),
+                 [(map_object.pos, map_object.inc_val)
+                  for map_object in game.level_map or ()
+                  if isinstance(map_object, objs.Gold)],
+                 [(enemy.pos, enemy.speed) for enemy in game.enemies or ()],
+                 game.player.pos)
+
+
+def build(level: Level, config: ut.LevelConfig) -> modes.CollectorGame:
+    """Create game on handmade level"""
+    game = modes.CollectorGame(level_config=config)
+    game.terrain = level.terrain.copy()
+    game.level_map = [objs.Gold(pos, value) for pos, value in level.gold]
+    game.enemies = [objs.Enemy(pos, speed) for pos, speed in level.enemies]
+    game.tempies = []
+    game.init_map = [m.copy() for m in game.level_map]
+    game.init_terrain = game.terrain.copy()
+    game.init_enemies = [e.copy() for e in game.enemies]
+    game.player.pos = game.player.init_pos = level.player
+    game.count_level()
+    return game
+
+
+def simulate(job: Job) -> Tuple[bool, int]:
+    """Play one game with reference bot; return (won, ticks)"""
+    if job.level is None:
+        game = modes.CollectorGame(level_config=job.config)
+        game.rng.seed(job.level_seed)
+        game.init_level()
+    else:
+        game = build(job.level, job.config)
+    pilot = bot.AutoPilot(noise=job.noise, seed=job.bot_seed)
+    return bot.play(game, job.max_ticks, pilot)
+
+
+def wilson(wins: int, games: int, z: float = Z_95) -> Tuple[float, float]:
+    """Get Wilson score interval of win rate"""
+    if games == 0:
+        return 0.0, 1.0
+    rate = wins / games
+    denominator = 1 + z * z / games
+    centre = (rate + z * z / (2 * games)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / games +
+                           z * z / (4 * games * games)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def summarize(config: ut.LevelConfig, results: List[Tuple[bool, int]],
+              z: float = Z_95) -> Estimate:
+    """Build estimate from results of played games"""
+    wins = [ticks for won, ticks in results if won]
+    low, high = wilson(len(wins), len(results), z)
+    mean = sum(wins) / len(wins) if wins else 0.0
+    margin = 0.0
+    if len(wins) > 1:
+        variance = sum((ticks - mean) ** 2 for ticks in wins) / (len(wins)-1)
+        margin = z * math.sqrt(variance / len(wins))
+    return Estimate(config, len(results), len(wins),
+                    len(wins) / len(results) if results else 0.0,
+                    low, high, mean, margin)
+
+
+def jobs(config: ut.LevelConfig, seed: int, level_seed: Optional[int],
+         noise: float, max_ticks: int,
+         level: Optional[Level] = None) -> Iterator[Job]:
+    """Generate games: new level every game, or the same one if given"""
+    idx = 0
+    while True:
+        game_seed = seed * 1000003 + idx
+        yield Job(config, game_seed if level_seed is None else level_seed,
+                  game_seed, noise, max_ticks, level)
+        idx += 1
+
+
+def estimate(config: ut.LevelConfig = ut.LevelConfig(),
+             level_seed: Optional[int] = None,
+             tolerance: float = 0.03,
+             min_games: int = 64,
+             max_games: int = 4096,
+             batch: int = 64,
+             processes: Optional[int] = None,
+             noise: float = 0.05,
+             max_ticks: int = 2000,
+             seed: int = 0,
+             level: Optional[modes.CollectorGame] = None) -> Estimate:
+    """Estimate difficulty of generator config (or of one its level)
+
+    Games are played until half-width of win rate interval gets below
+    tolerance or max_games are played. Processes are worker processes
+    (None means one per CPU, 0 means playing in this process). If game
+    is given as level, its current level is rated (see level_of).
+    """
+    pool = None
+    if processes != 0:
+        pool = multiprocessing.Pool(processes)
+    try:
+        source = jobs(config, seed, level_seed, noise, max_ticks,
+                      level_of(level) if level is not None else None)
+        results: List[Tuple[bool, int]] = []
+        while len(results) < max_games:
+            size = min(batch, max_games - len(results))
+            next_jobs = [next(source) for _ in range(size)]
+            if pool is None:
+                results.extend(map(simulate, next_jobs))
+            else:
+                results.extend(pool.imap_unordered(simulate, next_jobs,
+                                                   chunksize=8))
+            current = summarize(config, results)
+            if len(results) >= min_games and \
+               (current.win_high - current.win_low) / 2 < tolerance:
+                break
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return summarize(config, results)
+
+
+def search(target: float, field: str = 'enemies',
+           low: int = 0, high: int = 40,
+           config: ut.LevelConfig = ut.LevelConfig(),
+           **options) -> Estimate:
+    """Find value of config field, which gives win rate closest to target
+
+    Win rate should fall as the field grows (like for enemies or spikes),
+    so the value is found by binary search. Options go to estimate().
+    """
+    best: Optional[Estimate] = None
+    while low <= high:
+        middle = (low + high) // 2
+        current = estimate(config._replace(**{field: middle}), **options)
+        if best is None or \
+           abs(current.win_rate - target) < abs(best.win_rate - target):
+            best = current
+        if current.win_rate > target:
+            low = middle + 1
+        else:
+            high = middle - 1
+    assert best is not None
+    return best
+
+
+def format_estimate(result: Estimate) -> str:
+    """Format estimate as one line of text"""
+    return ('{}: win rate {:.3f} [{:.3f}, {:.3f}] in {} games, '
+            'time to win {:.1f} +- {:.1f} ticks').format(
+                dict(result.config._asdict()), result.win_rate,
+                result.win_low, result.win_high, result.games,
+                result.mean_ticks, result.ticks_margin)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Rate level generator (or search it) from command line"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    defaults = ut.LevelConfig()
+    for field in ut.LevelConfig._fields:
+        parser.add_argument('--' + field, type=int,
+                            default=getattr(defaults, field))
+    parser.add_argument('--level-seed', type=int, default=None,
+                        help='rate one level instead of the generator')
+    parser.add_argument('--tolerance', type=float, default=0.03)
+    parser.add_argument('--max-games', type=int, default=4096)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--target', type=float, default=None,
+                        help='search --field for this win rate')
+    parser.add_argument('--field', default='enemies',
+                        choices=ut.LevelConfig._fields)
+    options = parser.parse_args(args)
+
+    config = ut.LevelConfig(*(getattr(options, field)
+                              for field in ut.LevelConfig._fields))
+    kwargs = dict(level_seed=options.level_seed,
+                  tolerance=options.tolerance,
+                  max_games=options.max_games,
+                  processes=options.processes)
+    if options.target is None:
+        result = estimate(config, **kwargs)
+    else:
+        result = search(options.target, options.field, config=config,
+                        **kwargs)
+    print(format_estimate(result))
+
+
+if __name__ == '__main__':
+    main()
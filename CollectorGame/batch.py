@@ -0,0 +1,583 @@
+"""
+batch.py -- batched simulation of many boards
+=============================================
+This is module, which steps many independent CollectorGame boards at once.
+All boards are kept in stacked NumPy arrays (tiles of terrain with the
+bits of terrain.py, fixed slots for enemies, bombs and explosions, one
+entry per board for the player), and every rule of objects.py is applied
+to all of them with a handful of vectorized operations per tick.
+
+Rules follow the object engine tick by tick: objects' actions (walls stop
+them), player's move, terrain (spikes, then gold), bombs in order of
+placement, explosions and enemies in their order. Limitations: only RECT
+field bounds are supported, and walls, spikes and gold must be in terrain.
+"""
+
+import time
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # numpy is needed only for this module
+    np = None
+
+import CollectorGame.utils as ut
+import CollectorGame.objects as objs
+import CollectorGame.modes as modes
+import CollectorGame.env as env
+from CollectorGame.terrain import WALL, SUPER_WALL, SPIKES, TRIGGERED, \
+    ARMED, GOLD_SHIFT, GOLD_MASK
+
+
+# masks clearing bits of tile (uint8 arrays do not take negative numbers)
+NO_WALL: int = 0xff ^ WALL
+NO_GOLD: int = 0xff ^ GOLD_MASK
+DISARMED: int = 0xff ^ (ARMED | TRIGGERED)
+
+# the same as defaults of objects.py
+BOMB_RANGE: int = 2
+EXPLOSION_TICKS: int = 7
+
+# state of one board, comparable with game_state() of CollectorGame
+BoardState = Tuple[Any, ...]
+
+
+def _cross_offsets() -> Tuple[Any, Any]:
+    """Get offsets of tiles covered by cross explosion (each once)"""
+    deltas = [(0, 0)]
+    for delta in range(1, BOMB_RANGE + 1):
+        deltas += [(-delta, 0), (delta, 0), (0, -delta), (0, delta)]
+    return (np.array([dx for dx, dy in deltas]),
+            np.array([dy for dx, dy in deltas]))
+
+
+def game_state(game: modes.CollectorGame) -> BoardState:
+    """Get state of CollectorGame in the form of BatchGame.state()
+
+    Only terrain is taken: walls, spikes and gold left as objects are not.
+    """
+    player = game.player
+    bombs = [(map_object.pos, map_object.duration)
+             for map_object in game.level_map or ()
+             if isinstance(map_object, objs.Bomb)]
+    explosions = sorted((effect.pos, effect.duration[0])
+                        for effect in game.tempies or ()
+                        if isinstance(effect, objs.Explosion))
+    return ((player.pos, player.speed, player.sight, player.gold,
+             player.bombs, player.is_dead),
+            tuple((enemy.pos, enemy.speed, enemy.slow_count)
+                  for enemy in game.enemies or ()),
+            tuple(game.terrain.tiles()), tuple(bombs), tuple(explosions),
+            game.gold_left, game.enemies_left)
+
+
+class BatchGame:
+    """Many CollectorGame boards simulated together"""
+
+    def __init__(self, boards: int,
+                 level_config: ut.LevelConfig = ut.LevelConfig(),
+                 max_ticks: int = 1000,
+                 win_mode: ut.WinCondition = ut.WinCondition.COLLECT_ALL,
+                 enemies: Optional[int] = None,
+                 bombs: int = ut.PLAYER_CONFIG[1][1]) -> None:
+        """Initialise boards (all empty until reset or load)
+
+        Enemies and bombs are numbers of slots on every board (by default
+        the number of enemies of level_config and player's bombs).
+        """
+        if np is None:
+            raise ImportError('BatchGame requires numpy')
+
+        self.boards: int = boards
+        self.width, self.height = ut.BSIZE
+        self.level_config: ut.LevelConfig = level_config
+        self.max_ticks: int = max_ticks
+        self.win_mode: ut.WinCondition = win_mode
+        self.generator: modes.CollectorGame = modes.CollectorGame(
+            level_config=level_config)
+        grid = (boards, self.height, self.width)
+        slots = level_config.enemies if enemies is None else enemies
+        self.cross_x, self.cross_y = _cross_offsets()
+        self.base = np.arange(boards) * (self.width * self.height)
+
+        # terrain (bits of terrain.py)
+        self.tiles = np.zeros(grid, np.uint8)
+        self.pending = np.full(boards, -1)  # triggered spikes (flat index)
+
+        # enemies
+        self.enemy_x = np.zeros((boards, slots), np.int64)
+        self.enemy_y = np.zeros((boards, slots), np.int64)
+        self.enemy_vx = np.zeros((boards, slots), np.int64)
+        self.enemy_vy = np.zeros((boards, slots), np.int64)
+        self.enemy_slow = np.zeros((boards, slots), np.int64)
+        self.enemy_alive = np.zeros((boards, slots), bool)
+        self.killed = np.zeros((boards, slots), bool)
+
+        # bombs and their explosions (bomb in slot i becomes explosion i)
+        self.bomb_x = np.zeros((boards, bombs), np.int64)
+        self.bomb_y = np.zeros((boards, bombs), np.int64)
+        self.bomb_timer = np.zeros((boards, bombs), np.int64)
+        self.bomb_alive = np.zeros((boards, bombs), bool)
+        self.boom_x = np.zeros((boards, bombs), np.int64)
+        self.boom_y = np.zeros((boards, bombs), np.int64)
+        self.boom_age = np.zeros((boards, bombs), np.int64)
+        self.boom_alive = np.zeros((boards, bombs), bool)
+        self.bombs_placed = np.zeros(boards, np.int64)
+
+        # player
+        self.x = np.zeros(boards, np.int64)
+        self.y = np.zeros(boards, np.int64)
+        self.vx = np.zeros(boards, np.int64)
+        self.vy = np.zeros(boards, np.int64)
+        self.sight_x = np.zeros(boards, np.int64)
+        self.sight_y = np.zeros(boards, np.int64)
+        self.set_bomb = np.zeros(boards, bool)
+        self.bombs = np.zeros(boards, np.int64)
+        self.max_bombs = np.zeros(boards, np.int64)
+        self.duration = np.full(boards, 5)
+        self.player_gold = np.zeros(boards, np.int64)
+        self.total_gold = np.zeros(boards, np.int64)
+        self.is_dead = np.zeros(boards, bool)
+
+        self.gold_left = np.zeros(boards, np.int64)
+        self.enemies_left = np.zeros(boards, np.int64)
+        self.ticks = np.zeros(boards, np.int64)
+        self.done = np.ones(boards, bool)
+
+        self.action_vx = np.array([action[0][0] for action in env.ACTIONS])
+        self.action_vy = np.array([action[0][1] for action in env.ACTIONS])
+        self.action_sx = np.array([(action[1] or (0, 0))[0]
+                                   for action in env.ACTIONS])
+        self.action_sy = np.array([(action[1] or (0, 0))[1]
+                                   for action in env.ACTIONS])
+        self.action_turn = np.array([action[1] is not None
+                                     for action in env.ACTIONS])
+        self.action_bomb = np.array([action[2] for action in env.ACTIONS])
+
+    def reset(self, seeds: Optional[Sequence[Optional[int]]] = None,
+              indices: Optional[Iterable[int]] = None) -> None:
+        """Start new levels (the same as CollectorEnv.reset makes them)"""
+        if indices is None:
+            indices = range(self.boards)
+        generator = self.generator
+        for idx, board in enumerate(indices):
+            seed = seeds[idx] if seeds is not None else None
+            if seed is not None:
+                generator.rng.seed(seed)
+            generator.init_level()
+            generator.player.reset()
+            self.load(board, generator)
+
+    def load(self, board: int, game: modes.CollectorGame) -> None:
+        """Copy state of CollectorGame to the board
+
+        Level must be fresh: only terrain and enemies.
+        """
+        player = game.player
+        grid = game.terrain
+        enemies = game.enemies or []
+        if len(enemies) > self.enemy_x.shape[1]:
+            raise ValueError('too many enemies for BatchGame')
+        if game.level_map or game.tempies or len(grid.pending) > 1 or \
+           player.bombs[1] > self.bomb_x.shape[1]:
+            raise ValueError('BatchGame loads only fresh levels')
+
+        self.tiles[board] = np.frombuffer(grid.cells, np.uint8).reshape(
+            self.height, self.width)
+        self.pending[board] = -1
+        for idx in grid.pending:
+            self.pending[board] = self.base[board] + idx
+
+        self.enemy_alive[board] = False
+        for slot, enemy in enumerate(enemies):
+            self.enemy_x[board, slot], self.enemy_y[board, slot] = enemy.pos
+            self.enemy_vx[board, slot], self.enemy_vy[board, slot] = \
+                enemy.speed
+            self.enemy_slow[board, slot] = enemy.slow_count
+            self.enemy_alive[board, slot] = True
+        self.bomb_alive[board] = False
+        self.boom_alive[board] = False
+        self.bombs_placed[board] = 0
+
+        self.x[board], self.y[board] = player.pos
+        self.vx[board], self.vy[board] = player.speed
+        self.sight_x[board], self.sight_y[board] = player.sight
+        self.set_bomb[board] = player.set_bomb
+        self.bombs[board], self.max_bombs[board] = player.bombs
+        self.duration[board] = player.duration
+        self.player_gold[board], self.total_gold[board] = player.gold
+        self.is_dead[board] = player.is_dead
+
+        self.gold_left[board] = game.gold_left
+        self.enemies_left[board] = game.enemies_left
+        self.ticks[board] = 0
+        self.done[board] = False
+
+    def cell(self, board: Any, x: Any, y: Any) -> Any:
+        """Get flat index of tile in grids"""
+        return board * (self.width * self.height) + y * self.width + x
+
+    def lookup(self, grid: Any, base: Any, x: Any, y: Any) -> Any:
+        """Get values of grid at given positions (0 outside of board)"""
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        idx = base + np.clip(y, 0, self.height - 1) * self.width + \
+            np.clip(x, 0, self.width - 1)
+        return grid.reshape(-1)[idx] * inside
+
+    def step(self, actions: Sequence[int]) -> Tuple[Any, Any]:
+        """Perform one tick with given CollectorEnv actions on all boards
+
+        Returns rewards and done flags, the same CollectorEnv.step gives.
+        Finished boards are still simulated, but get no rewards.
+        """
+        actions = np.asarray(actions)
+        turn = self.action_turn[actions]
+        self.apply_controls(self.action_vx[actions], self.action_vy[actions],
+                            np.where(turn, self.action_sx[actions],
+                                     self.sight_x),
+                            np.where(turn, self.action_sy[actions],
+                                     self.sight_y),
+                            self.action_bomb[actions])
+        was_done = self.done.copy()
+        gold_before = self.player_gold.copy()
+        self.action()
+        self.logic()
+
+        self.ticks += ~was_done
+        rewards = (self.player_gold - gold_before).astype(np.float64)
+        won = self.is_won()
+        rewards += np.where(self.is_dead, env.REWARD_DEATH,
+                            np.where(won, env.REWARD_WIN, 0.0))
+        rewards[was_done] = 0.0
+        self.done |= self.is_dead | won | (self.ticks >= self.max_ticks)
+        return rewards, self.done
+
+    def apply_controls(self, vx: Any, vy: Any, sight_x: Any, sight_y: Any,
+                       set_bomb: Any) -> None:
+        """Pass players' input to all boards"""
+        self.vx[:], self.vy[:] = vx, vy
+        self.sight_x[:], self.sight_y[:] = sight_x, sight_y
+        self.set_bomb |= set_bomb
+
+    def is_won(self) -> Any:
+        """Check win condition on every board"""
+        if self.win_mode == ut.WinCondition.COLLECT_ALL:
+            return (self.gold_left == 0) & \
+                (self.player_gold >= self.total_gold)
+        elif self.win_mode == ut.WinCondition.KILL_ALL:
+            return self.enemies_left == 0
+        elif self.win_mode == ut.WinCondition.GET_GOAL:
+            return self.player_gold > 0
+        return np.zeros(self.boards, bool)
+
+    def action(self) -> None:
+        """Process actions of all objects (see action of objects.py)"""
+        # bombs tick down, enemies crawl (and turn back at walls),
+        # explosions grow old
+        self.bomb_timer -= self.bomb_alive
+        alive = self.enemy_alive
+        self.enemy_slow = np.where(alive, (self.enemy_slow + 1) %
+                                   ut.ENEMY_SLOW, self.enemy_slow)
+        move = alive & (self.enemy_slow == 0)
+        x = self.enemy_x + self.enemy_vx * move
+        y = self.enemy_y + self.enemy_vy * move
+        hit = move & ((self.lookup(self.tiles, self.base[:, None], x, y) &
+                       WALL) > 0)
+        self.enemy_x = np.where(hit, self.enemy_x, x)
+        self.enemy_y = np.where(hit, self.enemy_y, y)
+        self.enemy_vx *= 1 - 2 * hit
+        self.enemy_vy *= 1 - 2 * hit
+        self.boom_age += self.boom_alive
+
+        x, y = self.x + self.vx, self.y + self.vy
+        hit = (self.lookup(self.tiles, self.base,
+                           x.clip(0, self.width - 1),
+                           y.clip(0, self.height - 1)) & WALL) > 0
+        self.x = np.where(hit, self.x, x)
+        self.y = np.where(hit, self.y, y)
+        ready = self.set_bomb.copy()
+        self.set_bomb[:] = False
+        place = ready & (self.bombs > 0) & (self.vx == 0) & (self.vy == 0)
+        if place.any():
+            board = np.nonzero(place)[0]
+            slot = self.bombs_placed[board]
+            self.bomb_x[board, slot] = np.clip(
+                self.x[board] + self.sight_x[board], 0, self.width - 1)
+            self.bomb_y[board, slot] = np.clip(
+                self.y[board] + self.sight_y[board], 0, self.height - 1)
+            self.bomb_timer[board, slot] = self.duration[board] * 5
+            self.bomb_alive[board, slot] = True
+            self.bombs[board] -= 1
+            self.bombs_placed[board] += 1
+
+    def logic(self) -> None:
+        """Process interaction of all objects (see logic of objects.py)"""
+        self.x.clip(0, self.width - 1, out=self.x)
+        self.y.clip(0, self.height - 1, out=self.y)
+        self.spikes_logic()
+        self.gold_logic()
+        self.bombs_logic()
+        self.explosions_logic()
+        self.enemies_logic()
+        self.destroy()
+
+    def bounce(self, hit: Any) -> None:
+        """Return hit enemies to previous tile and turn them back"""
+        self.enemy_x -= self.enemy_vx * hit
+        self.enemy_y -= self.enemy_vy * hit
+        flip = 1 - 2 * hit
+        self.enemy_vx *= flip
+        self.enemy_vy *= flip
+
+    def spikes_logic(self) -> None:
+        """Arm spikes left by player, trigger or step on the others"""
+        inside = (self.x >= 0) & (self.x < self.width) & \
+            (self.y >= 0) & (self.y < self.height)
+        here = np.where(inside, self.cell(np.arange(self.boards), self.x,
+                                          self.y), -1)
+        tiles = self.tiles.reshape(-1)
+        left = (self.pending >= 0) & (self.pending != here)
+        if left.any():
+            tiles[self.pending[left]] |= ARMED
+            self.pending[left] = -1
+
+        state = np.where(inside, tiles[np.maximum(here, 0)], 0)
+        on_spikes = (state & SPIKES) > 0
+        self.is_dead |= (state & ARMED) > 0
+        trigger = on_spikes & ((state & (ARMED | TRIGGERED)) == 0)
+        if trigger.any():
+            tiles[here[trigger]] |= TRIGGERED
+            self.pending[trigger] = here[trigger]
+
+    def gold_logic(self) -> None:
+        """Let players collect gold they stand on"""
+        gold = self.lookup(self.tiles, self.base, self.x, self.y) >> \
+            GOLD_SHIFT
+        found = gold > 0
+        if not found.any():
+            return
+        board = np.nonzero(found)[0]
+        idx = self.cell(board, self.x[board], self.y[board])
+        self.player_gold[board] += gold[board]
+        self.gold_left[board] -= 1
+        self.tiles.reshape(-1)[idx] &= NO_GOLD
+
+    def bombs_logic(self) -> None:
+        """Push player and bounce enemies back from bombs"""
+        for slot in range(self.bomb_x.shape[1]):
+            alive = self.bomb_alive[:, slot]
+            if not alive.any():
+                continue
+            bomb_x, bomb_y = self.bomb_x[:, slot], self.bomb_y[:, slot]
+            hit = alive & (self.x == bomb_x) & (self.y == bomb_y)
+            self.x -= self.vx * hit
+            self.y -= self.vy * hit
+            self.bounce(self.enemy_alive & alive[:, None] &
+                        (self.enemy_x == bomb_x[:, None]) &
+                        (self.enemy_y == bomb_y[:, None]))
+
+    def in_cross(self, x: Any, y: Any, center_x: Any, center_y: Any) -> Any:
+        """Check if positions are covered by explosions at centers"""
+        return ((x == center_x) & (np.abs(y - center_y) <= BOMB_RANGE)) | \
+            ((y == center_y) & (np.abs(x - center_x) <= BOMB_RANGE))
+
+    def explosions_logic(self) -> None:
+        """Burn everything in the cross of every explosion"""
+        self.killed = np.zeros_like(self.enemy_alive)
+        for slot in range(self.boom_x.shape[1]):
+            alive = self.boom_alive[:, slot]
+            if not alive.any():
+                continue
+            board = np.nonzero(alive)[0]
+            center_x, center_y = self.boom_x[board, slot], \
+                self.boom_y[board, slot]
+            self.is_dead[board] |= self.in_cross(
+                self.x[board], self.y[board], center_x, center_y)
+            self.killed[board] |= self.enemy_alive[board] & self.in_cross(
+                self.enemy_x[board], self.enemy_y[board],
+                center_x[:, None], center_y[:, None])
+
+            x = center_x[:, None] + self.cross_x
+            y = center_y[:, None] + self.cross_y
+            inside = (x >= 0) & (x < self.width) & \
+                (y >= 0) & (y < self.height)
+            idx = self.cell(board[:, None], x, y)[inside]
+
+            tiles = self.tiles.reshape(-1)
+            bits = tiles[idx]
+            bits = np.where((bits & (WALL | SUPER_WALL)) == WALL,
+                            bits & NO_WALL, bits)
+            bits = np.where(bits & ARMED, bits & DISARMED, bits)
+            burnt = np.zeros(inside.shape, np.int64)
+            burnt[inside] = (bits & GOLD_MASK) > 0
+            tiles[idx] = bits & NO_GOLD
+
+            burnt_total = burnt.sum(axis=1)
+            self.is_dead[board] |= burnt_total > 0
+            self.gold_left[board] -= burnt_total
+
+    def enemies_logic(self) -> None:
+        """Keep enemies on board, let them kill player and collide"""
+        width, height = self.width, self.height
+        near = self.near_enemies()
+        if near.any():
+            board = np.nonzero(near)[0]
+            saved = [array[board].copy() for array in
+                     (self.enemy_x, self.enemy_y,
+                      self.enemy_vx, self.enemy_vy)]
+
+        # boards, where enemies are far from each other: no collisions,
+        # so all enemies go at once
+        alive = self.enemy_alive
+        x, y = self.enemy_x, self.enemy_y
+        out = (x < 0) | (x >= width)
+        self.enemy_vx *= 1 - 2 * out
+        out = (y < 0) | (y >= height)
+        self.enemy_vy *= 1 - 2 * out
+        x.clip(0, width - 1, out=x)
+        y.clip(0, height - 1, out=y)
+        caught = (alive & (x == self.x[:, None]) &
+                  (y == self.y[:, None])).any(axis=1)
+        self.is_dead |= caught & ~near
+        if near.any():
+            self.collide(board, *saved)
+
+    def near_enemies(self) -> Any:
+        """Find boards, where some enemies may collide during this tick"""
+        x, y, alive = self.enemy_x, self.enemy_y, self.enemy_alive
+        dist = np.maximum(np.abs(x[:, :, None] - x[:, None, :]),
+                          np.abs(y[:, :, None] - y[:, None, :]))
+        pairs = alive[:, :, None] & alive[:, None, :] & (dist <= 2)
+        count = self.enemy_alive.shape[1]
+        pairs[:, np.arange(count), np.arange(count)] = False
+        return pairs.any(axis=(1, 2))
+
+    def collide(self, board: Any, x: Any, y: Any, vx: Any, vy: Any) -> None:
+        """Process enemies of given boards one by one, as objects.py does"""
+        width, height = self.width, self.height
+        alive = self.enemy_alive[board]
+        player_x, player_y = self.x[board], self.y[board]
+        dead = self.is_dead[board]
+        count = x.shape[1]
+        for i in range(count):
+            out = (x[:, i] < 0) | (x[:, i] >= width)
+            vx[:, i] *= 1 - 2 * out
+            out = (y[:, i] < 0) | (y[:, i] >= height)
+            vy[:, i] *= 1 - 2 * out
+            x[:, i].clip(0, width - 1, out=x[:, i])
+            y[:, i].clip(0, height - 1, out=y[:, i])
+            dead |= alive[:, i] & (x[:, i] == player_x) & \
+                (y[:, i] == player_y)
+            for j in range(count):
+                if j == i:
+                    continue
+                hit = alive[:, i] & alive[:, j] & \
+                    (x[:, i] == x[:, j]) & (y[:, i] == y[:, j])
+                if not hit.any():
+                    continue
+                old_xi, old_yi = x[:, i] - vx[:, i], y[:, i] - vy[:, i]
+                old_xj, old_yj = x[:, j] - vx[:, j], y[:, j] - vy[:, j]
+                flip_x = np.where(hit & (old_xi != old_xj), -1, 1)
+                flip_y = np.where(hit & (old_yi != old_yj), -1, 1)
+                x[:, i] = np.where(hit, old_xi, x[:, i])
+                y[:, i] = np.where(hit, old_yi, y[:, i])
+                x[:, j] = np.where(hit, old_xj, x[:, j])
+                y[:, j] = np.where(hit, old_yj, y[:, j])
+                vx[:, i] *= flip_x
+                vy[:, i] *= flip_y
+                vx[:, j] *= flip_x
+                vy[:, j] *= flip_y
+        self.enemy_x[board], self.enemy_y[board] = x, y
+        self.enemy_vx[board], self.enemy_vy[board] = vx, vy
+        self.is_dead[board] = dead
+
+    def destroy(self) -> None:
+        """Remove dead objects, turn exploded bombs into explosions"""
+        self.boom_alive &= self.boom_age < EXPLOSION_TICKS
+        exploded = self.bomb_alive & (self.bomb_timer <= 0)
+        if exploded.any():
+            self.bomb_alive &= ~exploded
+            self.boom_x = np.where(exploded, self.bomb_x, self.boom_x)
+            self.boom_y = np.where(exploded, self.bomb_y, self.boom_y)
+            self.boom_age *= ~exploded
+            self.boom_alive |= exploded
+        if self.killed.any():
+            self.enemy_alive &= ~self.killed
+            self.enemies_left -= self.killed.sum(axis=1)
+
+    def state(self, board: int) -> BoardState:
+        """Get state of one board in the form of game_state()"""
+        def pair(x: Any, y: Any) -> ut.Coord:
+            return int(x), int(y)
+
+        tiles = [(pair(x, y), int(self.tiles[board, y, x]))
+                 for y, x in zip(*np.nonzero(self.tiles[board]))]
+        enemies = [(pair(self.enemy_x[board, slot],
+                         self.enemy_y[board, slot]),
+                    pair(self.enemy_vx[board, slot],
+                         self.enemy_vy[board, slot]),
+                    int(self.enemy_slow[board, slot]))
+                   for slot in np.nonzero(self.enemy_alive[board])[0]]
+        bombs = [(pair(self.bomb_x[board, slot], self.bomb_y[board, slot]),
+                  int(self.bomb_timer[board, slot]))
+                 for slot in np.nonzero(self.bomb_alive[board])[0]]
+        explosions = sorted((pair(self.boom_x[board, slot],
+                                  self.boom_y[board, slot]),
+                             int(self.boom_age[board, slot]))
+                            for slot in np.nonzero(self.boom_alive[board])[0])
+        player = (pair(self.x[board], self.y[board]),
+                  pair(self.vx[board], self.vy[board]),
+                  pair(self.sight_x[board], self.sight_y[board]),
+                  pair(self.player_gold[board], self.total_gold[board]),
+                  pair(self.bombs[board], self.max_bombs[board]),
+                  bool(self.is_dead[board]))
+        return (player, tuple(enemies), tuple(tiles), tuple(bombs),
+                tuple(explosions), int(self.gold_left[board]),
+                int(self.enemies_left[board]))
+
+    def observe(self, out: Optional[Any] = None) -> Any:
+        """Get observations of all boards, the same CollectorEnv makes
+
+        Result is uint8 array of shape (boards, CHANNELS, height, width).
+        """
+        shape = (self.boards, env.CHANNELS, self.height, self.width)
+        if out is None:
+            out = np.zeros(shape, np.uint8)
+        else:
+            out.fill(0)
+        out[:, env.TERRAIN_CHANNELS] = env.terrain_planes(self.tiles)
+        flat = out.reshape(self.boards, env.CHANNELS, -1)
+        board = np.arange(self.boards)
+
+        def put(channel: int, boards: Any, x: Any, y: Any) -> None:
+            inside = (x >= 0) & (x < self.width) & \
+                (y >= 0) & (y < self.height)
+            np.add.at(flat[:, channel], (boards[inside], (y * self.width +
+                                                          x)[inside]), 1)
+
+        alive = self.enemy_alive
+        put(env.CH_ENEMY, np.broadcast_to(board[:, None], alive.shape)[alive],
+            self.enemy_x[alive], self.enemy_y[alive])
+        alive = self.bomb_alive
+        put(env.CH_BOMB, np.broadcast_to(board[:, None], alive.shape)[alive],
+            self.bomb_x[alive], self.bomb_y[alive])
+        alive = self.boom_alive
+        boards = np.broadcast_to(board[:, None], alive.shape)[alive]
+        put(env.CH_EXPLOSION, np.repeat(boards, len(self.cross_x)),
+            (self.boom_x[alive][:, None] + self.cross_x).reshape(-1),
+            (self.boom_y[alive][:, None] + self.cross_y).reshape(-1))
+        put(env.CH_PLAYER, board, self.x, self.y)
+        return out
+
+
+def speed_test(boards: int = 1024, ticks: int = 200,
+               seed: int = 0) -> float:
+    """Get number of game steps per second of BatchGame"""
+    game = BatchGame(boards)
+    game.reset([seed + board for board in range(boards)])
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, len(env.ACTIONS), (ticks, boards))
+    start = time.perf_counter()
+    for tick_actions in actions:
+        game.step(tick_actions)
+    return boards * ticks / (time.perf_counter() - start)
@@ -0,0 +1,58 @@
+"""
+benchmarks.py -- module with micro-benchmarks
+=============================================
+This is module, which measures memory footprint and attribute access speed
+of game objects. Run it directly to get a short report.
+"""
+
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List
+
+from CollectorGame import objects as objs
+
+
+OBJECT_FACTORIES: Dict[str, Callable[[int], objs.BasicObject]] = {
+    'Wall': lambda idx: objs.Wall((idx % 20, idx // 20 % 20)),
+    'Spikes': lambda idx: objs.Spikes((idx % 20, idx // 20 % 20), False),
+    'Gold': lambda idx: objs.Gold((idx % 20, idx // 20 % 20)),
+    'Enemy': lambda idx: objs.Enemy((idx % 20, idx // 20 % 20), (1, -1)),
+    'Bomb': lambda idx: objs.Bomb((idx % 20, idx // 20 % 20)),
+}
+
+
+def bench_memory(factory: Callable[[int], objs.BasicObject],
+                 count: int = 100000) -> float:
+    """Measure average amount of memory (in bytes) taken by one object"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    created: List[objs.BasicObject] = [factory(idx) for idx in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list itself is not a part of object's footprint
+    list_size = created.__sizeof__()
+    return (after - before - list_size) / count
+
+
+def bench_attribute_access(factory: Callable[[int], objs.BasicObject],
+                           count: int = 1000000) -> float:
+    """Measure average time (in nanoseconds) of pos/speed read-write"""
+    test = factory(0)
+
+    def access() -> None:
+        test.pos = test.pos[0] + test.speed[0], test.pos[1] + test.speed[1]
+
+    return timeit.timeit(access, number=count) / count * 1e9
+
+
+def main() -> None:
+    """Print benchmark report for all game object types"""
+    print('{:<8} {:>12} {:>12}'.format('object', 'bytes/obj', 'ns/access'))
+    for name, factory in OBJECT_FACTORIES.items():
+        memory = bench_memory(factory)
+        access = bench_attribute_access(factory)
+        print('{:<8} {:>12.1f} {:>12.1f}'.format(name, memory, access))
+
+
+if __name__ == '__main__':
+    main()
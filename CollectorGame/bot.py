@@ -0,0 +1,278 @@
+"""
+bot.py -- autopilot for automated games
+=======================================
+This is module, which plays CollectorGame by itself, e.g. for soak tests
+and for batch runs of thousands of games.
+
+AutoPilot drives the game through the same input path as the keyboard:
+it turns its decision into KEYDOWN/KEYUP events for CollectorGame.events.
+Distance maps to gold are cached and rebuilt only when the layout of the
+level (walls, armed spikes, bombs, blasts, gold) changes; enemies are
+avoided by predicting their straight-line motion for the next tick.
+"""
+
+import random
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import pygame  # type: ignore
+
+import CollectorGame.utils as ut
+import CollectorGame.objects as objs
+import CollectorGame.modes as modes
+import CollectorGame.terrain as terrain
+
+
+Cells = FrozenSet[ut.Coord]
+DistanceMap = Dict[ut.Coord, int]
+
+# every move of the player (diagonal ones too), staying first
+MOVES: List[ut.Coord] = [(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1),
+                         (-1, -1), (1, -1), (-1, 1), (1, 1)]
+SIDES: List[ut.Coord] = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+KEYS_X: Dict[int, int] = {-1: pygame.K_LEFT, 1: pygame.K_RIGHT}
+KEYS_Y: Dict[int, int] = {-1: pygame.K_UP, 1: pygame.K_DOWN}
+
+UNREACHABLE: int = 1 << 30
+
+
+def key_event(event_type: int, key: int) -> ut.Event:
+    """Create keyboard event, same as the one pygame makes"""
+    return pygame.event.Event(event_type, key=key)
+
+
+def control_events(speed: ut.Coord, sight: ut.Coord,
+                   set_bomb: bool = False) -> List[ut.Event]:
+    """Get keyboard events, which give player this speed and sight"""
+    events = []
+    if speed == (0, 0) and sight != (0, 0):
+        # press and release arrow to turn without moving
+        key = KEYS_X[sight[0]] if sight[0] else KEYS_Y[sight[1]]
+        events.append(key_event(pygame.KEYDOWN, key))
+        events.append(key_event(pygame.KEYUP, key))
+    if speed[0]:
+        events.append(key_event(pygame.KEYDOWN, KEYS_X[speed[0]]))
+    else:
+        events.append(key_event(pygame.KEYUP, pygame.K_LEFT))
+    if speed[1]:
+        events.append(key_event(pygame.KEYDOWN, KEYS_Y[speed[1]]))
+    else:
+        events.append(key_event(pygame.KEYUP, pygame.K_UP))
+    if set_bomb:
+        events.append(key_event(pygame.KEYDOWN, pygame.K_SPACE))
+    return events
+
+
+def blast_cells(pos: ut.Coord, bomb_range: int) -> Iterable[ut.Coord]:
+    """Iterate cells covered by cross explosion"""
+    for delta in range(-bomb_range, bomb_range + 1):
+        yield pos[0] + delta, pos[1]
+        yield pos[0], pos[1] + delta
+
+
+def distance_map(sources: Iterable[ut.Coord], blocked: Set[ut.Coord],
+                 moves: List[ut.Coord] = MOVES) -> DistanceMap:
+    """Breadth-first distances from the nearest source to every cell"""
+    width, height = ut.BSIZE
+    dist: DistanceMap = {}
+    queue: deque = deque()
+    for source in sources:
+        if source not in blocked and source not in dist:
+            dist[source] = 0
+            queue.append(source)
+    while queue:
+        x, y = queue.popleft()
+        next_dist = dist[x, y] + 1
+        for dx, dy in moves:
+            cell = x + dx, y + dy
+            if cell in dist or cell in blocked or \
+               not (0 <= cell[0] < width and 0 <= cell[1] < height):
+                continue
+            dist[cell] = next_dist
+            queue.append(cell)
+    return dist
+
+
+class AutoPilot:
+    """Scripted player of CollectorGame"""
+
+    def __init__(self, danger_ahead: int = 1, noise: float = 0.0,
+                 seed: Optional[int] = None) -> None:
+        """Initialise bot, which predicts enemies danger_ahead ticks on
+
+        With given probability (noise) bot makes a random safe move instead
+        of the best one, so its games on the same level differ.
+        """
+        self.danger_ahead: int = danger_ahead
+        self.noise: float = noise
+        self.rng: random.Random = random.Random(seed)
+        self.layout: Optional[Tuple[Cells, Cells, Cells, Cells]] = None
+        self.gold_dist: DistanceMap = {}
+        self.escape_dist: DistanceMap = {}
+        self.wall_dist: DistanceMap = {}
+        self.rebuilds: int = 0
+
+    def scan(self, game: modes.CollectorGame) -> Tuple[Cells, Cells, Cells,
+                                                       Cells]:
+        """Get blocked, breakable, gold and blast cells of the level"""
+        player_pos = game.player.pos
+        blocked: Set[ut.Coord] = set()
+        breakable: Set[ut.Coord] = set()
+        gold: Set[ut.Coord] = set()
+        blast: Set[ut.Coord] = set()
+        for pos, bits in game.terrain.tiles():
+            if bits & terrain.GOLD_MASK:
+                gold.add(pos)
+            if bits & terrain.WALL:
+                blocked.add(pos)
+                if not bits & terrain.SUPER_WALL:
+                    breakable.add(pos)
+            elif bits & terrain.ARMED or \
+                    (bits & terrain.TRIGGERED and pos != player_pos):
+                blocked.add(pos)
+        for map_object in game.level_map or ():
+            pos = map_object.pos
+            if isinstance(map_object, objs.Gold):
+                gold.add(pos)
+            elif isinstance(map_object, objs.Wall):
+                blocked.add(pos)
+                if not map_object.is_super:
+                    breakable.add(pos)
+            elif isinstance(map_object, objs.Spikes):
+                # triggered spikes get armed as soon as player leaves them
+                if map_object.is_activated or \
+                   (map_object.is_triggered and pos != player_pos):
+                    blocked.add(pos)
+            elif isinstance(map_object, objs.Bomb):
+                blocked.add(pos)
+                blast.update(blast_cells(pos, map_object.bomb_range))
+        for effect in game.tempies or ():
+            if isinstance(effect, objs.Explosion):
+                blast.update(blast_cells(effect.pos, effect.esizex[1] -
+                                         effect.pos[0]))
+        return (frozenset(blocked), frozenset(breakable), frozenset(gold),
+                frozenset(blast))
+
+    def update_maps(self, game: modes.CollectorGame) -> None:
+        """Rebuild distance maps if layout of the level has changed"""
+        layout = self.scan(game)
+        if layout == self.layout:
+            return
+        self.layout = layout
+        self.rebuilds += 1
+        blocked, breakable, gold, blast = layout
+
+        self.gold_dist = distance_map(gold, blocked | blast)
+        width, height = ut.BSIZE
+        safe = [(x, y) for x in range(width) for y in range(height)
+                if (x, y) not in blast]
+        self.escape_dist = distance_map(safe, blocked)
+        # path to gold through walls, which can be blown up
+        self.wall_dist = distance_map(gold, blocked - breakable, SIDES)
+
+    def enemy_cells(self, game: modes.CollectorGame) -> Set[ut.Coord]:
+        """Predict cells taken by enemies during the next ticks"""
+        width, height = ut.BSIZE
+        cells: Set[ut.Coord] = set()
+        for enemy in game.enemies or ():
+            (x, y), (vx, vy) = enemy.pos, enemy.speed
+            slow_count = enemy.slow_count
+            cells.add((x, y))
+            for _ in range(self.danger_ahead):
+                slow_count = (slow_count + 1) % ut.ENEMY_SLOW
+                if slow_count == 0:
+                    x, y = x + vx, y + vy
+                    if not 0 <= x < width:
+                        x, vx = max(0, min(x, width - 1)), -vx
+                    if not 0 <= y < height:
+                        y, vy = max(0, min(y, height - 1)), -vy
+                cells.add((x, y))
+        return cells
+
+    def decide(self, game: modes.CollectorGame) -> Tuple[ut.Coord, ut.Coord,
+                                                         bool]:
+        """Choose speed, sight and bombing of the player for the next tick"""
+        self.update_maps(game)
+        blocked, breakable, gold, blast = self.layout  # type: ignore
+        player = game.player
+        pos = player.pos
+        enemies = self.enemy_cells(game)
+        width, height = ut.BSIZE
+
+        if pos in blast:
+            target, ignore_blast = self.escape_dist, True
+        elif pos in self.gold_dist:
+            target, ignore_blast = self.gold_dist, False
+        else:
+            bomb = self.bomb_wall(game, pos)
+            if bomb is not None:
+                return (0, 0), bomb, True
+            target, ignore_blast = self.wall_dist, False
+
+        best: Optional[Tuple[int, ut.Coord]] = None
+        safe: List[ut.Coord] = []
+        for move in MOVES:
+            cell = pos[0] + move[0], pos[1] + move[1]
+            if not (0 <= cell[0] < width and 0 <= cell[1] < height) or \
+               cell in blocked or cell in enemies or \
+               (cell in blast and not ignore_blast):
+                continue
+            safe.append(move)
+            score = target.get(cell, UNREACHABLE)
+            if best is None or score < best[0]:
+                best = score, move
+        if best is None:
+            return (0, 0), player.sight, False
+        move = best[1]
+        if self.noise and self.rng.random() < self.noise:
+            move = self.rng.choice(safe)
+        return move, (move if move[1] == 0 or move[0] == 0 else
+                      (0, move[1])), False
+
+    def bomb_wall(self, game: modes.CollectorGame,
+                  pos: ut.Coord) -> Optional[ut.Coord]:
+        """Get side to put bomb to, if a wall blocks the way to gold"""
+        blocked, breakable, gold, blast = self.layout  # type: ignore
+        player = game.player
+        if player.bombs[0] <= 0 or blast or pos not in self.wall_dist:
+            return None  # one bomb at a time
+        for side in SIDES:
+            cell = pos[0] + side[0], pos[1] + side[1]
+            if cell not in breakable or \
+               self.wall_dist.get(cell, UNREACHABLE) >= self.wall_dist[pos]:
+                continue
+            cross = set(blast_cells(cell, 2))
+            if cross & gold:
+                continue  # burnt gold loses the game
+            if any(self.escape_dist.get(free, UNREACHABLE) == 0
+                   for free in self.free_cells(pos, blocked | {cell}, 4)
+                   if free not in cross):
+                return side
+        return None
+
+    def free_cells(self, start: ut.Coord, blocked: Set[ut.Coord],
+                   steps: int) -> List[ut.Coord]:
+        """Get cells reachable from start in given number of steps"""
+        dist = distance_map([start], set(blocked))
+        return [cell for cell, value in dist.items() if value <= steps]
+
+    def events(self, game: modes.CollectorGame) -> List[ut.Event]:
+        """Get keyboard events for the next tick of the game"""
+        speed, sight, set_bomb = self.decide(game)
+        return control_events(speed, sight, set_bomb)
+
+
+def play(game: modes.CollectorGame, max_ticks: int = 2000,
+         pilot: Optional[AutoPilot] = None) -> Tuple[bool, int]:
+    """Let bot play the game until it is over; return (won, ticks)"""
+    pilot = pilot or AutoPilot()
+    for tick in range(1, max_ticks + 1):
+        game.events(pilot.events(game), None)
+        game.action()
+        game.logic()
+        if game.player.is_dead:
+            return False, tick
+        if game.is_won():
+            return True, tick
+    return False, max_ticks
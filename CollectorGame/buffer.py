@@ -0,0 +1,160 @@
+"""
+buffer.py -- double-buffered world state
+========================================
+This is module, which lets logic of game objects read state of the world
+as it was before the step and write the next state aside, so result of
+the step does not depend on order of objects.
+
+Logic steps get views of objects instead of objects themselves: reading
+from view gives the previous (front) state of the object, assigning to
+view puts the value into back buffer. commit() then applies all written
+values at once. Writes of several steps to the same attribute are merged
+by rules, which do not depend on their order either: deaths add up, gold
+is summed, and conflicting values are settled by fixed rule (see MERGE).
+Position and speed written by one step are one move (see MOVE), so the
+merged move never takes position of one step and speed of another.
+Since steps of the phase do not see each other's writes, they may run
+in any order (or in parallel workers) between two commits.
+"""
+
+import types
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import CollectorGame.objects as objs
+
+
+def merge_flag(front: Any, values: List[Any]) -> Any:
+    """Flag is set if anybody set it"""
+    return front or any(values)
+
+
+def merge_gold(front: Any, values: List[Any]) -> Any:
+    """Gold collected by every step is summed up"""
+    return front[0] + sum(value[0] - front[0] for value in values), front[1]
+
+
+def order(value: Any) -> Any:
+    """Key, which sorts numbers (and tuples of them) by value"""
+    if isinstance(value, (int, float, tuple)):
+        return 0, value
+    return 1, repr(value)
+
+
+def merge_any(front: Any, values: List[Any]) -> Any:
+    """The same value from everybody, or the smallest one in conflict"""
+    first = values[0]
+    for value in values:
+        if value != first:
+            return min(values, key=order)
+    return first
+
+
+# how writes of several steps to the same attribute are merged
+MERGE: Dict[str, Callable[[Any, List[Any]], Any]] = {
+    'is_dead': merge_flag,
+    'gold': merge_gold,
+}
+
+# attributes, which every step writes as one value (by merge_any)
+MOVE: Tuple[str, ...] = ('pos', 'speed')
+
+
+class View:
+    """Object as seen by logic step: front state, writes go to buffer"""
+    __slots__ = ('_target', '_buffer')
+
+    def __init__(self, buffer: 'WorldBuffer', target: Any) -> None:
+        """Initialise view of target object"""
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_buffer', buffer)
+
+    @property  # type: ignore
+    def __class__(self) -> type:
+        """Let isinstance() and dispatch see the class of object"""
+        return type(self._target)
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if isinstance(value, types.MethodType) and \
+           value.__self__ is self._target:
+            # methods of object write through the view too
+            return types.MethodType(value.__func__, self)
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._buffer.write(self._target, name, value)
+
+
+class WorldBuffer:
+    """Back buffer of the world, which is applied by commit()"""
+
+    def __init__(self) -> None:
+        """Initialise empty buffer"""
+        self.views: Dict[int, View] = {}
+        self.writes: Dict[Tuple[int, str], List[Any]] = {}
+        # id(object) -> step -> attributes of MOVE written by the step
+        self.moves: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        self.targets: Dict[int, Any] = {}
+        self.step: int = 0
+        self.commits: int = 0
+
+    def view(self, game_object: Any) -> View:
+        """Get view of object (the same one until commit)"""
+        view = self.views.get(id(game_object))
+        if view is None:
+            view = self.views[id(game_object)] = View(self, game_object)
+        return view
+
+    def views_of(self, objects: Iterable[Any]) -> List[View]:
+        """Get views of all objects"""
+        return [self.view(game_object) for game_object in objects]
+
+    def begin(self) -> None:
+        """Start writes of the next step"""
+        self.step += 1
+
+    def write(self, target: Any, name: str, value: Any) -> None:
+        """Put value of attribute into back buffer"""
+        self.targets[id(target)] = target
+        if name in MOVE:
+            steps = self.moves.setdefault(id(target), {})
+            steps.setdefault(self.step, {})[name] = value
+        else:
+            self.writes.setdefault((id(target), name), []).append(value)
+
+    def logic(self, game_object: objs.BasicObject, player: objs.Player,
+              level_map: List[objs.BasicObject], enemies: List[objs.Enemy],
+              tempies: List[objs.TempEffect]) -> None:
+        """Run logic of object against the front state"""
+        self.begin()
+        self.view(game_object).logic(
+            self.view(player), self.views_of(level_map),
+            self.views_of(enemies), self.views_of(tempies))
+
+    def commit(self) -> int:
+        """Apply back buffer to objects; return number of changed values"""
+        changed = 0
+        targets = self.targets
+        for (key, name), values in self.writes.items():
+            target = targets[key]
+            front = getattr(target, name)
+            value = MERGE.get(name, merge_any)(front, values)
+            if value != front:
+                setattr(target, name, value)
+                changed += 1
+        for key, steps in self.moves.items():
+            target = targets[key]
+            front = tuple(getattr(target, name) for name in MOVE)
+            moves = [tuple(written.get(name, old)
+                           for name, old in zip(MOVE, front))
+                     for written in steps.values()]
+            for name, old, new in zip(MOVE, front, merge_any(front, moves)):
+                if new != old:
+                    setattr(target, name, new)
+                    changed += 1
+        self.writes = {}
+        self.moves = {}
+        self.targets = {}
+        self.views = {}
+        self.commits += 1
+        return changed
@@ -0,0 +1,42 @@
+"""
+bus.py -- game event bus
+========================
+This is module, which delivers game events (gold collected, enemy killed
+and so on) from the game to everyone interested in them.
+
+Handlers are called synchronously, in order of subscription, with the
+event and the game object it happened to. Counters of the game mode,
+HUDs and statistics subscribe to events instead of polling object lists.
+"""
+
+from typing import Any, Callable, Dict, List
+
+import CollectorGame.utils as ut
+
+
+Handler = Callable[[ut.GameEvent, Any], None]
+
+
+class EventBus:
+    """Lightweight synchronous publisher of game events"""
+
+    def __init__(self) -> None:
+        """Initialise bus without subscribers"""
+        self.handlers: Dict[ut.GameEvent, List[Handler]] = {}
+
+    def subscribe(self, event: ut.GameEvent, handler: Handler) -> None:
+        """Call handler every time given event is published"""
+        self.handlers.setdefault(event, []).append(handler)
+
+    def unsubscribe(self, event: ut.GameEvent, handler: Handler) -> None:
+        """Stop calling handler for given event"""
+        handlers = self.handlers.get(event)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    def publish(self, event: ut.GameEvent, source: Any = None) -> None:
+        """Deliver event to all its subscribers"""
+        handlers = self.handlers.get(event)
+        if handlers:
+            for handler in handlers:
+                handler(event, source)
@@ -0,0 +1,121 @@
+"""
+capture.py -- off-thread frame capture
+======================================
+This is module, which records game frames without blocking the game loop.
+
+Every captured frame is copied into one of preallocated ring surfaces
+and handed over to a thread pool, which encodes it either as a sequence
+of PNG files or as raw RGB video stream. When all ring surfaces are busy
+the frame is dropped instead of stalling the game. Errors of workers are
+kept and raised by close().
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, List, Optional
+
+import pygame  # type: ignore
+
+import CollectorGame.utils as ut
+
+
+FORMAT_PNG: str = 'png'
+FORMAT_RAW: str = 'raw'
+
+# pygame < 2.1.3 has only the old name of this function
+to_bytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+
+
+class FrameCapture:
+    """Recorder of game frames into PNG sequence or raw RGB stream"""
+
+    def __init__(self, path: str, size: ut.Size,
+                 fmt: str = FORMAT_PNG,
+                 ring_size: int = 8,
+                 workers: int = 2) -> None:
+        """Initialise recorder
+
+        For PNG format path is a directory for frame files, for raw format
+        it is a file, which gets frames as packed RGB24 one after another
+        (e.g. for 'ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH -i path').
+        """
+        if fmt not in (FORMAT_PNG, FORMAT_RAW):
+            raise ValueError('unknown capture format: ' + fmt)
+        self.path: str = path
+        self.size: ut.Size = size
+        self.fmt: str = fmt
+
+        self.ring: List[ut.Image] = [pygame.Surface(size)
+                                     for _ in range(max(1, ring_size))]
+        self.free: queue.SimpleQueue = queue.SimpleQueue()
+        for idx in range(len(self.ring)):
+            self.free.put(idx)
+
+        self.stream: Optional[BinaryIO] = None
+        if fmt == FORMAT_RAW:
+            # raw frames must keep their order, so there is one writer
+            self.stream = open(path, 'wb')
+            workers = 1
+        else:
+            os.makedirs(path, exist_ok=True)
+        self.pool: ThreadPoolExecutor = ThreadPoolExecutor(max(1, workers))
+
+        self.frame: int = 0
+        self.written: int = 0
+        self.dropped: int = 0
+        self.lock: threading.Lock = threading.Lock()
+        self.errors: List[BaseException] = []
+
+    def capture(self, screen: ut.Image) -> bool:
+        """Copy frame into a free ring buffer and queue it for encoding"""
+        frame = self.frame
+        self.frame += 1
+        try:
+            idx = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        surface = self.ring[idx]
+        if screen.get_size() == surface.get_size():
+            surface.blit(screen, (0, 0))
+        elif self.stream is not None:
+            # raw stream can not change size of frames in the middle
+            pygame.transform.scale(screen, self.size, surface)
+        else:
+            # window was resized, so ring surfaces follow it one by one
+            surface = self.ring[idx] = pygame.Surface(screen.get_size())
+            surface.blit(screen, (0, 0))
+        self.pool.submit(self.encode, idx, frame).add_done_callback(self.check)
+        return True
+
+    def check(self, future: Future) -> None:
+        """Keep error of finished encoding (runs in worker thread)"""
+        error = future.exception()
+        if error is not None:
+            with self.lock:
+                self.errors.append(error)
+
+    def encode(self, idx: int, frame: int) -> None:
+        """Encode ring buffer (runs in worker thread)"""
+        surface = self.ring[idx]
+        try:
+            if self.stream is not None:
+                self.stream.write(to_bytes(surface, 'RGB'))
+            else:
+                name = 'frame{:06d}.png'.format(frame)
+                pygame.image.save(surface, os.path.join(self.path, name))
+            with self.lock:
+                self.written += 1
+        finally:
+            self.free.put(idx)
+
+    def close(self) -> None:
+        """Wait for queued frames, release resources and raise errors"""
+        self.pool.shutdown(wait=True)
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        if self.errors:
+            raise self.errors[0]
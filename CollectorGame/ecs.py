@@ -0,0 +1,338 @@
+"""
+ecs.py -- optional entity-component-system core
+===============================================
+This is module, which stores game entities as components in contiguous
+per-archetype arrays and processes them with systems in bulk.
+
+Archetype is a fixed set of components. Every archetype keeps one
+array.array column per component field, so systems iterate plain integer
+arrays instead of scanning lists of game objects. Game objects from
+objects.py can be imported into World and watched through EntityView.
+"""
+
+import operator
+from array import array
+from enum import Enum
+from itertools import repeat
+from typing import (Callable, Dict, FrozenSet, Iterable, Iterator, List,
+                    Optional, Tuple)
+
+import CollectorGame.utils as ut
+import CollectorGame.objects as objs
+from CollectorGame.animation import CLOCK
+
+
+class Component(Enum):
+    POSITION = 0,
+    VELOCITY = 1,
+    SPRITE = 2,
+    LIFETIME = 3,
+    COLLIDER = 4,
+    PICKUP = 5
+
+
+# names of array columns for every component
+FIELDS: Dict[Component, Tuple[str, ...]] = {
+    Component.POSITION: ('x', 'y'),
+    Component.VELOCITY: ('vx', 'vy'),
+    Component.SPRITE: ('sprite', 'phase'),
+    Component.LIFETIME: ('ttl',),
+    Component.COLLIDER: ('layer',),
+    Component.PICKUP: ('value',),
+}
+
+# collider layers (bit flags)
+LAYER_PLAYER: int = 1
+LAYER_ENEMY: int = 2
+LAYER_SOLID: int = 4
+LAYER_HAZARD: int = 8
+LAYER_PICKUP: int = 16
+LAYER_BLAST: int = 32
+
+Signature = FrozenSet[Component]
+ContactHandler = Callable[['World', int, int], None]
+
+
+class Archetype:
+    """Storage of all entities with exactly the same set of components"""
+    __slots__ = ('signature', 'columns', 'entities')
+
+    def __init__(self, signature: Signature) -> None:
+        """Initialise empty archetype"""
+        self.signature: Signature = signature
+        self.columns: Dict[str, array] = {}
+        for component in signature:
+            for field in FIELDS[component]:
+                self.columns[field] = array('i')
+        self.entities: array = array('i')
+
+    def __len__(self) -> int:
+        """Number of entities in archetype"""
+        return len(self.entities)
+
+    def append(self, entity: int, values: Dict[str, int]) -> int:
+        """Add new row for entity and return its index"""
+        self.entities.append(entity)
+        for field, column in self.columns.items():
+            column.append(values.get(field, 0))
+        return len(self.entities) - 1
+
+    def remove(self, row: int) -> Optional[int]:
+        """Remove row by swapping the last one in; return moved entity"""
+        last = len(self.entities) - 1
+        moved: Optional[int] = None
+        if row != last:
+            moved = self.entities[last]
+            self.entities[row] = moved
+            for column in self.columns.values():
+                column[row] = column[last]
+        self.entities.pop()
+        for column in self.columns.values():
+            column.pop()
+        return moved
+
+
+class World:
+    """Container of archetypes, entity locations and sprite registry"""
+
+    def __init__(self, bsize: Optional[ut.Size] = None,
+                 fbounds: ut.FieldBounds = ut.FieldBounds.RECT) -> None:
+        """Initialise empty world"""
+        self.bsize: ut.Size = bsize or ut.BSIZE
+        self.fbounds: ut.FieldBounds = fbounds
+        self.archetypes: Dict[Signature, Archetype] = {}
+        self.locations: Dict[int, Tuple[Archetype, int]] = {}
+        self.sprites: List[List[ut.Image]] = []
+        self.sprite_ids: Dict[int, int] = {}
+        self.handlers: Dict[Tuple[int, int], ContactHandler] = {}
+        self.next_entity: int = 0
+        self.doomed: List[int] = []
+
+    def register_sprite(self, sprite: List[ut.Image]) -> int:
+        """Get index of sprite sequence, adding it to registry if needed"""
+        sprite_id = self.sprite_ids.get(id(sprite))
+        if sprite_id is None:
+            sprite_id = len(self.sprites)
+            self.sprites.append(sprite)
+            self.sprite_ids[id(sprite)] = sprite_id
+        return sprite_id
+
+    def spawn(self, components: Iterable[Component],
+              **values: int) -> int:
+        """Create new entity with given components and field values"""
+        signature = frozenset(components)
+        archetype = self.archetypes.get(signature)
+        if archetype is None:
+            archetype = Archetype(signature)
+            self.archetypes[signature] = archetype
+
+        entity = self.next_entity
+        self.next_entity += 1
+        row = archetype.append(entity, values)
+        self.locations[entity] = archetype, row
+        return entity
+
+    def despawn(self, entity: int) -> None:
+        """Delete entity from the world"""
+        location = self.locations.pop(entity, None)
+        if location is None:
+            return
+        archetype, row = location
+        moved = archetype.remove(row)
+        if moved is not None:
+            self.locations[moved] = archetype, row
+
+    def kill(self, entity: int) -> None:
+        """Mark entity for deletion at the end of the tick"""
+        self.doomed.append(entity)
+
+    def is_alive(self, entity: int) -> bool:
+        """Check if entity still exists"""
+        return entity in self.locations
+
+    def get(self, entity: int, field: str) -> int:
+        """Read single field of entity"""
+        archetype, row = self.locations[entity]
+        return archetype.columns[field][row]
+
+    def set(self, entity: int, field: str, value: int) -> None:
+        """Write single field of entity"""
+        archetype, row = self.locations[entity]
+        archetype.columns[field][row] = value
+
+    def has(self, entity: int, component: Component) -> bool:
+        """Check if entity has given component"""
+        return component in self.locations[entity][0].signature
+
+    def query(self, *components: Component) -> Iterator[Archetype]:
+        """Iterate non-empty archetypes having all given components"""
+        wanted = frozenset(components)
+        for signature, archetype in self.archetypes.items():
+            if wanted <= signature and len(archetype):
+                yield archetype
+
+    def on_contact(self, layer_a: int, layer_b: int,
+                   handler: ContactHandler) -> None:
+        """Register handler for contact of two collider layers"""
+        self.handlers[layer_a, layer_b] = handler
+
+    def tick(self) -> None:
+        """Run all built-in systems once"""
+        movement_system(self)
+        bounds_system(self)
+        lifetime_system(self)
+        contact_system(self)
+        self.flush()
+
+    def flush(self) -> None:
+        """Delete all entities killed during the tick"""
+        for entity in self.doomed:
+            self.despawn(entity)
+        self.doomed = []
+
+    def spawn_object(self, game_object: objs.BasicObject) -> int:
+        """Import game object from objects.py as an entity"""
+        sprite = self.register_sprite(game_object.img)
+        values = dict(x=game_object.pos[0], y=game_object.pos[1],
+                      sprite=sprite, phase=game_object.phase)
+        components = [Component.POSITION, Component.SPRITE]
+
+        if isinstance(game_object, objs.Player):
+            components += [Component.VELOCITY, Component.COLLIDER]
+            values.update(vx=game_object.speed[0], vy=game_object.speed[1],
+                          layer=LAYER_PLAYER)
+        elif isinstance(game_object, objs.Enemy):
+            components += [Component.VELOCITY, Component.COLLIDER]
+            values.update(vx=game_object.speed[0], vy=game_object.speed[1],
+                          layer=LAYER_ENEMY)
+        elif isinstance(game_object, objs.Wall):
+            components += [Component.COLLIDER]
+            values.update(layer=LAYER_SOLID)
+        elif isinstance(game_object, objs.Spikes):
+            components += [Component.COLLIDER]
+            values.update(layer=LAYER_HAZARD)
+        elif isinstance(game_object, objs.Gold):
+            components += [Component.COLLIDER, Component.PICKUP]
+            values.update(layer=LAYER_PICKUP, value=game_object.inc_val)
+        elif isinstance(game_object, objs.Bomb):
+            components += [Component.COLLIDER, Component.LIFETIME]
+            values.update(layer=LAYER_SOLID, ttl=game_object.duration)
+        elif isinstance(game_object, objs.Explosion):
+            components += [Component.COLLIDER, Component.LIFETIME]
+            ttl = game_object.duration[1] - game_object.duration[0]
+            values.update(layer=LAYER_BLAST, ttl=ttl)
+        return self.spawn(components, **values)
+
+
+class EntityView:
+    """Thin facade with object-like access to entity components"""
+    __slots__ = ('world', 'entity')
+
+    def __init__(self, world: World, entity: int) -> None:
+        """Initialise view of the entity"""
+        self.world: World = world
+        self.entity: int = entity
+
+    @property
+    def pos(self) -> ut.Coord:
+        """Position of the entity"""
+        return self.world.get(self.entity, 'x'), \
+            self.world.get(self.entity, 'y')
+
+    @pos.setter
+    def pos(self, value: ut.Coord) -> None:
+        self.world.set(self.entity, 'x', value[0])
+        self.world.set(self.entity, 'y', value[1])
+
+    @property
+    def speed(self) -> ut.Coord:
+        """Velocity of the entity"""
+        return self.world.get(self.entity, 'vx'), \
+            self.world.get(self.entity, 'vy')
+
+    @speed.setter
+    def speed(self, value: ut.Coord) -> None:
+        self.world.set(self.entity, 'vx', value[0])
+        self.world.set(self.entity, 'vy', value[1])
+
+    @property
+    def is_dead(self) -> bool:
+        """Check if entity does not exist anymore"""
+        return not self.world.is_alive(self.entity)
+
+    def draw(self, surface: ut.Image) -> None:
+        """Draw entity on the surface"""
+        sprite = self.world.sprites[self.world.get(self.entity, 'sprite')]
+        frame = CLOCK.frame(sprite, self.world.get(self.entity, 'phase'))
+        x, y = self.pos
+        surface.blit(frame, (x * ut.TILE, y * ut.TILE))
+
+
+def movement_system(world: World) -> None:
+    """Move all entities with velocity by one step"""
+    for archetype in world.query(Component.POSITION, Component.VELOCITY):
+        cols = archetype.columns
+        cols['x'] = array('i', map(operator.add, cols['x'], cols['vx']))
+        cols['y'] = array('i', map(operator.add, cols['y'], cols['vy']))
+
+
+def bounds_system(world: World) -> None:
+    """Keep moving entities inside the field"""
+    width, height = world.bsize
+    for archetype in world.query(Component.POSITION, Component.VELOCITY):
+        xs, ys = archetype.columns['x'], archetype.columns['y']
+        if world.fbounds == ut.FieldBounds.TORUS:
+            archetype.columns['x'] = array('i', (x % width for x in xs))
+            archetype.columns['y'] = array('i', (y % height for y in ys))
+            continue
+
+        vxs, vys = archetype.columns['vx'], archetype.columns['vy']
+        for row in range(len(archetype)):
+            if not 0 <= xs[row] < width:
+                xs[row] = max(0, min(xs[row], width - 1))
+                vxs[row] = -vxs[row]
+            if not 0 <= ys[row] < height:
+                ys[row] = max(0, min(ys[row], height - 1))
+                vys[row] = -vys[row]
+
+
+def lifetime_system(world: World) -> None:
+    """Count lifetimes down and kill expired entities"""
+    for archetype in world.query(Component.LIFETIME):
+        ttl = array('i', map(operator.sub, archetype.columns['ttl'],
+                             repeat(1)))
+        archetype.columns['ttl'] = ttl
+        if min(ttl) <= 0:
+            world.doomed.extend(entity for entity, left
+                                in zip(archetype.entities, ttl) if left <= 0)
+
+
+def contact_system(world: World) -> None:
+    """Find all pairs of colliders sharing a tile and dispatch them
+
+    Tile index is built once per tick, so the cost does not depend on the
+    number of registered entity types.
+    """
+    if not world.handlers:
+        return
+
+    cells: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+    for archetype in world.query(Component.POSITION, Component.COLLIDER):
+        cols = archetype.columns
+        for entity, x, y, layer in zip(archetype.entities, cols['x'],
+                                       cols['y'], cols['layer']):
+            cells.setdefault((x, y), []).append((layer, entity))
+
+    handlers = world.handlers
+    for occupants in cells.values():
+        if len(occupants) < 2:
+            continue
+        for idx, (layer_a, entity_a) in enumerate(occupants):
+            for layer_b, entity_b in occupants[idx+1:]:
+                handler = handlers.get((layer_a, layer_b))
+                if handler is not None:
+                    handler(world, entity_a, entity_b)
+                    continue
+                handler = handlers.get((layer_b, layer_a))
+                if handler is not None:
+                    handler(world, entity_b, entity_a)
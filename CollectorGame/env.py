@@ -0,0 +1,272 @@
+"""
+env.py -- reinforcement-learning environment
+============================================
+This is module, which wraps CollectorGame into gym-style environment with
+reset(seed)/step(action) methods. Environment works headless: nothing is
+drawn and no window is opened.
+
+Observation is NumPy array of shape (CHANNELS, height, width), where every
+channel counts objects of one kind on every tile. The array is updated in
+place from tiles that changed during the step, so it is never rebuilt.
+Static terrain (terrain.TerrainGrid) is converted to its channels with
+array operations, only when it has changed.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # numpy is needed only for this module
+    np = None
+
+import CollectorGame.utils as ut
+import CollectorGame.objects as objs
+import CollectorGame.modes as modes
+import CollectorGame.terrain as terrain
+
+
+# observation channels
+CH_WALL: int = 0
+CH_SPIKES: int = 1
+CH_GOLD: int = 2
+CH_ENEMY: int = 3
+CH_BOMB: int = 4
+CH_EXPLOSION: int = 5
+CH_PLAYER: int = 6
+CHANNELS: int = 7
+TERRAIN_CHANNELS: List[int] = [CH_WALL, CH_SPIKES, CH_GOLD]
+
+# actions: (player speed, player sight or None to keep it, set bomb)
+ACTIONS: List[Tuple[ut.Coord, Optional[ut.Coord], bool]] = [
+    ((0, 0), None, False),    # 0: stay
+    ((-1, 0), (-1, 0), False),  # 1: left
+    ((1, 0), (1, 0), False),  # 2: right
+    ((0, -1), (0, -1), False),  # 3: up
+    ((0, 1), (0, 1), False),  # 4: down
+    ((0, 0), None, True),     # 5: set bomb
+]
+
+REWARD_DEATH: float = -1.0
+REWARD_WIN: float = 1.0
+
+Observation = Any  # np.ndarray
+StepResult = Tuple[Observation, float, bool, Dict[str, Any]]
+# tracked object: (object, pos, weight, flat indices in observation)
+Tracked = Tuple[objs.BasicObject, ut.Coord, int, Tuple[int, ...]]
+
+
+def _wall_weight(wall: objs.Wall) -> int:
+    return 2 if wall.is_super else 1
+
+
+def _spikes_weight(spikes: objs.Spikes) -> int:
+    return 2 if spikes.is_activated else 1
+
+
+def _gold_weight(gold: objs.Gold) -> int:
+    return gold.inc_val
+
+
+# observation channel and weight function for every object type
+OBJECT_CHANNELS: Dict[type, Tuple[int, Optional[Callable[[Any], int]]]] = {
+    objs.Player: (CH_PLAYER, None),
+    objs.Enemy: (CH_ENEMY, None),
+    objs.Wall: (CH_WALL, _wall_weight),
+    objs.Spikes: (CH_SPIKES, _spikes_weight),
+    objs.Gold: (CH_GOLD, _gold_weight),
+    objs.Bomb: (CH_BOMB, None),
+    objs.Explosion: (CH_EXPLOSION, None),
+}
+
+
+def object_channel(game_object: objs.BasicObject) -> Tuple[int, int]:
+    """Get observation channel and weight of given game object"""
+    channel, weight = OBJECT_CHANNELS.get(type(game_object), (-1, None))
+    return channel, weight(game_object) if weight else 1
+
+
+def terrain_planes(cells: Any) -> Any:
+    """Get wall, spikes and gold channels of terrain tiles
+
+    Cells is uint8 array of terrain bits of shape (..., height, width),
+    result has shape (..., 3, height, width) (see TERRAIN_CHANNELS).
+    """
+    return np.stack([(cells & terrain.WALL) +
+                     ((cells & terrain.SUPER_WALL) >> 1),
+                     ((cells & terrain.SPIKES) >> 2) *
+                     (1 + ((cells & terrain.ARMED) >> 4)),
+                     cells >> terrain.GOLD_SHIFT], axis=-3)
+
+
+class CollectorEnv:
+    """Headless gym-style environment over CollectorGame"""
+
+    def __init__(self, max_ticks: int = 1000,
+                 win_mode: ut.WinCondition = ut.WinCondition.COLLECT_ALL,
+                 obs: Optional[Observation] = None) -> None:
+        """Initialise environment
+
+        If obs array is given, observations are written right into it
+        (it must be uint8 array of shape (CHANNELS, height, width)).
+        """
+        if np is None:
+            raise ImportError('CollectorEnv requires numpy')
+
+        shape = (CHANNELS, ut.BSIZE[1], ut.BSIZE[0])
+        if obs is None:
+            obs = np.zeros(shape, dtype=np.uint8)
+        elif obs.shape != shape or obs.dtype != np.uint8:
+            raise ValueError('observation buffer must be uint8 ' +
+                             str(shape))
+        self.obs: Observation = obs
+        self.flat: Observation = obs.reshape(-1)
+        self.plane: int = ut.BSIZE[0] * ut.BSIZE[1]
+
+        self.max_ticks: int = max_ticks
+        self.game: modes.CollectorGame = modes.CollectorGame(
+            win_mode=win_mode)
+        self.tracked: Dict[int, Tracked] = {}
+        # terrain planes, which are added to observation now
+        self.terrain_obs: Observation = np.zeros((len(TERRAIN_CHANNELS),) +
+                                                 shape[1:], dtype=np.uint8)
+        self.terrain_seen: Optional[Tuple[terrain.TerrainGrid, int]] = None
+        self.ticks: int = 0
+        self.done: bool = True
+
+    def reset(self, seed: Optional[int] = None) -> Observation:
+        """Start new level and return the first observation"""
+        if seed is not None:
+            self.game.rng.seed(seed)
+        self.game.init_level()
+        self.game.player.reset()
+        self.ticks = 0
+        self.done = False
+
+        self.obs.fill(0)
+        self.tracked = {}
+        self.terrain_obs.fill(0)
+        self.terrain_seen = None
+        self.sync()
+        return self.obs
+
+    def step(self, action: int) -> StepResult:
+        """Perform one game tick with given action
+
+        Returns (observation, reward, done, info). Observation is the same
+        array on every step, it is updated in place.
+        """
+        game = self.game
+        player = game.player
+        if self.done:
+            return self.obs, 0.0, True, self.info()
+
+        speed, sight, set_bomb = ACTIONS[action]
+        game.apply_controls(speed, sight or player.sight, set_bomb)
+
+        gold_before = player.gold[0]
+        game.action()
+        game.logic()
+        self.ticks += 1
+        self.sync()
+
+        reward = float(player.gold[0] - gold_before)
+        if player.is_dead:
+            reward += REWARD_DEATH
+            self.done = True
+        elif game.is_won():
+            reward += REWARD_WIN
+            self.done = True
+        elif self.ticks >= self.max_ticks:
+            self.done = True
+        return self.obs, reward, self.done, self.info()
+
+    def info(self) -> Dict[str, Any]:
+        """Get auxiliary information about current state"""
+        player = self.game.player
+        return {'tick': self.ticks,
+                'gold': player.gold,
+                'bombs': player.bombs,
+                'is_dead': player.is_dead,
+                'is_won': self.game.is_won(),
+                'truncated': self.done and self.ticks >= self.max_ticks}
+
+    def cells(self, game_object: objs.BasicObject,
+              channel: int) -> Tuple[int, ...]:
+        """Get flat observation indices of tiles covered by object"""
+        base = channel * self.plane
+        width = ut.BSIZE[0]
+        if isinstance(game_object, objs.Explosion):
+            x0, y0 = game_object.pos
+            covered = {(x, y0) for x in range(game_object.esizex[0],
+                                              game_object.esizex[1] + 1)}
+            covered.update((x0, y) for y in range(game_object.esizey[0],
+                                                  game_object.esizey[1] + 1))
+            return tuple(base + y * width + x for x, y in covered
+                         if 0 <= x < width and 0 <= y < ut.BSIZE[1])
+        x, y = game_object.pos
+        if not (0 <= x < width and 0 <= y < ut.BSIZE[1]):
+            return ()  # e.g. enemy bounced off the board for a tick
+        return (base + y * width + x,)
+
+    def sync(self) -> None:
+        """Apply changes of game objects to observation"""
+        game = self.game
+        flat = self.flat
+        tracked = self.tracked
+        alive: Dict[int, Tracked] = {}
+        channels = OBJECT_CHANNELS
+
+        for group in ([game.player], game.level_map,
+                      game.enemies, game.tempies):
+            for game_object in group:
+                key = id(game_object)
+                entry = tracked.pop(key, None)
+                channel, get_weight = channels.get(type(game_object),
+                                                   (-1, None))
+                weight = get_weight(game_object) if get_weight else 1
+                if entry is not None:
+                    if not game_object.is_dead and \
+                       entry[1] == game_object.pos and entry[2] == weight:
+                        alive[key] = entry
+                        continue
+                    self.take(entry[3], entry[2])
+
+                if channel < 0 or (game_object.is_dead and
+                                   game_object is not game.player):
+                    continue
+                indices = self.cells(game_object, channel)
+                self.put(indices, weight)
+                alive[key] = (game_object, game_object.pos, weight, indices)
+
+        # objects, which disappeared from the game
+        for entry in tracked.values():
+            self.take(entry[3], entry[2])
+        self.tracked = alive
+        self.sync_terrain()
+
+    def sync_terrain(self) -> None:
+        """Apply changes of terrain to observation"""
+        grid = self.game.terrain
+        if self.terrain_seen == (grid, grid.version):
+            return
+        cells = np.frombuffer(grid.cells, dtype=np.uint8).reshape(
+            grid.height, grid.width)
+        planes = terrain_planes(cells)
+        # uint8 arithmetic wraps, so the difference may be "negative"
+        self.obs[TERRAIN_CHANNELS] += planes - self.terrain_obs
+        self.terrain_obs = planes
+        self.terrain_seen = (grid, grid.version)
+
+    def put(self, indices: Tuple[int, ...], weight: int) -> None:
+        """Add weight to observation at given flat indices"""
+        if len(indices) == 1:
+            self.flat[indices[0]] += weight
+        else:
+            self.flat[list(indices)] += weight
+
+    def take(self, indices: Tuple[int, ...], weight: int) -> None:
+        """Subtract weight from observation at given flat indices"""
+        if len(indices) == 1:
+            self.flat[indices[0]] -= weight
+        else:
+            self.flat[list(indices)] -= weight
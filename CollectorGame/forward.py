@@ -0,0 +1,208 @@
+"""
+forward.py -- fast-forward of quiet ticks
+=========================================
+This is module, which skips ticks of headless games, during which nothing
+can meet anything: enemies fly on, fuses burn down, and the player stands
+still.
+
+Movement of enemies is known in advance (one step every ENEMY_SLOW ticks,
+turning back in front of walls and bouncing off the border), so it is
+enough to follow their steps up to the first object, to find the tick,
+when two enemies meet, and to look up the nearest timer. Everything before
+that tick is applied at once: enemies are put to their places and timers
+are moved forward (see TimerWheel.skip). The state after the jump is the
+same as after stepping the game tick by tick.
+"""
+
+from typing import List, Set, Tuple
+
+import CollectorGame.utils as ut
+import CollectorGame.objects as objs
+import CollectorGame.terrain as terrain
+import CollectorGame.modes as modes
+
+
+State = Tuple[ut.Coord, ut.Coord]  # position and speed of enemy
+
+
+def moves(slow_count: int, ticks: int) -> int:
+    """Get number of steps, which enemy makes during ticks"""
+    return (slow_count + ticks) // ut.ENEMY_SLOW
+
+
+def obstacles(game: modes.CollectorGame) -> Set[ut.Coord]:
+    """Get tiles, where enemies meet something (except walls of terrain)"""
+    tiles = {game.player.pos}
+    for map_object in game.level_map or ():
+        tiles.add(map_object.pos)
+    for effect in game.tempies or ():
+        tiles.update(effect.reach())
+    return tiles
+
+
+def fly(enemy: objs.Enemy, grid: terrain.TerrainGrid,
+        blocked: Set[ut.Coord], steps: int) -> List[State]:
+    """Follow free steps of enemy (up to given number)
+
+    Steps are made as in Enemy.action and Enemy.bound: enemy turns back
+    in front of walls and bounces off the border (or wraps around it).
+    Returns states after every step (the current one goes first) until
+    enemy reaches a blocked tile.
+    """
+    (x, y), (vx, vy) = enemy.pos, enemy.speed
+    width, height = ut.BSIZE
+    is_rect = enemy.fbounds == ut.FieldBounds.RECT
+    is_torus = enemy.fbounds == ut.FieldBounds.TORUS
+    # enemy, which was pushed over the border, is returned on the next tick
+    if (x, y) in blocked or not (0 <= x < width and 0 <= y < height):
+        return []
+    states = [((x, y), (vx, vy))]
+    if vx == 0 and vy == 0:
+        return states * (steps + 1)
+    cells = grid.cells
+    for _ in range(steps):
+        new_x, new_y = x + vx, y + vy
+        target_x, target_y = new_x, new_y
+        if is_torus:
+            target_x, target_y = new_x % width, new_y % height
+        if 0 <= target_x < width and 0 <= target_y < height and \
+           cells[target_y * width + target_x] & terrain.WALL:
+            new_x, new_y, vx, vy = x, y, -vx, -vy
+        elif (new_x, new_y) in blocked:  # explosions reach over the border
+            break
+        if is_rect:
+            if not 0 <= new_x < width:
+                new_x, vx = max(0, min(new_x, width - 1)), -vx
+            if not 0 <= new_y < height:
+                new_y, vy = max(0, min(new_y, height - 1)), -vy
+        elif is_torus:
+            new_x, new_y = new_x % width, new_y % height
+        if (new_x, new_y) in blocked:
+            break
+        x, y = new_x, new_y
+        states.append(((x, y), (vx, vy)))
+    return states
+
+
+def free_ticks(enemy: objs.Enemy, states: List[State], limit: int) -> int:
+    """Get number of ticks, which enemy spends on given steps"""
+    if len(states) > moves(enemy.slow_count, limit):
+        return limit
+    # the first step, which is not in states, is made on this tick
+    return len(states) * ut.ENEMY_SLOW - enemy.slow_count - 1
+
+
+def pair_ticks(first: objs.Enemy, first_states: List[State],
+               second: objs.Enemy, second_states: List[State],
+               limit: int) -> int:
+    """Get number of ticks, during which two enemies do not meet"""
+    low = 0
+    if first.fbounds == second.fbounds == ut.FieldBounds.RECT:
+        # enemies are surely apart while they can not fly the distance
+        # between them, so they are followed tick by tick only after that
+        distance = max(abs(first.pos[0] - second.pos[0]),
+                       abs(first.pos[1] - second.pos[1]))
+        first_step = max(abs(first.speed[0]), abs(first.speed[1]))
+        second_step = max(abs(second.speed[0]), abs(second.speed[1]))
+
+        def apart(ticks: int) -> bool:
+            return moves(first.slow_count, ticks) * first_step + \
+                moves(second.slow_count, ticks) * second_step < distance
+
+        if apart(limit):
+            return limit
+        high = limit
+        while high - low > 1:
+            middle = (low + high) // 2
+            if apart(middle):
+                low = middle
+            else:
+                high = middle
+    for tick in range(low + 1, limit + 1):
+        if first_states[moves(first.slow_count, tick)][0] == \
+           second_states[moves(second.slow_count, tick)][0]:
+            return tick - 1
+    return limit
+
+
+def horizon(game: modes.CollectorGame, limit: int) -> int:
+    """Get number of the next ticks (up to limit), where nothing happens"""
+    player = game.player
+    if game.level_map is None or game.tempies is None or \
+       game.enemies is None or limit <= 0:
+        return 0
+    if player.is_dead or player.set_bomb or player.speed != (0, 0) or \
+       not game.terrain.inside(player.pos) or \
+       game.terrain.tile(player.pos) & (terrain.SPIKES | terrain.GOLD_MASK) \
+       or game.terrain.pending:
+        return 0
+
+    # new objects (e.g. explosion, which has not burnt anything yet) have
+    # to go through one usual tick first
+    rebuilds = game.schedule.rebuilds + game.effects.rebuilds
+    game.schedule.track(game.level_map)
+    game.effects.track(game.tempies)
+    if game.schedule.rebuilds + game.effects.rebuilds != rebuilds or \
+       game.schedule.active or game.effects.active:
+        return 0
+    due = game.timers.next_due()
+    if due is not None:
+        limit = min(limit, due - game.timers.now - 1)
+
+    blocked = obstacles(game)
+    enemies = game.enemies
+    paths: List[List[State]] = []
+    for enemy in enemies:
+        if limit <= 0:
+            return 0
+        states = fly(enemy, game.terrain, blocked,
+                     moves(enemy.slow_count, limit))
+        limit = min(limit, free_ticks(enemy, states, limit))
+        paths.append(states)
+    for idx, first in enumerate(enemies):
+        for other in range(idx + 1, len(enemies)):
+            if limit <= 0:
+                return 0
+            limit = min(limit, pair_ticks(first, paths[idx], enemies[other],
+                                          paths[other], limit))
+    return max(0, limit)
+
+
+def skip(game: modes.CollectorGame, ticks: int) -> None:
+    """Apply given number of quiet ticks at once (see horizon)"""
+    blocked = obstacles(game)
+    for enemy in game.enemies or ():
+        steps = moves(enemy.slow_count, ticks)
+        if steps:
+            enemy.pos, enemy.speed = fly(enemy, game.terrain, blocked,
+                                         steps)[steps]
+        enemy.slow_count = (enemy.slow_count + ticks) % ut.ENEMY_SLOW
+    game.timers.skip(ticks)
+
+
+def fast_forward(game: modes.CollectorGame, limit: int) -> int:
+    """Jump over quiet ticks (up to limit); return number of skipped ones
+
+    The next tick after the jump is the one, where something may happen,
+    and it has to be stepped as usual (action and logic).
+    """
+    ticks = horizon(game, limit)
+    if ticks > 0:
+        skip(game, ticks)
+    return ticks
+
+
+def run(game: modes.CollectorGame, ticks: int) -> Tuple[int, int]:
+    """Run ticks of the game with idle player, jumping over quiet ones
+
+    Returns numbers of stepped and skipped ticks.
+    """
+    stepped = skipped = 0
+    while stepped + skipped < ticks:
+        jumped = fast_forward(game, ticks - stepped - skipped)
+        skipped += jumped
+        if stepped + skipped < ticks:
+            game.action()
+            game.logic()
+            stepped += 1
+    return stepped, skipped
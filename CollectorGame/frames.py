@@ -0,0 +1,71 @@
+"""
+frames.py -- zero-copy frame export
+===================================
+This is module, which renders CollectorGame frames offscreen for analysis
+tools, pixel-based agents and video analytics.
+
+Frames are drawn into one reusable Surface, which is built right over a
+preallocated buffer (pygame.image.frombuffer), so the same memory is seen
+as NumPy array (height, width, 4) with RGBX pixels: nothing is copied or
+saved to files, and the array is always the latest frame. With tile=1
+every tile of the field is exactly one pixel (sprites are scaled down to
+their average color once and cached).
+"""
+
+from typing import Any, Optional
+
+import pygame  # type: ignore
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # without numpy frames are plain memoryviews
+    np = None
+
+import CollectorGame.utils as ut
+import CollectorGame.render as render
+import CollectorGame.modes as modes
+from CollectorGame.animation import CLOCK
+
+
+PIXEL_FORMAT: str = 'RGBX'
+PIXEL_SIZE: int = 4
+
+
+class FrameRenderer:
+    """Offscreen renderer of CollectorGame with shared pixel buffer"""
+
+    def __init__(self, game: modes.CollectorGame,
+                 tile: int = ut.TILE) -> None:
+        """Initialise renderer for game with given size of tile in pixels"""
+        self.game: modes.CollectorGame = game
+        self.tile: int = tile
+        self.size: ut.Size = (ut.BSIZE[0] * tile, ut.BSIZE[1] * tile)
+        self.buffer: bytearray = bytearray(self.size[0] * self.size[1] *
+                                           PIXEL_SIZE)
+        self.surface: ut.Image = pygame.image.frombuffer(
+            self.buffer, self.size, PIXEL_FORMAT)
+        self.background: ut.Image = render.background(tile)
+        self.queue: render.RenderQueue = render.RenderQueue(tile)
+        self.frames: int = 0
+
+        self.pixels: Any = memoryview(self.buffer)
+        self.rgb: Any = None
+        if np is not None:
+            self.pixels = np.frombuffer(self.buffer, np.uint8).reshape(
+                self.size[1], self.size[0], PIXEL_SIZE)
+            self.rgb = self.pixels[:, :, :3]
+
+    def render(self, now_ms: Optional[int] = None) -> Any:
+        """Draw current state of the game; return pixels of the frame
+
+        Animations are moved to now_ms (milliseconds), if it is given.
+        The same array is returned every time: it is a view of the
+        frame buffer, so copy it to keep the frame.
+        """
+        if now_ms is not None:
+            CLOCK.tick(now_ms)
+        self.surface.blit(self.background, (0, 0))
+        self.game.submit(self.queue)
+        self.queue.flush(self.surface)
+        self.frames += 1
+        return self.pixels
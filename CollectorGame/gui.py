@@ -2,26 +2,89 @@
 gui.py -- GUI submodule
 =======================
 This is module, which contains GUI Classes.
+
+Layouts are written in pixels of design_size() window. Every GUI object
+scales its position and size by current GUI scale (see set_scale()), so
+dialogs built after resizing of the window fit into it.
 """
 
 import pygame  # type: ignore
-from typing import List, Tuple, Optional, Callable
+import threading
+from typing import Dict, List, Tuple, Optional, Callable
 import CollectorGame.images as images
 import CollectorGame.utils as ut
 
 
+# opened fonts and fitted font sizes are shared by all textboxes
+_fonts: Dict[Tuple[str, int], pygame.font.Font] = {}
+_fitted: Dict[Tuple[str, str, ut.Size], int] = {}
+_fonts_lock = threading.Lock()
+
+_scale: float = 1.0
+
+
+def design_size() -> ut.Size:
+    """Get size of the window, which GUI layouts are written for"""
+    return ut.BSIZE[0] * ut.TILE, ut.BSIZE[1] * ut.TILE
+
+
+def set_scale(window_size: ut.Size) -> None:
+    """Set GUI scale, which fits design_size() layouts into the window"""
+    global _scale
+    width, height = design_size()
+    _scale = min(window_size[0] / width, window_size[1] / height)
+
+
+def get_scale() -> float:
+    """Get current GUI scale"""
+    return _scale
+
+
+def scaled(value: ut.Coord) -> ut.Coord:
+    """Convert position or size from layout pixels to window pixels"""
+    return int(value[0] * _scale), int(value[1] * _scale)
+
+
+def get_font(font_path: str, text_size: int) -> pygame.font.Font:
+    """Get font of given size, opening font file only once"""
+    font = _fonts.get((font_path, text_size))
+    if font is None:
+        with _fonts_lock:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(font_path, text_size)
+            _fonts[font_path, text_size] = font
+    return font
+
+
+def fit_font(font_path: str, text: str, size: ut.Size) -> pygame.font.Font:
+    """Get the biggest font, which fits the text into given size"""
+    text_size = _fitted.get((font_path, text, size))
+    if text_size is None:
+        text_size = 10
+        while True:
+            test_font_size = get_font(font_path, text_size).size(text)
+            if test_font_size[0] > size[0] or test_font_size[1] > size[1]:
+                break
+            text_size += 1
+        text_size -= 1
+        _fitted[font_path, text, size] = text_size
+    return get_font(font_path, text_size)
+
+
 class GuiObject:
     """General entity of basic GUI object"""
     def __init__(self, pos: ut.Coord, size: ut.Size,
                  trigger_name: Optional[str] = None) -> None:
-        """Initialise GUI object"""
+        """Initialise GUI object (pos and size are in layout pixels)"""
         x = max(0, min(pos[0], ut.BSIZE[0]*ut.TILE-1))
         y = max(0, min(pos[1], ut.BSIZE[1]*ut.TILE-1))
-        self.pos: ut.Coord = (x, y)
+        self.pos: ut.Coord = scaled((x, y))
 
         sx = max(1, min(size[0], ut.BSIZE[0]*ut.TILE-1))
         sy = max(1, min(size[1], ut.BSIZE[1]*ut.TILE-1))
-        self.size: ut.Size = (sx, sy)
+        sx, sy = scaled((sx, sy))
+        self.size: ut.Size = (max(1, sx), max(1, sy))
 
         self.focus: bool = False
         self.is_pressed: bool = False
@@ -73,22 +136,13 @@ class TextBox(GuiObject):
                  color_p: pygame.Color = (0, 0, 0)) -> None:
         """Initialise textbox"""
         super().__init__(pos, size)
-        if not pygame.font.get_init():
-            pygame.font.init()
 
         self.text: str = text
         self.color: pygame.Color = color
         self.color_p: pygame.Color = color_p
         self.color_s: pygame.Color = color_s
 
-        text_size = 10
-        while True:
-            test_font = pygame.font.Font(font_path, text_size)
-            test_font_size = test_font.size(self.text)
-            if test_font_size[0] > size[0] or test_font_size[1] > size[1]:
-                break
-            text_size += 1
-        self.font: pygame.font.Font = pygame.font.Font(font_path, text_size-1)
+        self.font: pygame.font.Font = fit_font(font_path, text, self.size)
 
     def can_focus(self, mouse_pos: ut.Coord) -> bool:
         """Textbox cannot get focused in any case"""
@@ -149,9 +203,10 @@ class Button(GuiObject):
         self.bfunc = bfunc
         self.text: Optional[TextBox] = None
         if text:
-            text_pos_x = int(self.pos[0] + 0.08*self.size[0])
-            text_pos_y = int(self.pos[1] + 0.25*self.size[1])
-            text_size = int(0.85*self.size[0]), int(0.8*self.size[1])
+            # caption is laid out in layout pixels too
+            text_pos_x = int(pos[0] + 0.08*size[0])
+            text_pos_y = int(pos[1] + 0.25*size[1])
+            text_size = int(0.85*size[0]), int(0.8*size[1])
             self.text = TextBox((text_pos_x, text_pos_y), text_size, *text)
 
     def init_pdown(self, mouse_pos: ut.Coord,
@@ -199,11 +254,14 @@ class MenuMode:
                  triggers: Optional[List[ut.Trigger]] = None) -> None:
         """Set menu mode up"""
 
+        if _scale != 1.0:
+            menu_img = pygame.transform.scale(menu_img,
+                                              scaled(menu_img.get_size()))
         self.menu_img: ut.Image = menu_img
         self.back_img: Optional[ut.Image] = None
         x = max(0, min(menu_pos[0], ut.BSIZE[0] * ut.TILE - 1))
         y = max(0, min(menu_pos[1], ut.BSIZE[1] * ut.TILE - 1))
-        self.menu_pos: ut.Coord = (x, y)  # left upper corner
+        self.menu_pos: ut.Coord = scaled((x, y))  # left upper corner
         self.cursor_img: ut.Image = images.CURSOR_IMG
         self.gui: Optional[List[GuiObject]] = gui
         self.focused: Optional[int] = None
@@ -240,18 +298,18 @@ class MenuMode:
                screen: ut.Image) -> bool:
         """Event parser: process all events from previous tick"""
         for event in events:
-            if event.type is pygame.QUIT:
+            if event.type == pygame.QUIT:
                 return False
 
-            elif event.type is pygame.MOUSEBUTTONDOWN:
+            elif event.type == pygame.MOUSEBUTTONDOWN:
                 self.update_focus(event.pos)
                 if self.focused and self.gui:
                     self.pressed_down = True
                     self.gui[self.focused].init_pdown(event.pos, self.triggers)
-            elif event.type is pygame.MOUSEMOTION and self.pressed_down:
+            elif event.type == pygame.MOUSEMOTION and self.pressed_down:
                 if self.focused and self.gui:
                     self.gui[self.focused].next_pdown(event.pos, self.triggers)
-            elif event.type is pygame.MOUSEBUTTONUP:
+            elif event.type == pygame.MOUSEBUTTONUP:
                 if self.focused and self.gui:
                     self.gui[self.focused].init_pup(event.pos, self.triggers)
                     self.pressed_down = False
@@ -318,15 +376,15 @@ class CloseDialog(MenuMode):
                screen: ut.Image) -> bool:
         """Event parser: process all events from previous tick"""
         for event in events:
-            if event.type is pygame.MOUSEBUTTONDOWN:
+            if event.type == pygame.MOUSEBUTTONDOWN:
                 self.update_focus(event.pos)
                 if self.focused:
                     self.pressed_down = True
                     self.gui[self.focused].init_pdown(event.pos, self.triggers)
-            elif event.type is pygame.MOUSEMOTION and self.pressed_down:
+            elif event.type == pygame.MOUSEMOTION and self.pressed_down:
                 if self.focused:
                     self.gui[self.focused].next_pdown(event.pos, self.triggers)
-            elif event.type is pygame.MOUSEBUTTONUP:
+            elif event.type == pygame.MOUSEBUTTONUP:
                 if self.focused:
                     self.gui[self.focused].init_pup(event.pos, self.triggers)
                     self.pressed_down = False
@@ -412,19 +470,19 @@ class SplashScreen(MenuMode):
                screen: ut.Image) -> bool:
         """Event parser: process all events from previous tick"""
         for event in events:
-            if event.type is pygame.QUIT:
+            if event.type == pygame.QUIT:
                 dialog = CloseDialog()
                 if dialog.main_loop(screen):
                     return False
-            if event.type is pygame.MOUSEBUTTONDOWN:
+            if event.type == pygame.MOUSEBUTTONDOWN:
                 self.update_focus(event.pos)
                 if self.focused:
                     self.pressed_down = True
                     self.gui[self.focused].init_pdown(event.pos, self.triggers)
-            elif event.type is pygame.MOUSEMOTION and self.pressed_down:
+            elif event.type == pygame.MOUSEMOTION and self.pressed_down:
                 if self.focused:
                     self.gui[self.focused].next_pdown(event.pos, self.triggers)
-            elif event.type is pygame.MOUSEBUTTONUP:
+            elif event.type == pygame.MOUSEBUTTONUP:
                 if self.focused:
                     self.gui[self.focused].init_pup(event.pos, self.triggers)
                     self.pressed_down = False
@@ -575,21 +633,21 @@ class HelpScreen(MenuMode):
         """Event parser: process all events from previous tick"""
         guis = [self.button_quit, self.button_prev, self.button_next]
         for event in events:
-            if event.type is pygame.QUIT:
+            if event.type == pygame.QUIT:
                 dialog = CloseDialog()
                 if dialog.main_loop(screen):
                     return False
-            if event.type is pygame.MOUSEBUTTONDOWN:
+            if event.type == pygame.MOUSEBUTTONDOWN:
                 self.update_focus(event.pos)
                 if self.focused is not None:
                     self.pressed_down = True
                     guis[self.focused].init_pdown(event.pos, self.triggers)
 
-            elif event.type is pygame.MOUSEMOTION and self.pressed_down:
+            elif event.type == pygame.MOUSEMOTION and self.pressed_down:
                 if self.focused is not None:
                     guis[self.focused].next_pdown(event.pos, self.triggers)
 
-            elif event.type is pygame.MOUSEBUTTONUP:
+            elif event.type == pygame.MOUSEBUTTONUP:
                 if self.focused is not None:
                     guis[self.focused].init_pup(event.pos, self.triggers)
                     self.pressed_down = False
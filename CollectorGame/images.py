@@ -2,10 +2,14 @@
 images.py -- images submodule
 =============================
 This is module, where all image resources are loaded for future use.
+
+Images are not decoded on import: every name below is loaded on first
+access (or in advance by preload(), e.g. from a background thread).
 '''
 
+import threading
 from pygame import image as im  # type: ignore
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from os.path import abspath, dirname
 import CollectorGame.utils as ut
 
@@ -13,43 +17,138 @@ DIR = dirname(abspath(__file__))+r'/images/'
 
 
 # game sprites
-BACK_IMG: ut.Image = im.load(DIR+r'back.png')
-MAN_IMG: List[ut.Image] = [im.load(DIR+r'man'+str(x)+r'.png')
-                           for x in range(2)]
-LMAN_IMG: List[ut.Image] = [im.load(DIR+r'lman'+str(x)+r'.png')
-                            for x in range(2)]
-FMAN_IMG: List[ut.Image] = [im.load(DIR+r'fman'+str(x)+r'.png')
-                            for x in range(2)]
-DEATH_IMG: ut.Image = im.load(DIR+r'death.png')
-MONEY_IMG: List[ut.Image] = [im.load(DIR+r'money'+str(x)+r'.png')
-                             for x in range(6)]
-WALL_IMG: ut.Image = im.load(DIR+r'wall.png')
-SWALL_IMG: ut.Image = im.load(DIR+r'swall.png')
-SPIKE_IMG: ut.Image = im.load(DIR+r'spikes.png')
-DSPIKE_IMG: ut.Image = im.load(DIR+r'dspikes.png')
-ENEMY_IMG: List[ut.Image] = [im.load(DIR+r'enemy'+str(x)+r'.png')
-                             for x in range(4)]
-BOMB_IMG: ut.Image = im.load(DIR+r'bomb.png')
-BBOMB_IMG: List[ut.Image] = [im.load(DIR+r'bbomb'+str(x)+r'.png')
-                             for x in range(3)]
-BOOM_IMG: List[ut.Image] = [im.load(DIR+r'explosion'+str(x)+r'.png')
-                            for x in range(7)]
-FBONUS_IMG: List[ut.Image] = [im.load(DIR+r'fbonus'+str(x)+r'.png')
-                              for x in range(4)]
-IBONUS_IMG: List[ut.Image] = [im.load(DIR+r'ibonus'+str(x)+r'.png')
-                              for x in range(4)]
-LBONUS_IMG: List[ut.Image] = [im.load(DIR+r'lbonus'+str(x)+r'.png')
-                              for x in range(4)]
-CBONUS_IMG: List[ut.Image] = [im.load(DIR+r'cbonus'+str(x)+r'.png')
-                              for x in range(4)]
+BACK_IMG: ut.Image
+MAN_IMG: List[ut.Image]
+LMAN_IMG: List[ut.Image]
+FMAN_IMG: List[ut.Image]
+DEATH_IMG: ut.Image
+MONEY_IMG: List[ut.Image]
+WALL_IMG: ut.Image
+SWALL_IMG: ut.Image
+SPIKE_IMG: ut.Image
+DSPIKE_IMG: ut.Image
+ENEMY_IMG: List[ut.Image]
+BOMB_IMG: ut.Image
+BBOMB_IMG: List[ut.Image]
+BOOM_IMG: List[ut.Image]
+FBONUS_IMG: List[ut.Image]
+IBONUS_IMG: List[ut.Image]
+LBONUS_IMG: List[ut.Image]
+CBONUS_IMG: List[ut.Image]
+
+# shared one-frame sequences for static objects (one list for all instances)
+WALL_SEQ: List[ut.Image]
+SWALL_SEQ: List[ut.Image]
+SPIKE_SEQ: List[ut.Image]
+DSPIKE_SEQ: List[ut.Image]
 
 # gui images
-CURSOR_IMG: ut.Image = im.load(DIR+r'cursor.png')
-BUTT_TMP_IMG: ut.Image = im.load(DIR+r'button_template.png')
-BUTT_TMP_PRESSED_IMG: ut.Image = im.load(DIR+r'button_template_pressed.png')
-BUTT_ACC_IMG: ut.Image = im.load(DIR+r'button_accept.png')
-BUTT_CLS_IMG: ut.Image = im.load(DIR+r'button_close.png')
-BUTT_BCK_IMG: ut.Image = im.load(DIR+r'button_back.png')
-BUTT_NXT_IMG: ut.Image = im.load(DIR+r'button_next.png')
-SPLASH_IMG: ut.Image = im.load(DIR+r'splash.png')
-MENU_IMG: ut.Image = im.load(DIR+r'menu.png')
+CURSOR_IMG: ut.Image
+BUTT_TMP_IMG: ut.Image
+BUTT_TMP_PRESSED_IMG: ut.Image
+BUTT_ACC_IMG: ut.Image
+BUTT_CLS_IMG: ut.Image
+BUTT_BCK_IMG: ut.Image
+BUTT_NXT_IMG: ut.Image
+SPLASH_IMG: ut.Image
+MENU_IMG: ut.Image
+
+# name -> (file name without extension, number of frames or None)
+SOURCES: Dict[str, Tuple[str, Optional[int]]] = {
+    'BACK_IMG': ('back', None),
+    'MAN_IMG': ('man', 2),
+    'LMAN_IMG': ('lman', 2),
+    'FMAN_IMG': ('fman', 2),
+    'DEATH_IMG': ('death', None),
+    'MONEY_IMG': ('money', 6),
+    'WALL_IMG': ('wall', None),
+    'SWALL_IMG': ('swall', None),
+    'SPIKE_IMG': ('spikes', None),
+    'DSPIKE_IMG': ('dspikes', None),
+    'ENEMY_IMG': ('enemy', 4),
+    'BOMB_IMG': ('bomb', None),
+    'BBOMB_IMG': ('bbomb', 3),
+    'BOOM_IMG': ('explosion', 7),
+    'FBONUS_IMG': ('fbonus', 4),
+    'IBONUS_IMG': ('ibonus', 4),
+    'LBONUS_IMG': ('lbonus', 4),
+    'CBONUS_IMG': ('cbonus', 4),
+    'CURSOR_IMG': ('cursor', None),
+    'BUTT_TMP_IMG': ('button_template', None),
+    'BUTT_TMP_PRESSED_IMG': ('button_template_pressed', None),
+    'BUTT_ACC_IMG': ('button_accept', None),
+    'BUTT_CLS_IMG': ('button_close', None),
+    'BUTT_BCK_IMG': ('button_back', None),
+    'BUTT_NXT_IMG': ('button_next', None),
+    'SPLASH_IMG': ('splash', None),
+    'MENU_IMG': ('menu', None),
+}
+
+# one-frame sequence name -> name of its image
+SEQUENCES: Dict[str, str] = {
+    'WALL_SEQ': 'WALL_IMG',
+    'SWALL_SEQ': 'SWALL_IMG',
+    'SPIKE_SEQ': 'SPIKE_IMG',
+    'DSPIKE_SEQ': 'DSPIKE_IMG',
+}
+
+# everything needed to show the first level (loaded first)
+FIRST_LEVEL: List[str] = ['BACK_IMG', 'MAN_IMG', 'LMAN_IMG', 'MONEY_IMG',
+                          'SPIKE_SEQ', 'DSPIKE_SEQ', 'WALL_SEQ',
+                          'SWALL_SEQ', 'ENEMY_IMG', 'BBOMB_IMG', 'BOOM_IMG']
+
+_lock = threading.RLock()
+
+
+def load(name: str) -> Any:
+    """Load image resource by its name (does nothing if it is loaded)"""
+    loaded = globals().get(name)
+    if loaded is not None:
+        return loaded
+
+    with _lock:
+        loaded = globals().get(name)
+        if loaded is not None:
+            return loaded
+        if name in SEQUENCES:
+            loaded = [load(SEQUENCES[name])]
+        elif name in SOURCES:
+            file_name, frames = SOURCES[name]
+            if frames is None:
+                loaded = im.load(DIR+file_name+r'.png')
+            else:
+                loaded = [im.load(DIR+file_name+str(x)+r'.png')
+                          for x in range(frames)]
+        else:
+            raise AttributeError('no image resource named ' + name)
+        globals()[name] = loaded
+    return loaded
+
+
+def is_loaded(name: str) -> bool:
+    """Check if image resource is already in memory"""
+    return name in globals()
+
+
+def all_names() -> List[str]:
+    """Get names of all image resources, first level ones go first"""
+    names = list(FIRST_LEVEL)
+    names.extend(name for name in list(SOURCES) + list(SEQUENCES)
+                 if name not in names)
+    return names
+
+
+def preload(names: Optional[List[str]] = None,
+            progress: Optional[Callable[[str], None]] = None) -> None:
+    """Load given (or all) image resources, reporting every loaded name"""
+    for name in names if names is not None else all_names():
+        load(name)
+        if progress:
+            progress(name)
+
+
+def __getattr__(name: str) -> Any:
+    """Load image resource on first access to it"""
+    if name in SOURCES or name in SEQUENCES:
+        return load(name)
+    raise AttributeError("module 'images' has no attribute " + repr(name))
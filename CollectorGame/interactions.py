@@ -0,0 +1,248 @@
+"""
+interactions.py -- table of interactions between game objects
+=============================================================
+This is module, which decides what happens when two game objects meet:
+walls and bombs push back, gold is collected, spikes kill, explosions
+burn everything they reach.
+
+Handlers are registered for pairs of object types (the same way
+ecs.World does for collider layers), so every contact costs one dict
+lookup. Subclasses use handlers of their nearest base classes. Contacts
+are found through tile index of objects, which is built once per phase
+of the tick: every object meets only those, who stand on tiles it
+reaches (see BasicObject.reach). Enemies, which move during their own
+contacts, follow their tile instead (see Interactions.follow). New kinds
+of objects register their handlers instead of scanning all other
+objects.
+"""
+
+from typing import (Any, Callable, Dict, Iterable, List, NamedTuple,
+                    Optional, Tuple)
+
+import CollectorGame.utils as ut
+import CollectorGame.objects as objs
+
+
+class Scene(NamedTuple):
+    """What handlers know about the tick besides the two objects"""
+    players: List[objs.Player]
+
+
+# handler(object, object it meets, scene)
+Handler = Callable[[Any, Any, Scene], None]
+TileIndex = Dict[ut.Coord, List[objs.BasicObject]]
+Order = Dict[int, int]  # id(object) -> its index in the list
+
+
+class Interactions:
+    """Handlers of contacts keyed by types of both objects"""
+
+    def __init__(self) -> None:
+        """Initialise empty table"""
+        self.handlers: Dict[Tuple[type, type], Handler] = {}
+        # handlers found for every met pair of types (None if there is none)
+        self.resolved: Dict[Tuple[type, type], Optional[Handler]] = {}
+
+    def register(self, first: type, second: type, handler: Handler) -> None:
+        """Call handler when object of first type reaches the second one"""
+        self.handlers[first, second] = handler
+        self.resolved.clear()
+
+    def resolve(self, first: type, second: type) -> Optional[Handler]:
+        """Find handler for types or for the nearest of their bases"""
+        for first_base in first.__mro__:
+            for second_base in second.__mro__:
+                handler = self.handlers.get((first_base, second_base))
+                if handler is not None:
+                    return handler
+        return None
+
+    def copy(self) -> 'Interactions':
+        """Create new table with the same handlers"""
+        copied = Interactions()
+        copied.handlers = dict(self.handlers)
+        return copied
+
+    def touch(self, game_object: objs.BasicObject, index: TileIndex,
+              scene: Scene) -> None:
+        """Let object meet everybody from index on tiles it reaches
+
+        Objects are met only if they are still on the tile, and the ones
+        moved by handler (e.g. pushed back) are filed under their new tile.
+        """
+        resolved = self.resolved
+        # __class__ lets views of buffer.py pass for their objects
+        kind = game_object.__class__
+        for tile in game_object.reach():
+            for other in index.get(tile, ()):
+                key = kind, other.__class__
+                handler = resolved.get(key)
+                if handler is None and key not in resolved:
+                    handler = resolved[key] = self.resolve(*key)
+                if handler is None or other.pos != tile:
+                    continue
+                handler(game_object, other, scene)
+                if other.pos != tile:
+                    index.setdefault(other.pos, []).append(other)
+
+    def follow(self, game_object: objs.BasicObject, index: TileIndex,
+               scene: Scene, order: Order) -> None:
+        """Let object meet others on the tile, where it stands
+
+        Others are met in the given order, and object moved by handler
+        goes on with the ones after the last met on its new tile: just
+        like a pass through the whole list, but only objects on the tile
+        are looked at. Moved objects are filed under their new tiles.
+        """
+        kind = game_object.__class__
+        last = -1
+        while True:
+            tile = game_object.pos
+            found = None
+            rank = len(order)
+            for other in index.get(tile, ()):
+                other_rank = order.get(id(other), -1)
+                if last < other_rank < rank and other.pos == tile and \
+                   other is not game_object:
+                    found, rank = other, other_rank
+            if found is None:
+                return
+            last = rank
+            key = kind, found.__class__
+            if key not in self.resolved:
+                self.resolved[key] = self.resolve(*key)
+            handler = self.resolved[key]
+            if handler is None:
+                continue
+            handler(game_object, found, scene)
+            for moved in (game_object, found):
+                if moved.pos != tile:
+                    index.setdefault(moved.pos, []).append(moved)
+
+
+def tile_index(*groups: Iterable[objs.BasicObject]) -> TileIndex:
+    """Build index of objects by their tiles (groups keep their order)"""
+    index: TileIndex = {}
+    for group in groups:
+        for game_object in group:
+            found = index.get(game_object.pos)
+            if found is None:
+                index[game_object.pos] = [game_object]
+            else:
+                found.append(game_object)
+    return index
+
+
+def push_player(solid: objs.BasicObject, player: objs.Player,
+                scene: Scene) -> None:
+    """Return player, who walked into solid object, back"""
+    # TODO: add bonuses
+    player.pos = player.pos[0] - player.speed[0], \
+        player.pos[1] - player.speed[1]
+
+
+def bounce_enemy(solid: objs.BasicObject, enemy: objs.Enemy,
+                 scene: Scene) -> None:
+    """Return enemy, who flew into solid object, back and turn it"""
+    old_x = enemy.pos[0] - enemy.speed[0]
+    old_y = enemy.pos[1] - enemy.speed[1]
+
+    new_vx, new_vy = enemy.speed
+    if old_x != solid.pos[0]:
+        new_vx *= -1
+    if old_y != solid.pos[1]:
+        new_vy *= -1
+
+    enemy.pos = old_x, old_y
+    enemy.speed = new_vx, new_vy
+
+
+def take_gold(gold: objs.Gold, player: objs.Player,
+              scene: Scene) -> None:
+    """Give gold to player (the first one, if several stand on it)"""
+    if gold.is_dead:
+        return
+    player.gold = player.gold[0] + gold.inc_val, player.gold[1]
+    gold.collector = player
+    gold.is_dead = True
+
+
+def step_on_spikes(spikes: objs.Spikes, player: objs.Player,
+                   scene: Scene) -> None:
+    """Kill player with armed spikes or trigger them"""
+    if spikes.is_activated:
+        player.is_dead = True
+    elif not spikes.is_triggered:
+        spikes.is_triggered = True
+
+
+def burn(explosion: objs.Explosion, victim: objs.BasicObject,
+         scene: Scene) -> None:
+    """Kill player or enemy in the explosion"""
+    victim.is_dead = True
+
+
+def collide_enemies(enemy: objs.Enemy, other: objs.Enemy,
+                    scene: Scene) -> None:
+    """Turn back both enemies, which met on the same tile"""
+    old_x = enemy.pos[0] - enemy.speed[0]
+    old_y = enemy.pos[1] - enemy.speed[1]
+    old_other_x = other.pos[0] - other.speed[0]
+    old_other_y = other.pos[1] - other.speed[1]
+
+    new_vx, new_vy = enemy.speed
+    new_other_vx, new_other_vy = other.speed
+    if old_x != old_other_x:
+        new_vx *= -1
+        new_other_vx *= -1
+    if old_y != old_other_y:
+        new_vy *= -1
+        new_other_vy *= -1
+
+    enemy.pos = old_x, old_y
+    enemy.speed = new_vx, new_vy
+    other.pos = old_other_x, old_other_y
+    other.speed = new_other_vx, new_other_vy
+
+
+def break_wall(explosion: objs.Explosion, wall: objs.Wall,
+               scene: Scene) -> None:
+    """Break wall (super walls stand)"""
+    if wall.is_super is False:
+        wall.is_dead = True
+
+
+def burn_gold(explosion: objs.Explosion, gold: objs.Gold,
+              scene: Scene) -> None:
+    """Burn gold (players can't collect everything anymore)"""
+    gold.is_dead = True
+    for player in scene.players:
+        player.is_dead = True
+
+
+def disarm_spikes(explosion: objs.Explosion, spikes: objs.Spikes,
+                  scene: Scene) -> None:
+    """Break armed spikes, so they must be triggered again"""
+    if spikes.is_activated:
+        spikes.is_activated = False
+        spikes.is_triggered = False
+
+
+def default_table() -> Interactions:
+    """Build table of interactions of objects.py"""
+    table = Interactions()
+    for solid in (objs.Wall, objs.Bomb):
+        table.register(solid, objs.Player, push_player)
+        table.register(solid, objs.Enemy, bounce_enemy)
+    table.register(objs.Enemy, objs.Enemy, collide_enemies)
+    table.register(objs.Gold, objs.Player, take_gold)
+    table.register(objs.Spikes, objs.Player, step_on_spikes)
+    table.register(objs.Explosion, objs.Player, burn)
+    table.register(objs.Explosion, objs.Enemy, burn)
+    table.register(objs.Explosion, objs.Wall, break_wall)
+    table.register(objs.Explosion, objs.Gold, burn_gold)
+    table.register(objs.Explosion, objs.Spikes, disarm_spikes)
+    return table
+
+
+INTERACTIONS: Interactions = default_table()
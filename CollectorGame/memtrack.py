@@ -0,0 +1,149 @@
+"""
+memtrack.py -- memory growth tracking
+=====================================
+This is module, which watches memory of long game sessions to catch
+leaks in soak tests. It is opt-in, because tracemalloc slows Python down.
+
+Every few ticks allocations are snapshotted (only call sites in the game
+package are kept) and compared with the first snapshot, so the report
+shows which lines of objects.py, modes.py, gui.py etc. grow the most.
+RSS of the process is sampled at the same time.
+"""
+
+import os
+import sys
+import tracemalloc
+from typing import List, NamedTuple, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore
+
+
+# allocations are tracked by default in all modules of the package
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Sample(NamedTuple):
+    """Memory state at some tick"""
+    tick: int
+    traced: int  # bytes allocated by tracked modules
+    traced_peak: int  # peak of all traced allocations
+    rss: int
+    rss_peak: int
+
+
+class Growth(NamedTuple):
+    """Growth of allocations at one call site since the first snapshot"""
+    site: str
+    size_diff: int
+    count_diff: int
+    size: int
+
+
+def current_rss() -> int:
+    """Get resident set size of the process in bytes (0 if unknown)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return peak_rss()
+
+
+def peak_rss() -> int:
+    """Get peak resident set size of the process in bytes (0 if unknown)"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux counts it in kilobytes, macOS in bytes
+    return peak * 1024 if sys.platform.startswith('linux') else peak
+
+
+class MemoryTracker:
+    """Periodic tracemalloc snapshots with RSS samples"""
+
+    def __init__(self, interval: int = 100,
+                 dirs: Sequence[str] = (DIR,),
+                 frames: int = 1) -> None:
+        """Initialise tracker, which samples every interval ticks
+
+        Only allocations made by modules from given directories are kept.
+        With frames > 1 allocations are grouped by whole tracebacks.
+        """
+        self.interval: int = max(1, interval)
+        self.frames: int = max(1, frames)
+        self.filters: List[tracemalloc.Filter] = [
+            tracemalloc.Filter(True, os.path.join(directory, '*'))
+            for directory in dirs]
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.last: Optional[tracemalloc.Snapshot] = None
+        self.samples: List[Sample] = []
+        self.started_tracing: bool = False
+
+    def start(self) -> None:
+        """Start tracing allocations and take the first snapshot"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+        self.baseline = self.snapshot()
+        self.last = self.baseline
+        self.sample(0)
+
+    def stop(self) -> None:
+        """Stop tracing (if it was started by this tracker)"""
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def snapshot(self) -> tracemalloc.Snapshot:
+        """Take snapshot of allocations in tracked directories only"""
+        return tracemalloc.take_snapshot().filter_traces(self.filters)
+
+    def sample(self, tick: int) -> Sample:
+        """Record memory state at given tick"""
+        traced = 0
+        if self.last is not None:
+            traced = sum(stat.size
+                         for stat in self.last.statistics('filename'))
+        new_sample = Sample(tick, traced, tracemalloc.get_traced_memory()[1],
+                            current_rss(), peak_rss())
+        self.samples.append(new_sample)
+        return new_sample
+
+    def on_tick(self, tick: int) -> None:
+        """Take snapshot, if it is time for it"""
+        if tick % self.interval or self.baseline is None:
+            return
+        self.last = self.snapshot()
+        self.sample(tick)
+
+    def growth(self, limit: int = 10) -> List[Growth]:
+        """Get call sites, which grew the most since the first snapshot"""
+        if self.baseline is None or self.last is None:
+            return []
+        key = 'traceback' if self.frames > 1 else 'lineno'
+        result = []
+        for stat in self.last.compare_to(self.baseline, key):
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            site = '{}:{}'.format(os.path.basename(frame.filename),
+                                  frame.lineno)
+            result.append(Growth(site, stat.size_diff, stat.count_diff,
+                                 stat.size))
+        result.sort(key=lambda growth: growth.size_diff, reverse=True)
+        return result[:limit]
+
+    def report(self, limit: int = 10) -> str:
+        """Format growing call sites and RSS history as text"""
+        lines = ['{:<24} {:>12} {:>10} {:>12}'.format(
+            'site', 'grew, B', 'blocks', 'total, B')]
+        for growth in self.growth(limit):
+            lines.append('{:<24} {:>12} {:>10} {:>12}'.format(*growth))
+        lines.append('')
+        lines.append('{:>8} {:>12} {:>12} {:>12} {:>12}'.format(
+            'tick', 'traced, B', 'peak, B', 'RSS, B', 'peak RSS, B'))
+        for sample in self.samples:
+            lines.append('{:>8} {:>12} {:>12} {:>12} {:>12}'.format(*sample))
+        return '\n'.join(lines)
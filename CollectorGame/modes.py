@@ -6,12 +6,25 @@ This is main module, which contains main game classes.
 
 import pygame  # type: ignore
 import random
-from typing import List, Optional
+import time
+from array import array
+from typing import Any, List, Optional, Tuple
 
-import CollectorGame.images as images
 import CollectorGame.utils as ut
 import CollectorGame.objects as objs
+import CollectorGame.terrain as terrain
+import CollectorGame.schedule as schedule
+import CollectorGame.timers as timers
+import CollectorGame.interactions as interactions
+import CollectorGame.buffer as buffer
 import CollectorGame.gui as gui
+import CollectorGame.capture as capture
+import CollectorGame.assets as assets
+import CollectorGame.animation as animation
+import CollectorGame.render as render
+import CollectorGame.bus as bus
+import CollectorGame.telemetry as telemetry
+import CollectorGame.memtrack as memtrack
 
 
 class GameMode:
@@ -19,16 +32,15 @@ class GameMode:
     def __init__(self) -> None:
         """Set game mode up"""
         self.back_img: Optional[ut.Image] = None
-        pass
+        self.tile: int = ut.TILE
 
     def init(self) -> None:
         """What to do when entering this mode"""
-        wx = ut.BSIZE[0]*ut.TILE
-        wy = ut.BSIZE[1]*ut.TILE
-        self.back_img = pygame.Surface((wx, wy))
-        for tx in range(ut.BSIZE[0]):
-            for ty in range(ut.BSIZE[1]):
-                self.back_img.blit(images.BACK_IMG, (tx*ut.TILE, ty*ut.TILE))
+        self.init_background()
+
+    def init_background(self) -> None:
+        """Build background image for current size of tile"""
+        self.back_img = render.background(self.tile)
 
     def events(self, event: ut.Event,
                screen: ut.Image) -> bool:
@@ -56,19 +68,87 @@ class GameMode:
         """What to do when leaving this mode"""
         pass
 
+    def resize(self, tile: int) -> None:
+        """Adapt mode to new size of tile (in pixels)"""
+        self.tile = tile
+        if self.back_img is not None:
+            self.init_background()
+
+    def telemetry(self) -> Tuple[int, int, int, int]:
+        """Get numbers of map objects, enemies, effects and input state"""
+        return 0, 0, 0, 0
+
+
+class LoadingMode(GameMode):
+    """Minimal splash with progress bar, shown while assets are loading"""
+    def __init__(self, loader: assets.AssetLoader) -> None:
+        """Set loading mode up"""
+        super().__init__()
+        self.loader: assets.AssetLoader = loader
+        self.is_closed: bool = False
+
+    def init(self) -> None:
+        """What to do when entering this mode (no images are needed)"""
+        pass
+
+    def events(self, events: ut.Event,
+               screen: ut.Image) -> bool:
+        """Event parser: only closing of the window matters"""
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.is_closed = True
+                return False
+        return True
+
+    def draw(self, screen: ut.Image) -> None:
+        """Draw progress bar"""
+        width, height = screen.get_size()
+        bar = pygame.Rect(width // 8, height // 2 - 10, width * 3 // 4, 20)
+        screen.fill((30, 30, 30))
+        pygame.draw.rect(screen, (200, 200, 200), bar, 2)
+        bar.width = int(bar.width * self.loader.progress())
+        pygame.draw.rect(screen, (200, 200, 200), bar)
+
+    def check_game_state(self, screen: ut.Image) -> bool:
+        """Loading is over when the first level can be shown"""
+        return self.loader.first_level_ready.is_set()
+
 
 class Universe:
     """Game universe: manager of game modes"""
 
-    def __init__(self, sz: ut.Size = ut.BSIZE,
-                 tile: int = ut.TILE):
-        """Run an universe with display and game clock"""
+    def __init__(self, sz: Optional[ut.Size] = None,
+                 tile: int = ut.TILE,
+                 recorder: Optional[capture.FrameCapture] = None,
+                 flight: Optional[telemetry.FlightRecorder] = None,
+                 memory: Optional[memtrack.MemoryTracker] = None):
+        """Run an universe with display and game clock
+
+        If recorder is given, every shown frame is passed to it. Every tick
+        of the game loop is kept in flight recorder (a new one by default),
+        which is dumped if the loop crashes. If memory tracker is given,
+        it watches memory growth until the universe is finished and its
+        report is kept in memory_report.
+        """
         pygame.init()
+        sz = sz or ut.BSIZE
         screen_size: ut.Size = (int(sz[0] * tile), int(sz[1] * tile))
-        self.screen: ut.Image = pygame.display.set_mode(screen_size)
+        self.screen: ut.Image = pygame.display.set_mode(screen_size,
+                                                        pygame.RESIZABLE)
+        self.tile: int = tile
+        gui.set_scale(screen_size)
         self.game_clock: ut.Clock = pygame.time.Clock()
         self.time_delay: int = int(1000./ut.FPS)
         self.game_mode: Optional[GameMode] = None
+        self.recorder: Optional[capture.FrameCapture] = recorder
+        if flight is None:
+            flight = telemetry.FlightRecorder()
+        self.flight: telemetry.FlightRecorder = flight
+        self.memory: Optional[memtrack.MemoryTracker] = memory
+        self.memory_report: Optional[str] = None
+        if memory:
+            memory.start()
+        self.tick: int = 0
 
     def process_game(self, game_mode: GameMode) -> None:
         """Play given game mode"""
@@ -77,135 +157,289 @@ class Universe:
         self.main_loop()
         self.finish()
 
+    def preload(self, loader: assets.AssetLoader) -> bool:
+        """Show loading splash until the first level is ready
+
+        Returns False if the window was closed during loading.
+        """
+        loading = LoadingMode(loader)
+        self.game_mode = loading
+        self.start()
+        self.main_loop()
+        return not loading.is_closed
+
     def start(self) -> None:
         """Start running game mode"""
         if self.game_mode:
+            self.game_mode.resize(self.tile)
             self.game_mode.init()
 
+    def resize(self, size: ut.Size) -> None:
+        """Fit game field and GUI into resized window"""
+        self.screen = pygame.display.get_surface()
+        if self.screen.get_size() != tuple(size):
+            self.screen = pygame.display.set_mode(size, pygame.RESIZABLE)
+        self.screen.fill((0, 0, 0))
+        self.tile = max(1, min(size[0] // ut.BSIZE[0],
+                               size[1] // ut.BSIZE[1]))
+        gui.set_scale(size)
+        if self.game_mode:
+            self.game_mode.resize(self.tile)
+
     def main_loop(self):
         """Process in loop all game mode's procedures"""
+        try:
+            self.run_loop()
+        except BaseException as error:
+            self.flight.dump('{}: {}'.format(type(error).__name__, error))
+            raise
+        self.game_mode.leave()
+
+    def run_loop(self) -> None:
+        """Run game loop, recording every tick into flight recorder"""
+        clock = time.perf_counter_ns
+        row = array('q', bytes(8 * telemetry.STRIDE))
         game_trigger = True
         while game_trigger:
+            t0 = clock()
             events = pygame.event.get()
+            for event in events:
+                if event.type == pygame.VIDEORESIZE:
+                    self.resize(event.size)
             game_trigger = self.game_mode.events(events, self.screen)
+            t1 = clock()
             self.game_mode.action()
+            t2 = clock()
             self.game_mode.logic()
+            t3 = clock()
             self.game_mode.draw(self.screen)
+            t4 = clock()
             game_state = self.game_mode.check_game_state(self.screen)
+            t5 = clock()
             pygame.display.flip()
+            if self.recorder:
+                self.recorder.capture(self.screen)
+            t6 = clock()
+
+            row[0] = self.tick
+            row[1] = t0 // 1000
+            row[2] = (t1 - t0) // 1000
+            row[3] = (t2 - t1) // 1000
+            row[4] = (t3 - t2) // 1000
+            row[5] = (t4 - t3) // 1000
+            row[6] = (t5 - t4) // 1000
+            row[7] = (t6 - t5) // 1000
+            row[8] = len(events)
+            row[9], row[10], row[11], row[12] = self.game_mode.telemetry()
+            self.flight.record(row)
+            self.tick += 1
+            if self.memory:
+                self.memory.on_tick(self.tick)
+
             if game_state is True:
                 break
             self.game_clock.tick(self.time_delay)
-        self.game_mode.leave()
 
     def finish(self):
         """Finish game mode"""
+        if self.recorder:
+            self.recorder.close()
+        if self.memory:
+            self.memory.stop()
+            self.memory_report = self.memory.report()
         pygame.quit()
 
 
 class CollectorGame(GameMode):
     """Primary game mode with objects"""
 
-    def __init__(self, player: objs.Player = objs.Player(*ut.PLAYER_CONFIG),
+    def __init__(self, player: Optional[objs.Player] = None,
                  level_map: Optional[List[objs.BasicObject]] = None,
                  enemies: Optional[List[objs.Enemy]] = None,
                  tempies: Optional[List[objs.TempEffect]] = None,
-                 win_mode: ut.WinCondition = ut.WinCondition.COLLECT_ALL
+                 win_mode: ut.WinCondition = ut.WinCondition.COLLECT_ALL,
+                 level_config: ut.LevelConfig = ut.LevelConfig()
                  ) -> None:
-        """New game with objects"""
+        """New game with objects (new levels are made by level_config)"""
         GameMode.__init__(self)
+        if player is None:
+            player = objs.Player(*ut.PLAYER_CONFIG)
         self.player: objs.Player = player
-
+        self.rng: random.Random = random.Random()
+
+        # walls, spikes and gold are kept in terrain grid, not as objects
+        self.terrain: terrain.TerrainGrid = terrain.TerrainGrid()
+        if level_map is not None:
+            level_map = self.terrain.load(level_map)
+        self.init_terrain: terrain.TerrainGrid = self.terrain.copy()
+        # only map objects, which have something to do, are processed;
+        # fuses and lifetimes are counted by timer wheel
+        self.timers: timers.TimerWheel = timers.TimerWheel()
+        self.schedule: schedule.ActiveSet = schedule.ActiveSet(
+            wheel=self.timers)
+        self.effects: schedule.ActiveSet = schedule.ActiveSet(
+            wheel=self.timers)
+        # what happens when objects meet is decided by interaction table
+        self.interactions: interactions.Interactions = \
+            interactions.INTERACTIONS
+        # with buffer logic reads state before each phase and writes aside,
+        # so it does not depend on order of objects
+        self.buffer: Optional[buffer.WorldBuffer] = None
         self.level_map: Optional[List[objs.BasicObject]] = level_map
         map_copy = None
-        if self.level_map:
+        if self.level_map is not None:
             map_copy = [map_object.copy() for map_object in self.level_map]
         self.init_map: Optional[List[objs.BasicObject]] = map_copy
 
         self.enemies: Optional[List[objs.Enemy]] = enemies
         enemy_copy = None
-        if self.enemies:
+        if self.enemies is not None:
             enemy_copy = [enemy.copy() for enemy in self.enemies]
         self.init_enemies: Optional[List[objs.Enemy]] = enemy_copy
 
         self.tempies: Optional[List[objs.TempEffect]] = tempies
         self.win_mode: ut.WinCondition = win_mode
+        self.level_config: ut.LevelConfig = level_config
+        self.render_queue: render.RenderQueue = render.RenderQueue(self.tile)
+
+        # counters for win-lose checks, kept up to date by game events
+        self.bus: bus.EventBus = bus.EventBus()
+        self.gold_left: int = 0
+        self.enemies_left: int = 0
+        self.bus.subscribe(ut.GameEvent.GOLD_COLLECTED, self.count_gold)
+        self.bus.subscribe(ut.GameEvent.GOLD_LOST, self.count_gold)
+        self.bus.subscribe(ut.GameEvent.ENEMY_KILLED, self.count_enemy)
+        if level_map is not None:
+            self.count_level()
 
     def init(self):
         """What to do when entering this mode"""
         super().init()
+        animation.CLOCK.register_defaults()
+        self.init_level()
+
+    def resize(self, tile: int) -> None:
+        """Adapt game to new size of tile, scaling sprites once"""
+        render.prescale(tile)
+        self.render_queue.tile = tile
+        super().resize(tile)
+
+    def init_background(self) -> None:
+        """Build background image of the board for current size of tile"""
+        self.back_img = render.background(
+            self.tile, (self.terrain.width, self.terrain.height))
+
+    def init_level(self) -> None:
+        """Generate new level (no drawing involved)"""
         self.level_map = []
         self.enemies = []
         self.tempies = []
-
-        for x in range(10):
-            rand_pos = (random.randint(1, 19), random.randint(1, 19))
-            self.level_map.append(objs.Spikes(rand_pos, False))
-
-        for x in range(10):
-            rand_pos = (random.randint(1, 19), random.randint(1, 19))
-            self.level_map.append(objs.Gold(rand_pos))
-
-        for x in range(5):
-            rand_pos = (random.randint(1, 19), random.randint(1, 19))
-            rand_speed = (random.randint(-1, 1), random.randint(-1, 1))
+        self.terrain = terrain.TerrainGrid()
+        self.timers.clear()  # fuses of the old level must not go off
+
+        rng = self.rng
+        config = self.level_config
+        for x in range(config.spikes):
+            rand_pos = (rng.randint(1, 19), rng.randint(1, 19))
+            self.terrain.add_spikes(rand_pos, False)
+
+        for x in range(config.gold):
+            rand_pos = (rng.randint(1, 19), rng.randint(1, 19))
+            if not self.terrain.add_gold(rand_pos):
+                self.level_map.append(objs.Gold(rand_pos))
+
+        for x in range(config.enemies):
+            rand_pos = (rng.randint(1, 19), rng.randint(1, 19))
+            rand_speed = (rng.randint(-1, 1), rng.randint(-1, 1))
             self.enemies.append(objs.Enemy(rand_pos, rand_speed))
 
         self.init_map = [m.copy() for m in self.level_map]
+        self.init_terrain = self.terrain.copy()
         self.init_enemies = [e.copy() for e in self.enemies]
+        self.count_level()
+
+    def count_level(self) -> None:
+        """Count gold and enemies of the level
+
+        Must be called every time lists of level objects are replaced.
+        """
+        gold = [map_object.inc_val for map_object in self.level_map or []
+                if isinstance(map_object, objs.Gold)]
+        tiles, total = self.terrain.coins()
+        self.gold_left = len(gold) + tiles
+        self.enemies_left = len(self.enemies or [])
+        # coins to collect are the coins, which really exist
+        self.player.init_gold = 0, sum(gold) + total
+        self.player.gold = self.player.init_gold
+
+    def count_gold(self, event: ut.GameEvent, gold: Any) -> None:
+        """Update counter of gold left on the level"""
+        self.gold_left -= 1
+
+    def count_enemy(self, event: ut.GameEvent, enemy: objs.Enemy) -> None:
+        """Update counter of enemies left on the level"""
+        self.enemies_left -= 1
 
     def events(self, events: ut.Event,
                screen: ut.Image) -> bool:
         """Event parser: process all events from previous tick"""
         vx, vy = self.player.speed
         sight = self.player.sight
+        set_bomb = False
 
         for event in events:
-            if event.type is pygame.QUIT:
+            if event.type == pygame.QUIT:
                 dialog = gui.CloseDialog()
                 if dialog.main_loop(screen):
                     return False
 
-            if event.type is pygame.KEYDOWN and event.key == pygame.K_LEFT:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_LEFT:
                 vx = -1
                 sight = (-1, 0)
-            elif event.type is pygame.KEYDOWN and event.key == pygame.K_RIGHT:
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_RIGHT:
                 vx = 1
                 sight = (1, 0)
-            if event.type is pygame.KEYDOWN and event.key == pygame.K_UP:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_UP:
                 vy = -1
                 sight = (0, -1)
-            elif event.type is pygame.KEYDOWN and event.key == pygame.K_DOWN:
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_DOWN:
                 vy = 1
                 sight = (0, 1)
 
-            if event.type is pygame.KEYUP and event.key == pygame.K_LEFT:
+            if event.type == pygame.KEYUP and event.key == pygame.K_LEFT:
                 vx = 0
-            if event.type is pygame.KEYUP and event.key == pygame.K_RIGHT:
+            if event.type == pygame.KEYUP and event.key == pygame.K_RIGHT:
                 vx = 0
-            if event.type is pygame.KEYUP and event.key == pygame.K_UP:
+            if event.type == pygame.KEYUP and event.key == pygame.K_UP:
                 vy = 0
-            if event.type is pygame.KEYUP and event.key == pygame.K_DOWN:
+            if event.type == pygame.KEYUP and event.key == pygame.K_DOWN:
                 vy = 0
 
-            if event.type is pygame.KEYDOWN and event.key == pygame.K_SPACE:
-                self.player.set_bomb = True
-            if event.type is pygame.KEYDOWN and event.key == pygame.K_3:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                set_bomb = True
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_3:
                 self.player.duration = 3
-            if event.type is pygame.KEYDOWN and event.key == pygame.K_4:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_4:
                 self.player.duration = 4
-            if event.type is pygame.KEYDOWN and event.key == pygame.K_5:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_5:
                 self.player.duration = 5
-            if event.type is pygame.KEYDOWN and event.key == pygame.K_6:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_6:
                 self.player.duration = 6
-            if event.type is pygame.KEYDOWN and event.key == pygame.K_7:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_7:
                 self.player.duration = 7
 
-        self.player.speed = vx, vy
-        self.player.sight = sight
+        self.apply_controls((vx, vy), sight, set_bomb)
         GameMode.events(self, events, screen)
         return True
 
+    def apply_controls(self, speed: ut.Coord, sight: ut.Coord,
+                       set_bomb: bool = False) -> None:
+        """Pass player's input (from keyboard or any other source) to game"""
+        self.player.speed = speed
+        self.player.sight = sight
+        if set_bomb:
+            self.player.set_bomb = True
+
     def action(self) -> None:
         """Process actions of all game objects"""
         if self.level_map is None or \
@@ -213,16 +447,18 @@ class CollectorGame(GameMode):
            self.enemies is None:
             return
 
-        for map_object in self.level_map:
+        # idle objects stay where they are, so only active ones act
+        self.tick_timers()
+        for map_object in self.schedule.active:
             map_object.action(self.level_map, self.tempies)
 
         for enemy in self.enemies:
-            enemy.action(self.level_map, self.tempies)
+            enemy.action(self.level_map, self.tempies, self.terrain)
 
-        for temp_effect in self.tempies:
+        for temp_effect in self.effects.active:
             temp_effect.action(self.level_map, self.tempies)
 
-        self.player.action(self.level_map, self.tempies)
+        self.player.action(self.level_map, self.tempies, self.terrain)
 
     def logic(self) -> None:
         """Process logic of all game objects"""
@@ -231,19 +467,160 @@ class CollectorGame(GameMode):
            self.enemies is None:
             return
 
-        in_params = (self.player, self.level_map, self.enemies, self.tempies)
-        self.player.logic(*in_params)
-
-        for map_object in self.level_map:
-            map_object.logic(*in_params)
-
-        for tmp_effect in self.tempies:
-            tmp_effect.logic(*in_params)
-        for enemy in self.enemies:
-            enemy.logic(*in_params)
-
+        was_dead = self.player.is_dead
+        self.player.logic(self.player, self.level_map, self.enemies,
+                          self.tempies)
+        self.terrain_logic([self.player])
+
+        # map objects see only awake objects: the others are far away
+        # from everybody and from explosions
+        awake = self.awake_objects([self.player])
+        self.interact([self.player], awake)
+        self.blast_terrain([self.player])
+        self.enemies_logic([self.player], awake)
+        self.schedule.settle(awake)
+
+        if self.player.is_dead and not was_dead:
+            self.bus.publish(ut.GameEvent.PLAYER_DIED, self.player)
         self.destroy()
 
+    def interact(self, players: List[objs.Player],
+                 awake: List[objs.BasicObject]) -> None:
+        """Process contacts and logic of awake map objects and effects
+
+        Objects meet only the ones on tiles they reach (see
+        interactions.py), which are looked up in index of tiles built
+        once per phase. Every contact is processed once per tick, however
+        many players there are.
+        """
+        enemies = self.enemies or []
+        if awake:
+            self.run_phase(awake, players, awake, players, enemies)
+        if self.tempies:
+            self.run_phase(self.tempies, players, awake, players, awake,
+                           enemies)
+
+    def enemies_logic(self, players: List[objs.Player],
+                      awake: List[objs.BasicObject]) -> None:
+        """Process logic of enemies: catch players and collide once
+
+        Enemies go one by one in order of the list and meet only the
+        enemies on their tile (see Interactions.follow).
+        """
+        enemies: List[Any] = self.enemies or []
+        buf = self.buffer
+        if buf is not None:
+            # border goes first, so enemies meet where they really are
+            for enemy in enemies:
+                enemy.bound()
+            players = buf.views_of(players)  # type: ignore
+            enemies = buf.views_of(enemies)
+        table = self.interactions
+        scene = interactions.Scene(players)
+        index = interactions.tile_index(enemies)
+        order = {id(enemy): idx for idx, enemy in enumerate(enemies)}
+        for enemy in enemies:
+            if buf is not None:
+                buf.begin()
+            pos = enemy.pos
+            enemy.bound()
+            if enemy.pos != pos:
+                index.setdefault(enemy.pos, []).append(enemy)
+            for player in players:
+                enemy.catch(player)
+            table.follow(enemy, index, scene, order)
+        if buf is not None:
+            buf.commit()
+
+    def run_phase(self, objects: List[Any], players: List[objs.Player],
+                  awake: List[objs.BasicObject], *groups: List[Any]) -> None:
+        """Let objects meet the ones of groups and process their logic
+
+        Logic of object gets the player on its tile (or the first one).
+        In double-buffered mode objects see state before the phase, and
+        everything they write is applied after it.
+        """
+        buf = self.buffer
+        enemies: List[Any] = self.enemies or []
+        tempies: List[Any] = self.tempies or []
+        if buf is not None:
+            players = buf.views_of(players)  # type: ignore
+            objects = buf.views_of(objects)
+            awake = buf.views_of(awake)  # type: ignore
+            enemies = buf.views_of(enemies)
+            tempies = buf.views_of(tempies)
+            groups = tuple(buf.views_of(group) for group in groups)
+        table = self.interactions
+        scene = interactions.Scene(players)
+        index = interactions.tile_index(*groups) if groups else None
+        for game_object in objects:
+            if buf is not None:
+                buf.begin()
+            if index is not None:
+                table.touch(game_object, index, scene)
+            pos = game_object.pos
+            player = next((player for player in players if player.pos == pos),
+                          players[0])
+            game_object.logic(player, awake, enemies, tempies)
+        if buf is not None:
+            buf.commit()
+
+    def tick_timers(self) -> None:
+        """Start timers of new objects and fire the expired ones"""
+        # lists themselves are tracked (a new empty list would make
+        # objects be sorted out again on every tick)
+        if self.level_map is not None:
+            self.schedule.track(self.level_map)
+        if self.tempies is not None:
+            self.effects.track(self.tempies)
+        self.timers.advance()
+
+    def awake_objects(self, players: List[objs.Player]
+                      ) -> List[objs.BasicObject]:
+        """Wake map objects on tiles of players, enemies and explosions
+
+        Tiles where players and enemies come from are included too, as
+        they may be pushed back there.
+        """
+        if self.level_map is not None:
+            self.schedule.track(self.level_map)
+        if not self.schedule.sleeping:
+            return self.schedule.wake(())
+        tiles = set()
+        for game_object in [*players, *(self.enemies or ())]:
+            (x, y), (vx, vy) = game_object.pos, game_object.speed
+            tiles.add((x, y))
+            tiles.add((x - vx, y - vy))
+        for effect in self.tempies or ():
+            if isinstance(effect, objs.Explosion):
+                tiles.update(effect.tiles())
+        return self.schedule.wake(tiles)
+
+    def terrain_logic(self, players: List[objs.Player]) -> None:
+        """Let players step on spikes and collect gold of terrain"""
+        self.terrain.arm([player.pos for player in players])
+        for player in players:
+            killed, gold = self.terrain.step(player.pos)
+            if killed:
+                player.is_dead = True
+            if gold:
+                player.gold = player.gold[0] + gold, player.gold[1]
+                self.bus.publish(ut.GameEvent.GOLD_COLLECTED, player.pos)
+
+    def blast_terrain(self, players: List[objs.Player]) -> None:
+        """Apply explosions to terrain (burnt gold kills players)"""
+        for effect in self.tempies or ():
+            if not isinstance(effect, objs.Explosion):
+                continue
+            broken, burnt = self.terrain.blast(effect.tiles())
+            for pos in broken:
+                self.bus.publish(ut.GameEvent.WALL_DESTROYED, pos)
+            for pos in burnt:
+                self.bus.publish(ut.GameEvent.GOLD_LOST, pos)
+            if burnt:
+                for player in players:
+                    player.is_dead = True
+
     def draw(self, surface: ut.Image) -> None:
         """Draw all game objects"""
         if self.level_map is None or \
@@ -251,15 +628,22 @@ class CollectorGame(GameMode):
            self.enemies is None:
             return
 
+        animation.CLOCK.tick(pygame.time.get_ticks())
         GameMode.draw(self, surface)
-        for map_object in self.level_map:
-            map_object.draw(surface)
-        for enemy in self.enemies:
-            enemy.draw(surface)
-        for tmp_effect in self.tempies:
-            tmp_effect.draw(surface)
+        self.submit(self.render_queue)
+        self.render_queue.flush(surface)
+
+    def submit(self, queue: render.RenderQueue) -> None:
+        """Queue sprites of all game objects for drawing"""
+        self.terrain.submit(queue, render.LAYER_MAP)
+        for map_object in self.level_map or ():
+            map_object.submit(queue, render.LAYER_MAP)
+        for enemy in self.enemies or ():
+            enemy.submit(queue, render.LAYER_ENEMIES)
+        for tmp_effect in self.tempies or ():
+            tmp_effect.submit(queue, render.LAYER_EFFECTS)
 
-        self.player.draw(surface)
+        self.player.submit(queue, render.LAYER_PLAYER)
 
     def destroy(self) -> None:
         """Eliminate all marked objects from the game"""
@@ -268,20 +652,41 @@ class CollectorGame(GameMode):
            self.enemies is None:
             return
 
-        for idx, tmp_effect in enumerate(self.tempies):
-            if tmp_effect.is_dead:
-                tmp_effect.destroy(self.level_map, self.tempies)
-                del self.tempies[idx]
-
-        for idx, map_object in enumerate(self.level_map):
-            if map_object.is_dead:
-                map_object.destroy(self.level_map, self.tempies)
-                del self.level_map[idx]
-
-        for idx, enemy in enumerate(self.enemies):
-            if enemy.is_dead:
-                enemy.destroy(self.level_map, self.tempies)
-                del self.enemies[idx]
+        # lists are filtered in place (deleting while iterating skipped
+        # objects next to deleted ones)
+        for objects in (self.tempies, self.level_map, self.enemies):
+            dead = [game_object for game_object in objects
+                    if game_object.is_dead]
+            if not dead:
+                continue
+            objects[:] = [game_object for game_object in objects
+                          if not game_object.is_dead]
+            for game_object in dead:
+                game_object.destroy(self.level_map, self.tempies)
+                self.publish_death(game_object)
+
+    def telemetry(self) -> Tuple[int, int, int, int]:
+        """Get numbers of map objects, enemies, effects and input state"""
+        return (len(self.level_map or ()) + self.terrain.filled,
+                len(self.enemies or ()),
+                len(self.tempies or ()),
+                telemetry.pack_input(self.player.speed, self.player.set_bomb))
+
+    def publish_death(self, game_object: objs.BasicObject) -> None:
+        """Publish game event for removed game object"""
+        event = None
+        if isinstance(game_object, objs.Gold):
+            event = ut.GameEvent.GOLD_LOST
+            if game_object.collector is not None:
+                event = ut.GameEvent.GOLD_COLLECTED
+        elif isinstance(game_object, objs.Enemy):
+            event = ut.GameEvent.ENEMY_KILLED
+        elif isinstance(game_object, objs.Wall):
+            event = ut.GameEvent.WALL_DESTROYED
+        elif isinstance(game_object, objs.Bomb):
+            event = ut.GameEvent.BOMB_EXPLODED
+        if event is not None:
+            self.bus.publish(event, game_object)
 
     def reset(self) -> None:
         """Restart game from the very beginning"""
@@ -289,10 +694,24 @@ class CollectorGame(GameMode):
            self.init_enemies is None:
             return
 
-        self.player.reset()
         self.level_map = [map_object.copy() for map_object in self.init_map]
+        self.terrain = self.init_terrain.copy()
         self.enemies = [enemy.copy() for enemy in self.init_enemies]
         self.tempies = []
+        self.timers.clear()
+        self.count_level()
+        self.player.reset()
+
+    def is_won(self) -> bool:
+        """Check if win condition of the level is fulfilled"""
+        if self.win_mode == ut.WinCondition.COLLECT_ALL:
+            return self.gold_left == 0 and \
+                self.player.gold[0] >= self.player.gold[1]
+        elif self.win_mode == ut.WinCondition.KILL_ALL:
+            return self.enemies_left == 0
+        elif self.win_mode == ut.WinCondition.GET_GOAL:
+            return self.player.gold[0] > 0
+        return False
 
     def check_game_state(self, screen: ut.Image) -> bool:
         """Check for win-lose condition + splash screen"""
@@ -307,38 +726,20 @@ class CollectorGame(GameMode):
                 return False
             return True
 
-        elif self.win_mode == ut.WinCondition.COLLECT_ALL:
-            if self.player.gold[0] >= self.player.gold[1]:
-                title = 'Победа'
-                text1 = 'Вы собрали всё золото!'
-                congrats_id = random.randint(0, len(ut.UselessCongrats) - 1)
-                congrats = ut.UselessCongrats[congrats_id]
-                splash = gui.SplashScreen(title, text1, congrats)
-                if splash.main_loop(screen):
-                    self.reset()
-                    return False
-                return True
-        elif self.win_mode == ut.WinCondition.KILL_ALL and self.enemies:
-            if len(self.enemies) == 0:
-                title = 'Победа'
-                text1 = 'Вы зверски всех убили!'
-                congrats_id = random.randint(0, len(ut.UselessCongrats) - 1)
-                congrats = ut.UselessCongrats[congrats_id]
-                splash = gui.SplashScreen(title, text1, congrats)
-                if splash.main_loop(screen):
-                    self.reset()
-                    return False
-                return True
-
-        elif self.win_mode == ut.WinCondition.GET_GOAL:
-            if self.player.gold[0] > 0:
-                title = 'Победа'
-                text1 = 'Вы достигли цели!'
-                congrats_id = random.randint(0, len(ut.UselessCongrats) - 1)
-                congrats = ut.UselessCongrats[congrats_id]
-                splash = gui.SplashScreen(title, text1, congrats)
-                if splash.main_loop(screen):
-                    self.reset()
-                    return False
-                return True
-        return False
+        if not self.is_won():
+            return False
+
+        if self.win_mode == ut.WinCondition.COLLECT_ALL:
+            text1 = 'Вы собрали всё золото!'
+        elif self.win_mode == ut.WinCondition.KILL_ALL:
+            text1 = 'Вы зверски всех убили!'
+        else:
+            text1 = 'Вы достигли цели!'
+        title = 'Победа'
+        congrats_id = random.randint(0, len(ut.UselessCongrats) - 1)
+        congrats = ut.UselessCongrats[congrats_id]
+        splash = gui.SplashScreen(title, text1, congrats)
+        if splash.main_loop(screen):
+            self.reset()
+            return False
+        return True
@@ -4,14 +4,22 @@ objects.py -- submodule for game object classes
 This is module, which mainly consists of game object classes.
 """
 
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
 
 import CollectorGame.images as images
 import CollectorGame.utils as ut
+import CollectorGame.render as render
+from CollectorGame.animation import CLOCK
+
+if TYPE_CHECKING:
+    from CollectorGame.terrain import TerrainGrid
+    from CollectorGame.timers import Timer, TimerWheel
 
 
 class BasicObject:
     """Basic game object with position, speed and self-image"""
+    __slots__ = ('img', 'pos', 'init_pos', 'speed', 'init_speed',
+                 'phase', 'is_dead')
 
     def __init__(self, img: List[ut.Image],
                  pos: ut.Coord = (0, 0),
@@ -26,9 +34,9 @@ class BasicObject:
 
         vx = ut.sign(speed[0])*min(abs(speed[0]), ut.BSIZE[0]-1)
         vy = ut.sign(speed[1])*min(abs(speed[1]), ut.BSIZE[1]-1)
-        self.speed: ut.Coord = (vx, vy)
+        self.speed: ut.Coord = (vx, vy) if vx or vy else ut.NO_SPEED
         self.init_speed: ut.Coord = self.speed
-        self.draw_count: float = pos[1] % len(self.img)
+        self.phase: int = pos[1] % len(self.img)  # shift of animation
         self.is_dead: bool = False
 
     def copy(self) -> 'BasicObject':
@@ -41,17 +49,37 @@ class BasicObject:
         """Reset parameters of game object to initial values"""
         self.pos = self.init_pos[0], self.init_pos[1]
         self.speed = self.init_speed[0], self.init_speed[1]
-        self.draw_count: float = self.pos[1] % len(self.img)
+        self.phase = self.pos[1] % len(self.img)
         self.is_dead = False
 
+    def sprite(self) -> ut.Image:
+        """Get current frame of object's image"""
+        return CLOCK.frame(self.img, self.phase)
+
     def draw(self, surface: ut.Image) -> None:
         """Draw object on the surface"""
         draw_pos = (self.pos[0]*ut.TILE, self.pos[1]*ut.TILE)
-        surface.blit(self.img[int(self.draw_count)], draw_pos)
-        self.draw_count = (self.draw_count+ut.ANIMATION_ITER) % len(self.img)
+        surface.blit(self.sprite(), draw_pos)
+
+    def submit(self, queue: render.RenderQueue, layer: int) -> None:
+        """Queue object's sprite for batched drawing"""
+        queue.add(layer, self.sprite(), self.pos)
+
+    def is_idle(self) -> bool:
+        """Check if object does nothing until someone enters its tile"""
+        return False
+
+    def start_timers(self, timers: 'TimerWheel') -> None:
+        """Hand counting of ticks over to timer wheel"""
+        pass
+
+    def reach(self) -> Iterator[ut.Coord]:
+        """Iterate tiles, where object meets others (see interactions.py)"""
+        yield self.pos
 
     def action(self, level_map: List['BasicObject'],
-               tempies: List['TempEffect']) -> None:
+               tempies: List['TempEffect'],
+               terrain: Optional['TerrainGrid'] = None) -> None:
         """Perform action of game object"""
         new_x: int = self.pos[0] + self.speed[0]
         new_y: int = self.pos[1] + self.speed[1]
@@ -85,6 +113,7 @@ class BasicObject:
 
 class TempEffect(BasicObject):
     """Basic temporary game effect object"""
+    __slots__ = ()
 
     def __init__(self, img: List[ut.Image],
                  pos: ut.Coord,
@@ -96,9 +125,15 @@ class TempEffect(BasicObject):
         """Check if given position is included in effect's area"""
         return False
 
+    def reach(self) -> Iterator[ut.Coord]:
+        """Iterate tiles of effect's area"""
+        return iter(())
+
 
 class Enemy(BasicObject):
     """Basic enemy object"""
+    __slots__ = ('fbounds', 'slow_count')
+
     def __init__(self, pos: ut.Coord = (0, 0),
                  speed: ut.Coord = (0, 0),
                  fbounds: ut.FieldBounds = ut.FieldBounds.RECT) -> None:
@@ -113,20 +148,25 @@ class Enemy(BasicObject):
         return copy_object
 
     def action(self, level_map: List[BasicObject],
-               tempies: List[TempEffect]) -> None:
-        """Perform enemy action"""
+               tempies: List[TempEffect],
+               terrain: Optional['TerrainGrid'] = None) -> None:
+        """Perform enemy action (enemy turns back in front of wall)"""
         self.slow_count = (self.slow_count+1) % ut.ENEMY_SLOW
         x, y = self.pos
         if self.slow_count == 0:
             x += self.speed[0]
             y += self.speed[1]
+            if terrain is not None:
+                target = x, y
+                if self.fbounds == ut.FieldBounds.TORUS:
+                    target = x % ut.BSIZE[0], y % ut.BSIZE[1]
+                if terrain.is_wall(target):
+                    x, y = self.pos
+                    self.speed = -self.speed[0], -self.speed[1]
         self.pos = x, y
 
-    def logic(self, player: 'Player',
-              level_map: List[BasicObject],
-              enemies: List['Enemy'],
-              tempies: List[TempEffect]) -> None:
-        """Process enemy interaction with other objects"""
+    def bound(self) -> None:
+        """Bounce enemy off the border of RECT field or wrap it (TORUS)"""
         x, y = self.pos
         vx, vy = self.speed
         if self.fbounds == ut.FieldBounds.RECT:
@@ -143,36 +183,28 @@ class Enemy(BasicObject):
         self.speed = vx, vy
         self.pos = x, y
 
-        if player.pos[0] == self.pos[0] and player.pos[1] == self.pos[1]:
-            player.is_dead = True
-
-        for enemy in enemies:
-            if enemy is self:
-                continue
-            if enemy.pos[0] == self.pos[0] and enemy.pos[1] == self.pos[1]:
-                old_x = self.pos[0]-self.speed[0]
-                old_y = self.pos[1]-self.speed[1]
-                old_enemy_x = enemy.pos[0] - enemy.speed[0]
-                old_enemy_y = enemy.pos[1] - enemy.speed[1]
-
-                new_vx, new_vy = self.speed
-                new_enemy_vx, new_enemy_vy = enemy.speed
-                if old_x != old_enemy_x:
-                    new_vx *= -1
-                    new_enemy_vx *= -1
-                if old_y != old_enemy_y:
-                    new_vy *= -1
-                    new_enemy_vy *= -1
+    def logic(self, player: 'Player',
+              level_map: List[BasicObject],
+              enemies: List['Enemy'],
+              tempies: List[TempEffect]) -> None:
+        """Process enemy interaction with player
 
-                self.pos = old_x, old_y
-                self.speed = new_vx, new_vy
+        Collisions of enemies are handled by interactions.collide_enemies.
+        """
+        self.bound()
+        self.catch(player)
 
-                enemy.pos = old_enemy_x, old_enemy_y
-                enemy.speed = new_enemy_vx, new_enemy_vy
+    def catch(self, player: 'Player') -> None:
+        """Kill player on the same tile"""
+        if player.pos[0] == self.pos[0] and player.pos[1] == self.pos[1]:
+            player.is_dead = True
 
 
 class Player(BasicObject):
     """Object, representing player"""
+    __slots__ = ('fbounds', 'sight', 'set_bomb', 'bombs', 'init_bombs',
+                 'duration', 'gold', 'init_gold', 'bonus')
+
     def __init__(self, pos: ut.Coord = (0, 0),
                  bombs: Tuple[int, int] = (0, 3),
                  gold: Tuple[int, int] = (0, 0),
@@ -182,9 +214,6 @@ class Player(BasicObject):
         self.fbounds: ut.FieldBounds = fbounds
         self.sight: ut.Coord = (0, 0)
 
-        self.limg: List[ut.Image] = images.LMAN_IMG
-        self.fimg: List[ut.Image] = images.FMAN_IMG
-
         self.set_bomb: bool = False
         new_bombs = max(0, min(bombs[0], bombs[1])), bombs[1]
         self.bombs: Tuple[int, int] = new_bombs
@@ -211,22 +240,44 @@ class Player(BasicObject):
 
         self.bonus = None
 
-    def draw(self, surface: ut.Image) -> None:
-        """Draw player on the surface"""
-        draw_pos = (self.pos[0] * ut.TILE, self.pos[1] * ut.TILE)
+    @property
+    def limg(self) -> List[ut.Image]:
+        """Sprites of player with lightning bonus"""
+        return images.LMAN_IMG
+
+    @property
+    def fimg(self) -> List[ut.Image]:
+        """Sprites of player with fire bonus"""
+        return images.FMAN_IMG
+
+    def sprite(self) -> ut.Image:
+        """Get current frame of player's image"""
         if self.bonus is None:
-            surface.blit(self.img[int(self.draw_count)], draw_pos)
-        else:
-            # TODO: process player sprites correctly according to bonus
-            surface.blit(self.limg[int(self.draw_count)], draw_pos)
-        self.draw_count = (self.draw_count+ut.ANIMATION_ITER) % 2
+            return CLOCK.frame(self.img, self.phase)
+        # TODO: process player sprites correctly according to bonus
+        return CLOCK.frame(self.limg, self.phase)
+
+    def bounded(self, pos: ut.Coord) -> ut.Coord:
+        """Get position moved inside of the field"""
+        x, y = pos
+        if self.fbounds == ut.FieldBounds.RECT:
+            x = max(0, min(x, ut.BSIZE[0]-1))
+            y = max(0, min(y, ut.BSIZE[1]-1))
+        elif self.fbounds == ut.FieldBounds.TORUS:
+            x = (x+ut.BSIZE[0]) % ut.BSIZE[0]
+            y = (y+ut.BSIZE[1]) % ut.BSIZE[1]
+        return x, y
 
     def action(self, level_map: List[BasicObject],
-               tempies: List[TempEffect]) -> None:
-        """Perform player's action"""
+               tempies: List[TempEffect],
+               terrain: Optional['TerrainGrid'] = None) -> None:
+        """Perform player's action (player can't move into wall)"""
         new_x, new_y = self.pos[0] + self.speed[0], self.pos[1] + self.speed[1]
+        if terrain is not None and terrain.is_wall(self.bounded((new_x,
+                                                                 new_y))):
+            new_x, new_y = self.pos
         self.pos = (new_x, new_y)
-        if self.set_bomb and level_map:
+        if self.set_bomb and level_map is not None:
             self.set_bomb = False
             if self.bombs[0] > 0 and self.speed[0] == 0 and self.speed[1] == 0:
                 self.bombs = self.bombs[0]-1, self.bombs[1]
@@ -240,25 +291,19 @@ class Player(BasicObject):
               enemies: List[Enemy],
               tempies: List[TempEffect]) -> None:
         """Process player interaction with other objects"""
-        x, y = self.pos
-        if self.fbounds == ut.FieldBounds.RECT:
-            x = max(0, min(x, ut.BSIZE[0]-1))
-            y = max(0, min(y, ut.BSIZE[1]-1))
-        elif self.fbounds == ut.FieldBounds.TORUS:
-            x = (x+ut.BSIZE[0]) % ut.BSIZE[0]
-            y = (y+ut.BSIZE[1]) % ut.BSIZE[1]
-
-        self.pos = (x, y)
+        self.pos = self.bounded(self.pos)
 
 
 class Wall(BasicObject):
     """Wall game object """
+    __slots__ = ('is_super',)
+
     def __init__(self, pos: ut.Coord = (0, 0), is_super: bool = False) -> None:
         """Initialise Wall object"""
         if is_super:
-            super().__init__([images.SWALL_IMG], pos, (0, 0))
+            super().__init__(images.SWALL_SEQ, pos, (0, 0))
         else:
-            super().__init__([images.WALL_IMG], pos, (0, 0))
+            super().__init__(images.WALL_SEQ, pos, (0, 0))
         self.is_super: bool = is_super
 
     def copy(self) -> 'Wall':
@@ -266,43 +311,23 @@ class Wall(BasicObject):
         copy_object = Wall(self.pos, self.is_super)
         return copy_object
 
-    def draw(self, surface: ut.Image) -> None:
-        """Draw Wall object on the surface"""
-        draw_pos = (self.pos[0] * ut.TILE, self.pos[1] * ut.TILE)
-        surface.blit(self.img[0], draw_pos)
-
-    def logic(self, player: Player,
-              level_map: List[BasicObject],
-              enemies: List[Enemy],
-              tempies: List[TempEffect]) -> None:
-        """Process Wall interaction with other objects"""
-        if player.pos[0] == self.pos[0] and player.pos[1] == self.pos[1]:
-            # TODO: add bonuses
-            new_x = player.pos[0]-player.speed[0]
-            new_y = player.pos[1]-player.speed[1]
-            player.pos = (new_x, new_y)
-        for enemy in enemies:
-            if enemy.pos[0] == self.pos[0] and enemy.pos[1] == self.pos[1]:
-                old_x = enemy.pos[0] - enemy.speed[0]
-                old_y = enemy.pos[1] - enemy.speed[1]
-
-                new_vx, new_vy = enemy.speed
-                if old_x != self.pos[0]:
-                    new_vx *= -1
-                if old_y != self.pos[1]:
-                    new_vy *= -1
+    def sprite(self) -> ut.Image:
+        """Get image of Wall object"""
+        return self.img[0]
 
-                enemy.pos = old_x, old_y
-                enemy.speed = new_vx, new_vy
+    def is_idle(self) -> bool:
+        """Wall only pushes back those, who enter it"""
+        return True
 
 
 class Spikes(BasicObject):
     """Spikes game object."""
+    __slots__ = ('is_triggered', 'is_activated', 'is_init_activated')
+
     def __init__(self, pos: ut.Coord = (0, 0),
                  is_activated: bool = True) -> None:
         """Initialise Spikes"""
-        super().__init__([images.SPIKE_IMG], pos, (0, 0))
-        self.dimg: List[ut.Image] = [images.DSPIKE_IMG]
+        super().__init__(images.SPIKE_SEQ, pos, (0, 0))
         self.is_triggered: bool = False
         self.is_activated: bool = is_activated
         self.is_init_activated: bool = is_activated
@@ -317,30 +342,39 @@ class Spikes(BasicObject):
         super().reset()
         self.is_activated = self.is_init_activated
 
-    def draw(self, surface: ut.Image) -> None:
-        """Draw Spikes object on the surface"""
-        draw_pos = (self.pos[0] * ut.TILE, self.pos[1] * ut.TILE)
+    @property
+    def dimg(self) -> List[ut.Image]:
+        """Sprites of deactivated spikes"""
+        return images.DSPIKE_SEQ
+
+    def sprite(self) -> ut.Image:
+        """Get image of Spikes object"""
         if self.is_activated:
-            surface.blit(self.img[0], draw_pos)
-        else:
-            surface.blit(self.dimg[0], draw_pos)
+            return self.img[0]
+        return self.dimg[0]
+
+    def is_idle(self) -> bool:
+        """Armed or untouched spikes only wait for someone on their tile"""
+        return self.is_activated or not self.is_triggered
 
     def logic(self, player: Player,
               level_map: List[BasicObject],
               enemies: List[Enemy],
               tempies: List[TempEffect]) -> None:
-        """Process Spikes interaction with other objects"""
+        """Arm triggered Spikes as soon as player leaves them
+
+        Player on Spikes is handled by interactions.step_on_spikes.
+        """
         if player.pos[0] == self.pos[0] and player.pos[1] == self.pos[1]:
-            if self.is_activated:
-                player.is_dead = True
-            elif not self.is_triggered:
-                self.is_triggered = True
-        elif self.is_triggered and not self.is_activated:
+            return
+        if self.is_triggered and not self.is_activated:
             self.is_activated = True
 
 
 class Explosion(TempEffect):
     """Explosion object - temporary effect from the bomb"""
+    __slots__ = ('esizex', 'esizey', 'ticks', 'timer', 'etype', 'fbounds')
+
     def __init__(self, pos: ut.Coord = (0, 0),
                  esize: int = 2, duration: Tuple[int, int] = (0, 7),
                  etype: ut.ExplosionType = ut.ExplosionType.CROSS,
@@ -349,19 +383,49 @@ class Explosion(TempEffect):
         super().__init__(images.BOOM_IMG, pos, (0, 0))
         self.esizex: Tuple[int, int] = (pos[0]-esize, pos[0]+esize)
         self.esizey: Tuple[int, int] = (pos[1]-esize, pos[1]+esize)
-        self.duration: Tuple[int, int] = duration
+        self.ticks: Tuple[int, int] = duration
+        self.timer: Optional['Timer'] = None
         self.etype: ut.ExplosionType = etype
         self.fbounds: ut.FieldBounds = fbounds
 
-    def draw(self, surface: ut.Image) -> None:
-        """Draw Explosion object on the surface"""
+    @property
+    def duration(self) -> Tuple[int, int]:
+        """Age of Explosion and its lifetime (in ticks)"""
+        if self.timer is None:
+            return self.ticks
+        return self.ticks[1] - self.timer.remaining(), self.ticks[1]
+
+    @duration.setter
+    def duration(self, duration: Tuple[int, int]) -> None:
+        self.ticks = duration
+        if self.timer is not None:
+            self.timer = self.timer.wheel.restart(
+                self.timer, duration[1] - duration[0])
+
+    def start_timers(self, timers: 'TimerWheel') -> None:
+        """Let timer wheel count lifetime of Explosion"""
+        if self.timer is None and not self.is_dead:
+            self.timer = timers.add(self.ticks[1] - self.ticks[0],
+                                    self.expire)
+
+    def expire(self) -> None:
+        """End of Explosion's lifetime"""
+        self.is_dead = True
+
+    def is_idle(self) -> bool:
+        """Explosion with timer has nothing to count"""
+        return self.timer is not None
+
+    def sprite(self) -> ut.Image:
+        """Get current frame of Explosion (depends on its lifetime)"""
         if self.duration[0] <= 2:
-            img_to_draw = self.img[self.duration[0]]
+            return self.img[self.duration[0]]
         elif self.duration[1]-self.duration[0] <= 3:
-            img_to_draw = self.img[self.duration[0]-self.duration[1]]
-        else:
-            img_to_draw = self.img[3+self.duration[0] % 2]
+            return self.img[self.duration[0]-self.duration[1]]
+        return self.img[3+self.duration[0] % 2]
 
+    def tiles(self) -> Iterator[ut.Coord]:
+        """Iterate all visible tiles covered by Explosion"""
         if self.etype is ut.ExplosionType.CROSS:
             for x in range(self.esizex[0], self.esizex[1]+1):
                 if self.fbounds == ut.FieldBounds.RECT:
@@ -369,22 +433,47 @@ class Explosion(TempEffect):
                         continue
                 elif self.fbounds == ut.FieldBounds.TORUS:
                     x = (x + ut.BSIZE[0]) % ut.BSIZE[0]
-                draw_pos = (x * ut.TILE, self.pos[1] * ut.TILE)
-                surface.blit(img_to_draw, draw_pos)
+                yield x, self.pos[1]
 
             for y in range(self.esizey[0], self.esizey[1]+1):
                 if self.fbounds == ut.FieldBounds.RECT:
                     if y < 0 or y >= ut.BSIZE[1]:
                         continue
                 elif self.fbounds == ut.FieldBounds.TORUS:
-                    y = (y + ut.BSIZE[0]) % ut.BSIZE[0]
-                draw_pos = (self.pos[0] * ut.TILE, y * ut.TILE)
-                surface.blit(img_to_draw, draw_pos)
+                    y = (y + ut.BSIZE[1]) % ut.BSIZE[1]
+                yield self.pos[0], y
         elif self.etype is ut.ExplosionType.CIRCLE:
             pass
 
+    def reach(self) -> Iterator[ut.Coord]:
+        """Iterate all tiles included in Explosion's area (see includes)
+
+        Unlike tiles(), these are not clipped by the field: enemies may
+        fly over the edge for a tick.
+        """
+        if self.etype == ut.ExplosionType.CROSS and \
+           self.fbounds == ut.FieldBounds.RECT:
+            for y in range(self.esizey[0], self.esizey[1]+1):
+                yield self.pos[0], y
+            for x in range(self.esizex[0], self.esizex[1]+1):
+                if x != self.pos[0]:
+                    yield x, self.pos[1]
+
+    def draw(self, surface: ut.Image) -> None:
+        """Draw Explosion object on the surface"""
+        img_to_draw = self.sprite()
+        for x, y in self.tiles():
+            surface.blit(img_to_draw, (x * ut.TILE, y * ut.TILE))
+
+    def submit(self, queue: render.RenderQueue, layer: int) -> None:
+        """Queue every tile of Explosion for batched drawing"""
+        img_to_draw = self.sprite()
+        for tile in self.tiles():
+            queue.add(layer, img_to_draw, tile)
+
     def action(self, level_map: List[BasicObject],
-               tempies: List[TempEffect]) -> None:
+               tempies: List[TempEffect],
+               terrain: Optional['TerrainGrid'] = None) -> None:
         """Perform Explosion's action"""
         curr_duration: int = self.duration[0]
         curr_duration += 1
@@ -409,76 +498,58 @@ class Explosion(TempEffect):
             pass
         return False
 
-    def logic(self, player: Player,
-              level_map: List[BasicObject],
-              enemies: List[Enemy],
-              tempies: List[TempEffect]) -> None:
-        """Process Explosion interaction with other objects"""
-
-        if self.includes(player.pos):
-            player.is_dead = True
-
-        for map_object in level_map:
-            if self.includes(map_object.pos):
-                if isinstance(map_object, Wall):
-                    if map_object.is_super is False:
-                        map_object.is_dead = True
-                if isinstance(map_object, Gold):
-                    map_object.is_dead = True
-                    player.is_dead = True
-                if isinstance(map_object, Spikes):
-                    if map_object.is_activated:
-                        map_object.is_activated = False
-                        map_object.is_triggered = False
-
-        for enemy in enemies:
-            if self.includes(enemy.pos):
-                enemy.is_dead = True
-
 
 class Bomb(BasicObject):
     """Bomb game object"""
+    __slots__ = ('fuse_ticks', 'fuse', 'bomb_range')
+
     def __init__(self, pos: ut.Coord = (0, 0),
                  duration: int = 20, bomb_range: int = 2) -> None:
         """Initialise Bomb object"""
 
         super().__init__(images.BBOMB_IMG, pos, (0, 0))
-        self.duration: int = duration
+        self.fuse_ticks: int = duration
+        self.fuse: Optional['Timer'] = None
         self.bomb_range: int = bomb_range
 
-    def action(self, level_map: List[BasicObject],
-               tempies: List[TempEffect]) -> None:
-        """Perform Bomb action"""
+    def copy(self) -> 'Bomb':
+        """Create new copy of Bomb object"""
+        return Bomb(self.pos, self.duration, self.bomb_range)
 
-        self.duration -= 1
-        if self.duration <= 0:
-            self.is_dead = True
+    @property
+    def duration(self) -> int:
+        """Ticks left before the bomb explodes"""
+        if self.fuse is None:
+            return self.fuse_ticks
+        return self.fuse.remaining()
 
-    def logic(self, player: Player,
-              level_map: List[BasicObject],
-              enemies: List[Enemy],
-              tempies: List[TempEffect]) -> None:
-        """Process Bomb interaction with other objects"""
+    @duration.setter
+    def duration(self, ticks: int) -> None:
+        self.fuse_ticks = ticks
+        if self.fuse is not None:
+            self.fuse = self.fuse.wheel.restart(self.fuse, ticks)
 
-        if player.pos[0] == self.pos[0] and player.pos[1] == self.pos[1]:
-            # TODO: add bonuses
-            new_x = player.pos[0] - player.speed[0]
-            new_y = player.pos[1] - player.speed[1]
-            player.pos = (new_x, new_y)
+    def start_timers(self, timers: 'TimerWheel') -> None:
+        """Let timer wheel count down the fuse"""
+        if self.fuse is None and not self.is_dead:
+            self.fuse = timers.add(self.fuse_ticks, self.expire)
 
-        for enemy in enemies:
-            if enemy.pos[0] == self.pos[0] and enemy.pos[1] == self.pos[1]:
-                old_x = enemy.pos[0] - enemy.speed[0]
-                old_y = enemy.pos[1] - enemy.speed[1]
+    def expire(self) -> None:
+        """Fuse has burnt down"""
+        self.is_dead = True
 
-                new_vx, new_vy = enemy.speed
-                if old_x != self.pos[0]:
-                    new_vx *= -1
-                if old_y != self.pos[1]:
-                    new_vy *= -1
+    def is_idle(self) -> bool:
+        """Bomb with lit fuse only pushes back those, who enter it"""
+        return self.fuse is not None
 
-                enemy.pos = old_x, old_y
-                enemy.speed = new_vx, new_vy
+    def action(self, level_map: List[BasicObject],
+               tempies: List[TempEffect],
+               terrain: Optional['TerrainGrid'] = None) -> None:
+        """Perform Bomb action"""
+
+        self.duration -= 1
+        if self.duration <= 0:
+            self.is_dead = True
 
     def destroy(self, level_map: List[BasicObject],
                 tempies: List[TempEffect]) -> None:
@@ -488,25 +559,29 @@ class Bomb(BasicObject):
 
 class Gold(BasicObject):
     """Coin game object"""
+    __slots__ = ('inc_val', 'collector')
+
     def __init__(self, pos: ut.Coord = (0, 0),
                  inc_val: int = 1) -> None:
         """Initialise Gold object"""
         super().__init__(images.MONEY_IMG, pos, (0, 0))
         self.inc_val = inc_val
+        # player, who took the gold (dead gold without collector is lost)
+        self.collector: Optional[Player] = None
+
+    def reset(self) -> None:
+        """Reset Gold object to initial values"""
+        super().reset()
+        self.collector = None
 
     def copy(self) -> 'Gold':
         """Create new copy of Gold object"""
         copy_object = Gold(self.pos, self.inc_val)
         return copy_object
 
-    def logic(self, player: Player,
-              level_map: List[BasicObject],
-              enemies: List[Enemy],
-              tempies: List[TempEffect]) -> None:
-        """Process Gold interaction with other objects"""
-        if player.pos[0] == self.pos[0] and player.pos[1] == self.pos[1]:
-            player.gold = player.gold[0]+self.inc_val, player.gold[1]
-            self.is_dead = True
+    def is_idle(self) -> bool:
+        """Gold waits for player"""
+        return True
 
 # class FireBonus(BonusObject):
 #     def __init__(self, pos=(0, 0), ipos=(0, 0), speed=(0, 0),
@@ -0,0 +1,112 @@
+"""
+render.py -- batched sprite rendering
+=====================================
+This is module, which collects sprites of all game objects for the frame
+and draws them with one Surface.blits() call per layer.
+
+Layers are drawn in order of their numbers, so objects of the upper
+layers are always drawn over objects of the lower ones. Inside of one
+layer sprites may be sorted, so blits of the same image go one by one.
+
+Sprites are authored for ut.TILE. For any other tile size every sprite
+is scaled once and the scaled copy is cached, so nothing is scaled per
+frame, whatever the size of the window is.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame  # type: ignore
+
+import CollectorGame.utils as ut
+import CollectorGame.images as images
+
+
+# layers in the drawing order
+LAYER_MAP: int = 0
+LAYER_ENEMIES: int = 1
+LAYER_EFFECTS: int = 2
+LAYER_PLAYER: int = 3
+LAYERS: int = 4
+
+BlitItem = Tuple[ut.Image, ut.Coord]
+
+# (id of sprite, tile) -> (sprite, its scaled copy)
+_scaled: Dict[Tuple[int, int], Tuple[ut.Image, ut.Image]] = {}
+
+
+def scaled(sprite: ut.Image, tile: int) -> ut.Image:
+    """Get copy of sprite scaled for given tile (made once and cached)"""
+    if tile == ut.TILE:
+        return sprite
+    entry = _scaled.get((id(sprite), tile))
+    if entry is None or entry[0] is not sprite:
+        size = (sprite.get_width() * tile // ut.TILE,
+                sprite.get_height() * tile // ut.TILE)
+        try:
+            copy = pygame.transform.smoothscale(sprite, size)
+        except ValueError:  # smoothscale needs 24 or 32 bit surfaces
+            copy = pygame.transform.scale(sprite, size)
+        entry = sprite, copy
+        _scaled[id(sprite), tile] = entry
+    return entry[1]
+
+
+def background(tile: int, size: Optional[ut.Size] = None) -> ut.Image:
+    """Build background of the field (size is in tiles, board by default)"""
+    size = size or ut.BSIZE
+    surface = pygame.Surface((size[0] * tile, size[1] * tile))
+    back_tile = scaled(images.BACK_IMG, tile)
+    surface.blits([(back_tile, (tx * tile, ty * tile))
+                   for tx in range(size[0]) for ty in range(size[1])], False)
+    return surface
+
+
+def prescale(tile: int, names: Iterable[str] = images.FIRST_LEVEL) -> None:
+    """Scale all loaded game sprites for given tile in advance
+
+    Copies made for other tile sizes are dropped.
+    """
+    for key in [key for key in _scaled if key[1] != tile]:
+        del _scaled[key]
+    for name in names:
+        if not images.is_loaded(name):
+            continue
+        resource = images.load(name)
+        for sprite in resource if isinstance(resource, list) else [resource]:
+            scaled(sprite, tile)
+
+
+def sprite_key(item: BlitItem) -> int:
+    """Sorting key, which groups blits of the same sprite"""
+    return id(item[0])
+
+
+class RenderQueue:
+    """Per-frame queue of (sprite, position) pairs split by layers"""
+
+    def __init__(self, tile: int = ut.TILE, layers: int = LAYERS,
+                 sort: bool = False) -> None:
+        """Initialise empty queue for given size of tile in pixels"""
+        self.tile: int = tile
+        self.sort: bool = sort
+        self.layers: List[List[BlitItem]] = [[] for _ in range(layers)]
+
+    def __len__(self) -> int:
+        """Number of sprites queued for the frame"""
+        return sum(len(layer) for layer in self.layers)
+
+    def add(self, layer: int, sprite: ut.Image, pos: ut.Coord) -> None:
+        """Queue sprite to be drawn in given tile of the field"""
+        tile = self.tile
+        self.layers[layer].append((scaled(sprite, tile),
+                                   (pos[0] * tile, pos[1] * tile)))
+
+    def flush(self, surface: ut.Image) -> None:
+        """Draw all queued sprites on the surface and empty the queue"""
+        for items in self.layers:
+            if not items:
+                continue
+            if self.sort:
+                items.sort(key=sprite_key)
+            surface.blits(items, False)
+            items.clear()
@@ -5,10 +5,40 @@ run_me.py -- main module
 This is main module, which contains main game classes and launches the game.
 """
 
+from typing import Optional
+
 from CollectorGame import modes
+from CollectorGame import capture
+from CollectorGame import assets
+from CollectorGame import telemetry
+from CollectorGame import memtrack
+from CollectorGame import utils as ut
+
 
+def run_game(record_path: Optional[str] = None,
+             record_format: str = capture.FORMAT_PNG,
+             memory_interval: int = 0) -> None:
+    """Main game code (optionally recording all frames to record_path)
 
-def run_game() -> None:
-    """Main game code"""
-    new_universe = modes.Universe()
-    new_universe.process_game(modes.CollectorGame())
+    With positive memory_interval memory growth is sampled every that
+    many ticks and reported when the game is over.
+    """
+    recorder = None
+    if record_path:
+        size = (ut.BSIZE[0] * ut.TILE, ut.BSIZE[1] * ut.TILE)
+        recorder = capture.FrameCapture(record_path, size, record_format)
+    flight = telemetry.FlightRecorder()
+    flight.install()  # 'kill -USR1 <pid>' dumps the last ticks of the game
+    memory = None
+    if memory_interval > 0:
+        memory = memtrack.MemoryTracker(memory_interval)
+    new_universe = modes.Universe(recorder=recorder, flight=flight,
+                                  memory=memory)
+    loader = assets.AssetLoader()
+    loader.start()
+    if new_universe.preload(loader):
+        new_universe.process_game(modes.CollectorGame())
+    else:
+        new_universe.finish()
+    if new_universe.memory_report:
+        print(new_universe.memory_report)
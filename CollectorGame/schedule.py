@@ -0,0 +1,107 @@
+"""
+schedule.py -- active set of map objects
+========================================
+This is module, which keeps track of map objects, which really have
+something to do during the tick.
+
+Idle objects (see BasicObject.is_idle) do not move and react only to
+someone on their tile, so they sleep, sorted by tiles, until the player
+or an enemy enters the tile or an explosion covers it. Only active and
+woken objects are processed, so the cost of the tick depends on what is
+going on in the level, not on its size. New objects
+may also hand counting of their ticks over to timer wheel (timers.py),
+which fires even for sleeping objects.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import CollectorGame.utils as ut
+import CollectorGame.objects as objs
+import CollectorGame.timers as timers
+
+
+class ActiveSet:
+    """Map objects of the level, split into active and sleeping ones"""
+
+    def __init__(self, enabled: bool = True,
+                 wheel: Optional[timers.TimerWheel] = None) -> None:
+        """Initialise empty set (disabled one never lets objects sleep)
+
+        If timer wheel is given, new objects start their timers on it.
+        """
+        self.enabled: bool = enabled
+        self.wheel: Optional[timers.TimerWheel] = wheel
+        self.objects: Optional[List[objs.BasicObject]] = None
+        self.signature: Tuple[int, int, int] = (0, -1, 0)
+        self.order: Dict[int, int] = {}  # id(object) -> index in level_map
+        self.active: List[objs.BasicObject] = []
+        self.sleeping: Dict[ut.Coord, List[objs.BasicObject]] = {}
+        self.asleep: Set[int] = set()
+        self.rebuilds: int = 0
+
+    def track(self, level_map: List[objs.BasicObject]) -> None:
+        """Sort objects out again if level_map was changed or replaced
+
+        Objects are only appended to level_map (new bombs) or filtered out
+        of it (destroy), so it is enough to check its length and the last
+        object.
+        """
+        signature = (id(level_map), len(level_map),
+                     id(level_map[-1]) if level_map else 0)
+        if signature == self.signature and level_map is self.objects:
+            return
+        self.signature = signature
+        self.objects = level_map
+        self.order = {id(game_object): idx
+                      for idx, game_object in enumerate(level_map)}
+        self.active = []
+        self.sleeping = {}
+        self.asleep = set()
+        for game_object in level_map:
+            if self.wheel is not None:
+                game_object.start_timers(self.wheel)
+            if self.enabled and game_object.is_idle():
+                self.sleep(game_object)
+            else:
+                self.active.append(game_object)
+        self.rebuilds += 1
+
+    def sleep(self, game_object: objs.BasicObject) -> None:
+        """Let object sleep on its tile"""
+        self.sleeping.setdefault(game_object.pos, []).append(game_object)
+        self.asleep.add(id(game_object))
+
+    def wake(self, tiles: Iterable[ut.Coord]) -> List[objs.BasicObject]:
+        """Get active objects and the ones woken on tiles
+
+        Objects are returned in order of level_map.
+        """
+        woken: Dict[int, objs.BasicObject] = {}
+        sleeping = self.sleeping
+        if sleeping:
+            for pos in tiles:
+                for game_object in sleeping.get(pos, ()):
+                    woken[id(game_object)] = game_object
+        if not woken:
+            return self.active
+        order = self.order
+        return sorted(self.active + list(woken.values()),
+                      key=lambda game_object: order[id(game_object)])
+
+    def settle(self, awake: List[objs.BasicObject]) -> None:
+        """Put processed objects, which became idle, back to sleep"""
+        active = []
+        asleep = self.asleep
+        for game_object in awake:
+            if game_object.is_dead:
+                continue  # level_map is sorted out again after destroy()
+            is_asleep = id(game_object) in asleep
+            if self.enabled and game_object.is_idle():
+                if not is_asleep:
+                    self.sleep(game_object)
+                continue
+            if is_asleep:
+                asleep.discard(id(game_object))
+                self.sleeping[game_object.pos].remove(game_object)
+            active.append(game_object)
+        self.active = active
@@ -0,0 +1,389 @@
+"""
+server.py -- authoritative multiplayer server
+=============================================
+This is module, which runs CollectorGame simulation for several players
+on asyncio and talks to clients over TCP or Unix sockets.
+
+Protocol is newline-delimited JSON. Client sends its input as
+{"move": [vx, vy], "bomb": true}. Server greets every client with
+{"hello": player_id} and then sends one frame per tick:
+{"t": tick, "full": false, "set": {id: [kind, x, y, extra]}, "del": [id]}.
+Frames contain only entities changed since the previous tick; full
+snapshots are sent periodically, to new clients and to clients who
+could not keep up.
+"""
+
+import asyncio
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import CollectorGame.utils as ut
+import CollectorGame.objects as objs
+import CollectorGame.modes as modes
+import CollectorGame.terrain as terrain
+
+
+TICK_RATE: int = 20
+FULL_EVERY: int = 100  # ticks between periodic full snapshots
+HIGH_WATER: int = 64 * 1024  # bytes waiting in socket before we skip
+
+Entity = List[Any]  # [kind, x, y, extra]
+Frame = Dict[str, Any]
+
+
+def encode_object(game_object: objs.BasicObject) -> Entity:
+    """Get compact network representation of game object"""
+    x, y = game_object.pos
+    if isinstance(game_object, objs.Enemy):
+        return ['E', x, y, 0]
+    if isinstance(game_object, objs.Wall):
+        return ['W', x, y, int(game_object.is_super)]
+    if isinstance(game_object, objs.Spikes):
+        return ['S', x, y, int(game_object.is_activated)]
+    if isinstance(game_object, objs.Gold):
+        return ['G', x, y, game_object.inc_val]
+    if isinstance(game_object, objs.Bomb):
+        return ['B', x, y, 0]
+    if isinstance(game_object, objs.Explosion):
+        return ['X', x, y, game_object.esizex[1] - x]
+    return ['?', x, y, 0]
+
+
+def encode_terrain(grid: terrain.TerrainGrid
+                   ) -> Iterator[Tuple[str, Entity]]:
+    """Get network ids and representations of terrain tiles
+
+    Ids are built from index of the tile, so they stay the same as long
+    as the tile keeps its wall, spikes or gold.
+    """
+    for (x, y), bits in grid.tiles():
+        idx = str(grid.index((x, y)))
+        if bits & terrain.WALL:
+            yield 'w' + idx, ['W', x, y, int(bool(bits & terrain.SUPER_WALL))]
+        if bits & terrain.SPIKES:
+            yield 's' + idx, ['S', x, y, int(bool(bits & terrain.ARMED))]
+        if bits & terrain.GOLD_MASK:
+            yield 'g' + idx, ['G', x, y, bits >> terrain.GOLD_SHIFT]
+
+
+def spawn_point(player_id: int) -> ut.Coord:
+    """Get starting position of player (corners of the board in turn)"""
+    width, height = ut.BSIZE
+    corners = [(0, 0), (width-1, height-1), (width-1, 0), (0, height-1)]
+    return corners[player_id % len(corners)]
+
+
+class ServerGame(modes.CollectorGame):
+    """CollectorGame with any number of players"""
+
+    def __init__(self) -> None:
+        """Initialise multiplayer game"""
+        super().__init__()
+        self.players: Dict[int, objs.Player] = {}
+        self.next_player: int = 0
+
+    def add_player(self) -> int:
+        """Spawn new player and return its id"""
+        player_id = self.next_player
+        self.next_player += 1
+        self.players[player_id] = objs.Player(spawn_point(player_id),
+                                              *ut.PLAYER_CONFIG[1:])
+        return player_id
+
+    def remove_player(self, player_id: int) -> None:
+        """Remove player from the game"""
+        self.players.pop(player_id, None)
+
+    def action(self) -> None:
+        """Process actions of all game objects and players"""
+        if self.level_map is None or \
+           self.tempies is None or \
+           self.enemies is None:
+            return
+
+        self.tick_timers()
+        for map_object in self.schedule.active:
+            map_object.action(self.level_map, self.tempies)
+        for enemy in self.enemies:
+            enemy.action(self.level_map, self.tempies, self.terrain)
+        for temp_effect in self.effects.active:
+            temp_effect.action(self.level_map, self.tempies)
+        for player in self.players.values():
+            player.action(self.level_map, self.tempies, self.terrain)
+
+    def logic(self) -> None:
+        """Process logic of all game objects against every player"""
+        if self.level_map is None or \
+           self.tempies is None or \
+           self.enemies is None:
+            return
+
+        # every contact is processed once per tick against all players
+        players = list(self.players.values())
+        for player in players:
+            player.logic(player, self.level_map, self.enemies, self.tempies)
+        self.terrain_logic(players)
+        awake = self.awake_objects(players)
+        if players:
+            self.interact(players, awake)
+        self.enemies_logic(players, awake)
+        self.blast_terrain(players)
+        self.schedule.settle(awake)
+        self.destroy()
+
+        # dead players respawn, collected level starts again
+        for player in self.players.values():
+            if player.is_dead:
+                self.bus.publish(ut.GameEvent.PLAYER_DIED, player)
+                player.reset()
+        if self.gold_left == 0:
+            self.init_level()
+
+    def objects(self) -> List[Tuple[str, objs.BasicObject]]:
+        """Get all objects, which should be sent to clients"""
+        return game_objects(self, self.players)
+
+
+def game_objects(game: modes.CollectorGame,
+                 players: Optional[Dict[int, objs.Player]] = None
+                 ) -> List[Tuple[str, objs.BasicObject]]:
+    """Get all live objects of the game; players are paired with their keys"""
+    if players is None:
+        players = {0: game.player}
+    found: List[Tuple[str, objs.BasicObject]] = []
+    for group in (game.level_map, game.enemies, game.tempies):
+        for game_object in group or []:
+            if not game_object.is_dead:
+                found.append(('', game_object))
+    for player_id, player in players.items():
+        found.append(('p' + str(player_id), player))
+    return found
+
+
+class StateEncoder:
+    """Tracker of entity changes between ticks"""
+
+    def __init__(self) -> None:
+        """Initialise encoder with empty state"""
+        # id(object) -> (object, network id); objects are kept alive here
+        self.net_ids: Dict[int, Tuple[objs.BasicObject, str]] = {}
+        self.state: Dict[str, Entity] = {}
+        self.next_id: int = 0
+
+    def update(self, game: modes.CollectorGame) -> Tuple[Dict[str, Entity],
+                                                          List[str]]:
+        """Remember new state; return changed entities and removed ids"""
+        net_ids: Dict[int, Tuple[objs.BasicObject, str]] = {}
+        state: Dict[str, Entity] = {}
+        if isinstance(game, ServerGame):
+            found = game.objects()
+        else:
+            found = game_objects(game)
+        for player_key, game_object in found:
+            if player_key:
+                net_id = player_key
+                entity = ['P', game_object.pos[0], game_object.pos[1],
+                          game_object.gold[0]]
+            else:
+                known = self.net_ids.get(id(game_object))
+                if known is None:
+                    net_id = str(self.next_id)
+                    self.next_id += 1
+                else:
+                    net_id = known[1]
+                net_ids[id(game_object)] = game_object, net_id
+                entity = encode_object(game_object)
+            state[net_id] = entity
+        state.update(encode_terrain(game.terrain))
+
+        old_state = self.state
+        changed = {net_id: entity for net_id, entity in state.items()
+                   if old_state.get(net_id) != entity}
+        removed = [net_id for net_id in old_state if net_id not in state]
+        self.net_ids = net_ids
+        self.state = state
+        return changed, removed
+
+
+def encode_frame(frame: Frame) -> bytes:
+    """Serialise frame into one protocol line"""
+    return json.dumps(frame, separators=(',', ':')).encode() + b'\n'
+
+
+def apply_frame(state: Dict[str, Entity], frame: Frame) -> None:
+    """Apply received frame to client-side copy of the state"""
+    if frame.get('full'):
+        state.clear()
+    state.update(frame.get('set', {}))
+    for net_id in frame.get('del', []):
+        state.pop(net_id, None)
+
+
+class ClientSession:
+    """Connected client with its player and latest input"""
+
+    def __init__(self, player_id: int,
+                 writer: asyncio.StreamWriter) -> None:
+        """Initialise client session"""
+        self.player_id: int = player_id
+        self.writer: asyncio.StreamWriter = writer
+        self.move: ut.Coord = (0, 0)
+        self.bomb: bool = False
+        self.needs_full: bool = True
+
+    def backlog(self) -> int:
+        """Number of bytes not yet sent to the client"""
+        transport = self.writer.transport
+        if transport is None or transport.is_closing():
+            return -1
+        return transport.get_write_buffer_size()
+
+
+class GameServer:
+    """Authoritative fixed-tick game server"""
+
+    def __init__(self, tick_rate: int = TICK_RATE,
+                 game: Optional[ServerGame] = None) -> None:
+        """Initialise server and its game"""
+        self.game: ServerGame = game if game else ServerGame()
+        if self.game.level_map is None:
+            self.game.init_level()
+        self.period: float = 1.0 / tick_rate
+        self.tick: int = 0
+        self.clients: Dict[int, ClientSession] = {}
+        self.encoder: StateEncoder = StateEncoder()
+        self.servers: List[asyncio.AbstractServer] = []
+        self.handlers: List[asyncio.Task] = []
+        # callbacks (tick, changed, removed, full state) run after each tick
+        self.listeners: List[Callable[[int, Dict[str, Entity], List[str],
+                                       Dict[str, Entity]], None]] = []
+        self.running: bool = False
+        self.late_ticks: int = 0
+
+    async def start_tcp(self, host: str = '127.0.0.1',
+                        port: int = 0) -> ut.Coord:
+        """Listen on TCP socket; return actual (host, port)"""
+        server = await asyncio.start_server(self.handle_client, host, port)
+        self.servers.append(server)
+        return server.sockets[0].getsockname()[:2]
+
+    async def start_unix(self, path: str) -> None:
+        """Listen on Unix socket"""
+        server = await asyncio.start_unix_server(self.handle_client, path)
+        self.servers.append(server)
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """Serve one client until it disconnects"""
+        task = asyncio.current_task()
+        if task is not None:
+            self.handlers.append(task)
+        player_id = self.game.add_player()
+        client = ClientSession(player_id, writer)
+        self.clients[player_id] = client
+        writer.write(encode_frame({'hello': 'p' + str(player_id)}))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        continue
+                    if 'move' in message:
+                        vx, vy = message['move']
+                        client.move = ut.sign(int(vx)), ut.sign(int(vy))
+                    if message.get('bomb'):
+                        client.bomb = True
+                except (ValueError, TypeError):
+                    continue  # malformed input is ignored
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.pop(player_id, None)
+            self.game.remove_player(player_id)
+            writer.close()
+            if task in self.handlers:
+                self.handlers.remove(task)
+
+    def step(self) -> None:
+        """Simulate one tick and send its frame to all clients"""
+        for client in self.clients.values():
+            player = self.game.players.get(client.player_id)
+            if player is None:
+                continue
+            player.speed = client.move
+            if client.move != (0, 0):
+                player.sight = client.move
+            if client.bomb:
+                player.set_bomb = True
+                client.bomb = False
+
+        self.game.action()
+        self.game.logic()
+        self.tick += 1
+        changed, removed = self.encoder.update(self.game)
+        self.broadcast(changed, removed)
+        for listener in self.listeners:
+            listener(self.tick, changed, removed, self.encoder.state)
+
+    def full_frame(self) -> bytes:
+        """Encode snapshot of the whole state"""
+        return encode_frame({'t': self.tick, 'full': True,
+                             'set': self.encoder.state})
+
+    def broadcast(self, changed: Dict[str, Entity],
+                  removed: List[str]) -> None:
+        """Send frame of this tick; each frame is encoded only once"""
+        periodic = self.tick % FULL_EVERY == 0
+        delta: Optional[bytes] = None
+        full: Optional[bytes] = None
+        for client in list(self.clients.values()):
+            backlog = client.backlog()
+            if backlog < 0:
+                continue
+            if backlog > HIGH_WATER:
+                client.needs_full = True  # skip, resync later
+                continue
+
+            if periodic or client.needs_full:
+                if full is None:
+                    full = self.full_frame()
+                client.writer.write(full)
+                client.needs_full = False
+            else:
+                if delta is None:
+                    delta = encode_frame({'t': self.tick, 'full': False,
+                                          'set': changed, 'del': removed})
+                client.writer.write(delta)
+
+    async def run(self, ticks: Optional[int] = None) -> None:
+        """Run fixed-rate tick loop (forever or for given number of ticks)"""
+        loop = asyncio.get_running_loop()
+        self.running = True
+        next_time = loop.time()
+        done = 0
+        while self.running and (ticks is None or done < ticks):
+            self.step()
+            done += 1
+            next_time += self.period
+            delay = next_time - loop.time()
+            if delay < 0:
+                # we are late: do not try to catch up with a burst
+                self.late_ticks += 1
+                next_time = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def stop(self) -> None:
+        """Stop the tick loop, listening sockets and all connections"""
+        self.running = False
+        for server in self.servers:
+            server.close()
+        for client in list(self.clients.values()):
+            client.writer.close()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        for server in self.servers:
+            await server.wait_closed()
+        self.servers = []
@@ -0,0 +1,159 @@
+"""
+spectate.py -- spectator broadcast channel
+==========================================
+This is module, which streams one match to any number of spectators.
+
+State change of every tick is encoded exactly once and the same bytes
+object is queued for every subscriber, so the cost of a tick does not
+grow with the audience. Every subscriber has a bounded queue drained by
+its own writer task; when a spectator falls behind, its queue is dropped
+and it continues from the next keyframe. Frames use the protocol of
+server.py.
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+import CollectorGame.utils as ut
+import CollectorGame.modes as modes
+import CollectorGame.server as server
+
+
+QUEUE_SIZE: int = 32  # frames waiting for one spectator before drop
+KEYFRAME_EVERY: int = 100  # ticks between periodic keyframes
+
+
+class Subscriber:
+    """One connected spectator with its own frame queue"""
+
+    def __init__(self, writer: asyncio.StreamWriter,
+                 queue_size: int) -> None:
+        """Initialise subscriber"""
+        self.writer: asyncio.StreamWriter = writer
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.needs_keyframe: bool = True
+        self.dropped: int = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def offer(self, frame: bytes) -> bool:
+        """Queue frame without waiting; on overflow drop the whole queue"""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.dropped += 1
+            self.needs_keyframe = True
+            return False
+
+    async def pump(self) -> None:
+        """Write queued frames to the socket respecting its backpressure"""
+        try:
+            while True:
+                frame = await self.queue.get()
+                self.writer.write(frame)
+                await self.writer.drain()
+        except ConnectionError:
+            pass
+
+
+class SpectatorChannel:
+    """Broadcast of one match to many local socket subscribers"""
+
+    def __init__(self, queue_size: int = QUEUE_SIZE,
+                 keyframe_every: int = KEYFRAME_EVERY) -> None:
+        """Initialise channel without subscribers"""
+        self.queue_size: int = queue_size
+        self.keyframe_every: int = keyframe_every
+        self.subscribers: List[Subscriber] = []
+        self.servers: List[asyncio.AbstractServer] = []
+        self.encoder: Optional[server.StateEncoder] = None
+        self.tick: int = 0
+        self.encoded: int = 0  # number of frames encoded (for statistics)
+
+    def attach(self, game_server: server.GameServer) -> None:
+        """Follow ticks of multiplayer server"""
+        game_server.listeners.append(self.publish)
+
+    def feed(self, game: modes.CollectorGame) -> None:
+        """Follow tick of single-player game; call once after each tick"""
+        if self.encoder is None:
+            self.encoder = server.StateEncoder()
+        changed, removed = self.encoder.update(game)
+        self.publish(self.tick + 1, changed, removed, self.encoder.state)
+
+    def publish(self, tick: int,
+                changed: Dict[str, server.Entity],
+                removed: List[str],
+                state: Dict[str, server.Entity]) -> None:
+        """Encode tick once and fan it out to all subscribers"""
+        self.tick = tick
+        if not self.subscribers:
+            return
+
+        keyframe: Optional[bytes] = None
+        if tick % self.keyframe_every == 0:
+            for subscriber in self.subscribers:
+                subscriber.needs_keyframe = True
+
+        delta: Optional[bytes] = None
+        for subscriber in self.subscribers:
+            if subscriber.needs_keyframe:
+                if keyframe is None:
+                    keyframe = server.encode_frame({'t': tick, 'full': True,
+                                                    'set': state})
+                    self.encoded += 1
+                if subscriber.offer(keyframe):
+                    subscriber.needs_keyframe = False
+            else:
+                if delta is None:
+                    delta = server.encode_frame({'t': tick, 'full': False,
+                                                 'set': changed,
+                                                 'del': removed})
+                    self.encoded += 1
+                subscriber.offer(delta)
+
+    async def start_tcp(self, host: str = '127.0.0.1',
+                        port: int = 0) -> ut.Coord:
+        """Accept spectators on TCP socket; return actual (host, port)"""
+        listener = await asyncio.start_server(self.handle, host, port)
+        self.servers.append(listener)
+        return listener.sockets[0].getsockname()[:2]
+
+    async def start_unix(self, path: str) -> None:
+        """Accept spectators on Unix socket"""
+        listener = await asyncio.start_unix_server(self.handle, path)
+        self.servers.append(listener)
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """Serve one spectator until it disconnects"""
+        subscriber = Subscriber(writer, self.queue_size)
+        subscriber.task = asyncio.ensure_future(subscriber.pump())
+        self.subscribers.append(subscriber)
+        try:
+            while await reader.read(1024):
+                pass  # spectators have nothing to say
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.remove(subscriber)
+            subscriber.task.cancel()
+            writer.close()
+
+    async def stop(self) -> None:
+        """Disconnect all spectators and stop listening"""
+        for listener in self.servers:
+            listener.close()
+        tasks = []
+        for subscriber in list(self.subscribers):
+            subscriber.writer.close()
+            if subscriber.task:
+                subscriber.task.cancel()
+                tasks.append(subscriber.task)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for listener in self.servers:
+            await listener.wait_closed()
+        self.servers = []
@@ -0,0 +1,213 @@
+"""
+stress.py -- swarm stress-test scenarios
+========================================
+This is module, which fills a board of any size with thousands of game
+objects and measures how fast the engine processes them.
+
+Objects clamp their positions by ut.BSIZE, so the board size is switched
+for the whole run of a scenario (everything reads it at call time). Run
+it directly to get a report, e.g.
+'python -m CollectorGame.stress --size 200 200 --enemies 1000 10000'.
+SWARM is the scenario of the target scale (tens of thousands of enemies).
+"""
+
+import argparse
+import contextlib
+import random
+import sys
+import time
+import tracemalloc
+from typing import Iterator, List, NamedTuple, Optional
+
+import pygame  # type: ignore
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore
+
+import CollectorGame.utils as ut
+import CollectorGame.objects as objs
+import CollectorGame.modes as modes
+
+
+class Scenario(NamedTuple):
+    """Parameters of generated stress level"""
+    size: ut.Size = (100, 100)
+    enemies: int = 1000
+    walls: int = 1000
+    bombs: int = 100
+    gold: int = 100
+    seed: int = 0
+
+
+# target scale of the engine: a tick should stay well below a second
+SWARM: Scenario = Scenario((200, 200), enemies=20000, walls=4000,
+                           bombs=200, gold=200)
+
+
+class Report(NamedTuple):
+    """Results of stress run"""
+    scenario: Scenario
+    ticks: int
+    ticks_per_sec: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    peak_bytes: int
+    peak_rss: int  # includes pixel data of surfaces, which SDL allocates
+    times_ms: List[float]  # time of every tick in order
+
+
+@contextlib.contextmanager
+def board_size(size: ut.Size) -> Iterator[None]:
+    """Temporarily switch size of the board"""
+    old_size = ut.BSIZE
+    ut.BSIZE = size
+    try:
+        yield
+    finally:
+        ut.BSIZE = old_size
+
+
+def generate(scenario: Scenario) -> modes.CollectorGame:
+    """Build game with scenario's objects (board size must be switched)"""
+    rng = random.Random(scenario.seed)
+    width, height = scenario.size
+
+    def rand_pos() -> ut.Coord:
+        return rng.randrange(width), rng.randrange(height)
+
+    level_map: List[objs.BasicObject] = []
+    for _ in range(scenario.walls):
+        level_map.append(objs.Wall(rand_pos(), rng.random() < 0.2))
+    for _ in range(scenario.gold):
+        level_map.append(objs.Gold(rand_pos()))
+    for _ in range(scenario.bombs):
+        # explosions are spread in time instead of one huge blast
+        level_map.append(objs.Bomb(rand_pos(), rng.randint(5, 100)))
+
+    enemies: List[objs.Enemy] = []
+    for _ in range(scenario.enemies):
+        speed = (rng.choice((-1, 1)), rng.choice((-1, 0, 1)))
+        enemies.append(objs.Enemy(rand_pos(), speed))
+
+    game = modes.CollectorGame(level_map=level_map, enemies=enemies,
+                               tempies=[])
+    game.player.pos = game.player.init_pos = (width // 2, height // 2)
+    return game
+
+
+def max_rss() -> int:
+    """Get peak resident set size of the process in bytes (0 if unknown)"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux counts it in kilobytes, macOS in bytes
+    return peak * 1024 if sys.platform.startswith('linux') else peak
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Get value below which given share of sorted values lies"""
+    if not values:
+        return 0.0
+    idx = min(len(values) - 1, int(share * len(values)))
+    return values[idx]
+
+
+def run(scenario: Scenario, ticks: int = 100, render: bool = False,
+        tile: int = 4, trace_memory: bool = True) -> Report:
+    """Run scenario for given number of ticks and measure it
+
+    If render is set, every tick is also drawn on an offscreen surface
+    with given tile size. Tracing of memory slows the run down, but gives
+    the peak amount of memory allocated by Python.
+    """
+    with board_size(scenario.size):
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            game = generate(scenario)
+            surface: Optional[ut.Image] = None
+            if render:
+                game.resize(tile)
+                game.init_background()
+                surface = pygame.Surface((scenario.size[0] * tile,
+                                          scenario.size[1] * tile))
+
+            times: List[float] = []
+            started = time.perf_counter()
+            for _ in range(ticks):
+                tick_start = time.perf_counter()
+                game.action()
+                game.logic()
+                if surface is not None:
+                    game.draw(surface)
+                times.append(time.perf_counter() - tick_start)
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+
+    times_ms = [tick_time * 1e3 for tick_time in times]
+    times.sort()
+    return Report(scenario, ticks, ticks / elapsed if elapsed else 0.0,
+                  percentile(times, 0.5) * 1e3, percentile(times, 0.95) * 1e3,
+                  percentile(times, 0.99) * 1e3, times[-1] * 1e3 if times
+                  else 0.0, peak, max_rss(), times_ms)
+
+
+def format_report(report: Report) -> str:
+    """Format report as one line of the table"""
+    scenario = report.scenario
+    return ('{:>9} {:>7} {:>7} {:>6} {:>9.1f} {:>8.2f} {:>8.2f} {:>8.2f} '
+            '{:>8.2f} {:>9.1f} {:>8.1f}').format(
+                '{}x{}'.format(*scenario.size), scenario.enemies,
+                scenario.walls, scenario.bombs, report.ticks_per_sec,
+                report.p50_ms, report.p95_ms, report.p99_ms, report.max_ms,
+                report.peak_bytes / 2**20, report.peak_rss / 2**20)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Run stress scenarios from command line and print report"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    parser.add_argument('--size', type=int, nargs=2, default=(100, 100))
+    parser.add_argument('--enemies', type=int, nargs='+', default=[1000],
+                        help='several values give several runs')
+    parser.add_argument('--walls', type=int, default=1000)
+    parser.add_argument('--bombs', type=int, default=100)
+    parser.add_argument('--gold', type=int, default=100)
+    parser.add_argument('--ticks', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--render', action='store_true',
+                        help='draw every tick on an offscreen surface')
+    parser.add_argument('--tile', type=int, default=4)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='do not trace memory (faster)')
+    parser.add_argument('--swarm', action='store_true',
+                        help='run SWARM scenario instead of the options')
+    parser.add_argument('--per-tick', action='store_true',
+                        help='print time of every tick too')
+    options = parser.parse_args(args)
+
+    print(('{:>9} {:>7} {:>7} {:>6} {:>9} {:>8} {:>8} {:>8} {:>8} {:>9} '
+           '{:>8}').format('board', 'enemies', 'walls', 'bombs', 'ticks/s',
+                           'p50 ms', 'p95 ms', 'p99 ms', 'max ms', 'peak MiB',
+                           'RSS MiB'))
+    scenarios = [Scenario(tuple(options.size), enemies, options.walls,
+                          options.bombs, options.gold, options.seed)
+                 for enemies in options.enemies]
+    if options.swarm:
+        scenarios = [SWARM._replace(seed=options.seed)]
+    for scenario in scenarios:
+        report = run(scenario, options.ticks, options.render, options.tile,
+                     not options.no_memory)
+        print(format_report(report))
+        if options.per_tick:
+            print(' '.join('{:.2f}'.format(ms) for ms in report.times_ms))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+telemetry.py -- flight recorder of the game loop
+================================================
+This is module, which keeps the last ticks of the game loop in memory,
+so they can be saved after a crash, on a signal or on demand.
+
+All entries live in one preallocated array of integers (one row per
+tick, overwritten in a ring), so recording does not allocate and is
+cheap enough to stay enabled all the time.
+"""
+
+import json
+import os
+import signal
+import tempfile
+import time
+from array import array
+from typing import Any, Dict, List, Optional
+
+import CollectorGame.utils as ut
+
+
+# columns of every entry (times are in microseconds)
+FIELDS: List[str] = ['tick', 'time_us', 'events_us', 'action_us', 'logic_us',
+                     'draw_us', 'state_us', 'flip_us', 'input_events',
+                     'map_objects', 'enemies', 'tempies', 'input_state']
+STRIDE: int = len(FIELDS)
+
+
+def pack_input(speed: ut.Coord, set_bomb: bool) -> int:
+    """Pack player's input into one integer: vx+1 | (vy+1) << 2 | bomb << 4"""
+    return (speed[0] + 1) | (speed[1] + 1) << 2 | int(set_bomb) << 4
+
+
+class FlightRecorder:
+    """Ring buffer of the last game loop ticks"""
+
+    def __init__(self, size: int = 512, path: Optional[str] = None) -> None:
+        """Initialise recorder for given number of last ticks
+
+        Entries are dumped to path (by default a file in temp directory).
+        """
+        self.size: int = max(1, size)
+        self.data: array = array('q', bytes(8 * self.size * STRIDE))
+        self.count: int = 0
+        if path is None:
+            name = 'collector-flight-{}.json'.format(os.getpid())
+            path = os.path.join(tempfile.gettempdir(), name)
+        self.path: str = path
+
+    def __len__(self) -> int:
+        """Number of entries kept in buffer"""
+        return min(self.count, self.size)
+
+    def record(self, values: array) -> None:
+        """Write entry (array('q') of STRIDE values) over the oldest one"""
+        base = (self.count % self.size) * STRIDE
+        self.data[base:base + STRIDE] = values
+        self.count += 1
+
+    def entries(self) -> List[Dict[str, int]]:
+        """Get kept entries from the oldest to the newest"""
+        first = self.count - len(self)
+        result = []
+        for idx in range(first, self.count):
+            base = (idx % self.size) * STRIDE
+            result.append(dict(zip(FIELDS, self.data[base:base + STRIDE])))
+        return result
+
+    def dump(self, reason: str = 'on demand',
+             path: Optional[str] = None) -> str:
+        """Write kept entries into JSON file and return its path"""
+        path = path or self.path
+        report: Dict[str, Any] = {'reason': reason,
+                                  'time': time.time(),
+                                  'ticks_recorded': self.count,
+                                  'entries': self.entries()}
+        with open(path, 'w') as stream:
+            json.dump(report, stream)
+        return path
+
+    def install(self, signum: Optional[int] = None) -> bool:
+        """Dump entries on signal (SIGUSR1 by default, if there is one)"""
+        if signum is None:
+            signum = getattr(signal, 'SIGUSR1', None)
+            if signum is None:  # e.g. on Windows
+                return False
+
+        def on_signal(received: int, frame: Any) -> None:
+            self.dump('signal {}'.format(received))
+
+        signal.signal(signum, on_signal)
+        return True
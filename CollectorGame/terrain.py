@@ -0,0 +1,231 @@
+"""
+terrain.py -- static terrain of the level
+=========================================
+This is module, which keeps static terrain of the level (walls, spikes and
+gold) in one byte per tile instead of game objects.
+
+Every tile is a set of bits: wall, super wall, spikes, triggered spikes,
+armed spikes, and value of gold in the upper bits. So "is there a wall
+here" is one index operation. Objects of objects.py still describe levels:
+load() moves them into the grid, and the ones, which do not fit (e.g. too
+much gold on one tile), are left as objects.
+"""
+
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+import CollectorGame.utils as ut
+import CollectorGame.images as images
+import CollectorGame.objects as objs
+import CollectorGame.render as render
+from CollectorGame.animation import CLOCK
+
+
+# bits of tile
+WALL: int = 0x01
+SUPER_WALL: int = 0x02
+SPIKES: int = 0x04
+TRIGGERED: int = 0x08
+ARMED: int = 0x10
+GOLD_SHIFT: int = 5
+GOLD_MASK: int = 0xe0
+MAX_GOLD: int = GOLD_MASK >> GOLD_SHIFT
+
+Tile = Tuple[ut.Coord, int]  # position and bits of tile
+
+
+class TerrainGrid:
+    """Walls, spikes and gold of the level, one byte per tile"""
+    __slots__ = ('width', 'height', 'cells', 'pending', 'version', 'filled')
+
+    def __init__(self, size: Optional[ut.Size] = None) -> None:
+        """Initialise empty terrain (by default of the board size)"""
+        self.width, self.height = size or ut.BSIZE
+        self.cells: bytearray = bytearray(self.width * self.height)
+        # triggered spikes, which get armed as soon as nobody stands on them
+        self.pending: Set[int] = set()
+        self.version: int = 0  # grows on every change
+        self.filled: int = 0  # number of tiles with anything on them
+
+    def copy(self) -> 'TerrainGrid':
+        """Create new copy of terrain"""
+        copied = TerrainGrid((self.width, self.height))
+        copied.cells[:] = self.cells
+        copied.pending = set(self.pending)
+        copied.filled = self.filled
+        return copied
+
+    def clear(self) -> None:
+        """Remove everything from terrain"""
+        self.cells[:] = bytes(len(self.cells))
+        self.pending.clear()
+        self.filled = 0
+        self.version += 1
+
+    def index(self, pos: ut.Coord) -> int:
+        """Get index of tile in cells (position must be inside)"""
+        return pos[1] * self.width + pos[0]
+
+    def inside(self, pos: ut.Coord) -> bool:
+        """Check if position is inside the terrain"""
+        return 0 <= pos[0] < self.width and 0 <= pos[1] < self.height
+
+    def tile(self, pos: ut.Coord) -> int:
+        """Get bits of tile (0 outside of terrain)"""
+        if 0 <= pos[0] < self.width and 0 <= pos[1] < self.height:
+            return self.cells[pos[1] * self.width + pos[0]]
+        return 0
+
+    def is_wall(self, pos: ut.Coord) -> bool:
+        """Check if there is a wall on the tile"""
+        return bool(self.tile(pos) & WALL)
+
+    def gold(self, pos: ut.Coord) -> int:
+        """Get value of gold on the tile"""
+        return self.tile(pos) >> GOLD_SHIFT
+
+    def tiles(self) -> Iterator[Tile]:
+        """Iterate all non-empty tiles"""
+        width = self.width
+        for idx, bits in enumerate(self.cells):
+            if bits:
+                yield (idx % width, idx // width), bits
+
+    def coins(self) -> Tuple[int, int]:
+        """Get number of tiles with gold and total value of gold"""
+        count = total = 0
+        for bits in self.cells:
+            if bits & GOLD_MASK:
+                count += 1
+                total += bits >> GOLD_SHIFT
+        return count, total
+
+    def add_wall(self, pos: ut.Coord, is_super: bool = False) -> bool:
+        """Put wall on the tile; return False if it does not fit"""
+        bits = self.tile(pos)
+        if not self.inside(pos) or \
+           (bits & WALL and bool(bits & SUPER_WALL) != is_super):
+            return False
+        self.cells[self.index(pos)] = bits | WALL | \
+            (SUPER_WALL if is_super else 0)
+        self.filled += not bits
+        self.version += 1
+        return True
+
+    def add_spikes(self, pos: ut.Coord, is_activated: bool = True,
+                   is_triggered: bool = False) -> bool:
+        """Put spikes on the tile; return False if it does not fit"""
+        bits = self.tile(pos)
+        state = SPIKES | (TRIGGERED if is_triggered else 0) | \
+            (ARMED if is_activated else 0)
+        if not self.inside(pos) or \
+           (bits & SPIKES and bits & (SPIKES | TRIGGERED | ARMED) != state):
+            return False
+        idx = self.index(pos)
+        self.cells[idx] = bits | state
+        self.filled += not bits
+        if is_triggered and not is_activated:
+            self.pending.add(idx)
+        self.version += 1
+        return True
+
+    def add_gold(self, pos: ut.Coord, value: int = 1) -> bool:
+        """Put gold on the tile; return False if it does not fit"""
+        bits = self.tile(pos)
+        value += bits >> GOLD_SHIFT
+        if not self.inside(pos) or not 0 < value <= MAX_GOLD:
+            return False
+        self.cells[self.index(pos)] = (bits & ~GOLD_MASK) | \
+            value << GOLD_SHIFT
+        self.filled += not bits
+        self.version += 1
+        return True
+
+    def place(self, game_object: objs.BasicObject) -> bool:
+        """Move wall, spikes or gold object into terrain, if it fits"""
+        if game_object.is_dead:
+            return False
+        if isinstance(game_object, objs.Wall):
+            return self.add_wall(game_object.pos, game_object.is_super)
+        if isinstance(game_object, objs.Spikes):
+            return self.add_spikes(game_object.pos, game_object.is_activated,
+                                   game_object.is_triggered)
+        if isinstance(game_object, objs.Gold):
+            return self.add_gold(game_object.pos, game_object.inc_val)
+        return False
+
+    def load(self, objects: Iterable[objs.BasicObject]
+             ) -> List[objs.BasicObject]:
+        """Move static objects into terrain; return the other ones"""
+        return [game_object for game_object in objects
+                if not self.place(game_object)]
+
+    def arm(self, occupied: Iterable[ut.Coord]) -> None:
+        """Arm triggered spikes, which nobody stands on anymore"""
+        if not self.pending:
+            return
+        taken = {self.index(pos) for pos in occupied if self.inside(pos)}
+        for idx in [idx for idx in self.pending if idx not in taken]:
+            self.cells[idx] |= ARMED
+            self.pending.discard(idx)
+            self.version += 1
+
+    def step(self, pos: ut.Coord) -> Tuple[bool, int]:
+        """Let player step on the tile: trigger spikes and take gold
+
+        Returns if player is killed by armed spikes and value of gold.
+        """
+        bits = self.tile(pos)
+        if not bits & (SPIKES | GOLD_MASK):
+            return False, 0
+        idx = self.index(pos)
+        killed = bool(bits & ARMED)
+        if bits & SPIKES and not bits & (ARMED | TRIGGERED):
+            bits |= TRIGGERED
+            self.pending.add(idx)
+        gold = bits >> GOLD_SHIFT
+        bits &= ~GOLD_MASK
+        self.cells[idx] = bits
+        self.filled -= not bits
+        self.version += 1
+        return killed, gold
+
+    def blast(self, tiles: Iterable[ut.Coord]
+              ) -> Tuple[List[ut.Coord], List[ut.Coord]]:
+        """Break walls, disarm spikes and burn gold on tiles
+
+        Returns positions of broken walls and of burnt gold.
+        """
+        broken: List[ut.Coord] = []
+        burnt: List[ut.Coord] = []
+        for pos in tiles:
+            bits = self.tile(pos)
+            if not bits:
+                continue
+            old_bits = bits
+            if bits & WALL and not bits & SUPER_WALL:
+                bits &= ~WALL
+                broken.append(pos)
+            if bits & ARMED:
+                bits &= ~(ARMED | TRIGGERED)
+            if bits & GOLD_MASK:
+                bits &= ~GOLD_MASK
+                burnt.append(pos)
+            if bits != old_bits:
+                self.cells[self.index(pos)] = bits
+                self.filled -= not bits
+                self.version += 1
+        return broken, burnt
+
+    def submit(self, queue: render.RenderQueue, layer: int) -> None:
+        """Queue sprites of all tiles for batched drawing"""
+        money = images.MONEY_IMG
+        for pos, bits in self.tiles():
+            if bits & SPIKES:
+                queue.add(layer, images.SPIKE_SEQ[0] if bits & ARMED
+                          else images.DSPIKE_SEQ[0], pos)
+            if bits & GOLD_MASK:
+                queue.add(layer, CLOCK.frame(money, pos[1] % len(money)),
+                          pos)
+            if bits & WALL:
+                queue.add(layer, images.SWALL_SEQ[0] if bits & SUPER_WALL
+                          else images.WALL_SEQ[0], pos)
@@ -3,12 +3,47 @@ tests.py -- module with unit-tests
 ==================================
 This is module, which contains unit-tests for all classes and functions.
 """
+import asyncio
+import json
+import os
+import random
+import signal
+import tempfile
+import tracemalloc
+from array import array
+from typing import Dict, List
+
+import pygame  # type: ignore
+
 from CollectorGame import utils as ut
 from CollectorGame import images
 
 from CollectorGame import objects as objs
+from CollectorGame import terrain
+from CollectorGame import schedule
+from CollectorGame import timers
+from CollectorGame import interactions
+from CollectorGame import buffer
+from CollectorGame import forward
 from CollectorGame import gui
 from CollectorGame import modes
+from CollectorGame import ecs
+from CollectorGame import env
+from CollectorGame import vecenv
+from CollectorGame import batch
+from CollectorGame import server
+from CollectorGame import spectate
+from CollectorGame import capture
+from CollectorGame import assets
+from CollectorGame import animation
+from CollectorGame import render
+from CollectorGame import frames
+from CollectorGame import stress
+from CollectorGame import bus
+from CollectorGame import telemetry
+from CollectorGame import memtrack
+from CollectorGame import bot
+from CollectorGame import balance
 
 
 # tests for CollectorGame/objects.py
@@ -163,6 +198,1153 @@ def test_objects_Player() -> None:
     assert test.duration == 5
 
 
+def test_objects_slots() -> None:
+    """Unit-test for compact (slotted) layout of game objects"""
+    all_objects = [objs.BasicObject(images.BOOM_IMG), objs.Player(),
+                   objs.Enemy(), objs.Wall(), objs.Wall(is_super=True),
+                   objs.Spikes(), objs.Explosion(), objs.Bomb(), objs.Gold()]
+
+    # Test 0: no object has per-instance dictionary
+    for test in all_objects:
+        assert not hasattr(test, '__dict__')
+
+    # Test 1: static objects share their sprite lists
+    assert objs.Wall((1, 1)).img is objs.Wall((2, 2)).img
+    assert objs.Wall((1, 1), True).img is objs.Wall((2, 2), True).img
+    assert objs.Spikes((1, 1)).img is objs.Spikes((2, 2)).img
+    assert objs.Spikes((1, 1)).dimg is objs.Spikes((2, 2)).dimg
+    assert objs.Gold((1, 1)).img is objs.Gold((2, 2)).img
+
+    # Test 2: copies and resets keep working with slots
+    test = objs.Spikes((3, 3), False)
+    test.is_activated = True
+    test.reset()
+    assert test.is_activated is False
+    assert test.copy().pos == (3, 3)
+
+
+# tests for CollectorGame/terrain.py
+def test_terrain_TerrainGrid() -> None:
+    """Unit-test for TerrainGrid class"""
+    # Test 0: one byte per tile, objects are moved in when they fit
+    test = terrain.TerrainGrid()
+    assert len(test.cells) == ut.BSIZE[0] * ut.BSIZE[1]
+    bomb = objs.Bomb((4, 4))
+    left = test.load([objs.Wall((1, 1)), objs.Wall((2, 1), True),
+                      objs.Spikes((3, 3), False), objs.Gold((5, 5), 3),
+                      objs.Gold((5, 5), 4), objs.Gold((5, 5)), bomb])
+    assert len(left) == 2 and left[1] is bomb
+    assert test.is_wall((1, 1)) and test.is_wall((2, 1))
+    assert not test.is_wall((1, 2)) and not test.is_wall((-1, 1))
+    assert test.gold((5, 5)) == 7 and test.coins() == (1, 7)
+    assert not test.add_wall((1, 1), True)
+    assert test.filled == 4
+
+    # Test 1: spikes are triggered, armed when left and stepped on
+    copied = test.copy()
+    assert test.step((3, 3)) == (False, 0)
+    test.arm([(3, 3)])
+    assert test.tile((3, 3)) & terrain.ARMED == 0
+    test.arm([(0, 0)])
+    assert test.step((3, 3)) == (True, 0)
+    assert test.step((5, 5)) == (False, 7) and test.coins() == (0, 0)
+    assert copied.gold((5, 5)) == 7 and copied.pending == set()
+    assert test.filled == 3 and copied.filled == 4
+
+    # Test 2: explosions break walls, disarm spikes and burn gold
+    test.add_gold((2, 3))
+    broken, burnt = test.blast([(1, 1), (2, 1), (3, 3), (2, 3)])
+    assert broken == [(1, 1)] and burnt == [(2, 3)]
+    assert test.is_wall((2, 1)) and test.tile((3, 3)) == terrain.SPIKES
+    assert test.filled == len(test.cells) - test.cells.count(0) == 2
+    version = test.version
+    test.clear()
+    assert test.version > version and not any(test.cells)
+    assert test.filled == 0
+
+
+# tests for CollectorGame/schedule.py
+def test_schedule_ActiveSet() -> None:
+    """Unit-test for ActiveSet class"""
+    # Test 0: idle objects sleep, woken ones come in order of level_map
+    bomb = objs.Bomb((9, 9))
+    level = [objs.Wall((1, 1)), objs.Gold((2, 2)), bomb, objs.Spikes((3, 3))]
+    test = schedule.ActiveSet()
+    test.track(level)
+    assert test.active == [bomb] and test.rebuilds == 1
+    assert test.wake([(3, 3), (1, 1), (5, 5)]) == [level[0], bomb, level[3]]
+    test.settle(test.wake([(2, 2)]))
+    assert test.wake([]) == [bomb]
+
+    # Test 1: triggered spikes stay awake until they are armed
+    level[3].is_triggered, level[3].is_activated = True, False
+    test.settle([bomb, level[3]])
+    assert test.active == [bomb, level[3]] and test.wake([]) == test.active
+    level[3].is_activated = True
+    test.settle(test.wake([]))
+    assert test.active == [bomb]
+    test.track(level)
+    level.append(objs.Wall((4, 4)))
+    test.track(level)
+    assert test.rebuilds == 2 and (4, 4) in test.sleeping
+
+    # Test 2: games with sleeping objects go the same as without them
+    def make_game(enabled: bool) -> modes.CollectorGame:
+        game = modes.CollectorGame(level_map=[], enemies=[], tempies=[])
+        if not enabled:  # every object acts and counts ticks by itself
+            game.schedule = schedule.ActiveSet(enabled=False)
+            game.effects = schedule.ActiveSet(enabled=False)
+        rng = random.Random(5)
+        game.level_map = [kind((rng.randrange(20), rng.randrange(20)))
+                          for kind in [objs.Wall, objs.Gold, objs.Spikes] * 30]
+        game.enemies = [objs.Enemy((rng.randrange(20), rng.randrange(20)),
+                                   (rng.choice((-1, 1)), rng.choice((-1, 1))))
+                        for _ in range(6)]
+        game.count_level()
+        return game
+
+    def state(game: modes.CollectorGame) -> List[object]:
+        return [(type(obj), obj.pos, obj.is_dead,
+                 getattr(obj, 'is_activated', None),
+                 getattr(obj, 'is_triggered', None))
+                for obj in game.level_map] + \
+            [(enemy.pos, enemy.speed) for enemy in game.enemies] + \
+            [(game.player.pos, game.player.gold, game.player.is_dead)]
+
+    games = [make_game(True), make_game(False)]
+    rng = random.Random(7)
+    most_active = 0
+    for tick in range(300):
+        action = env.ACTIONS[rng.randrange(len(env.ACTIONS))]
+        for game in games:
+            game.apply_controls(action[0], action[1] or game.player.sight,
+                                action[2])
+            game.action()
+            game.logic()
+            game.player.is_dead = False
+        assert state(games[0]) == state(games[1])
+        most_active = max(most_active, len(games[0].schedule.active))
+    assert most_active < 10 < len(games[0].level_map)
+
+
+# tests for CollectorGame/timers.py
+def test_timers_TimerWheel() -> None:
+    """Unit-test for TimerWheel class"""
+    # Test 0: every timer fires exactly on its tick (small wheels make
+    # timers go through all of them and through overflow list)
+    test = timers.TimerWheel(bits=2, levels=2)
+    fired: List[object] = []
+    rng = random.Random(1)
+    expected = {}
+    for idx in range(200):
+        ticks = rng.randrange(1, 100)
+        expected[idx] = ticks
+        test.add(ticks, lambda idx=idx: fired.append((idx, test.now)))
+    cancelled = test.add(50, lambda: fired.append('cancelled'))
+    test.cancel(cancelled)
+    assert len(test) == 200 and cancelled.remaining() == 50
+    for tick in range(100):
+        test.advance()
+    assert sorted(fired) == sorted(expected.items()) and len(test) == 0
+
+    # Test 1: bombs and explosions count their ticks on timers
+    test = timers.TimerWheel()
+    bomb = objs.Bomb((1, 1), 3)
+    boom = objs.Explosion((1, 1), duration=(2, 7))
+    bomb.start_timers(test)
+    boom.start_timers(test)
+    assert bomb.is_idle() and boom.is_idle()
+    test.advance()
+    assert bomb.duration == 2 and boom.duration == (3, 7)
+    bomb.duration = 5
+    for tick in range(4):
+        test.advance()
+    assert boom.is_dead and not bomb.is_dead and bomb.duration == 1
+    test.advance()
+    assert bomb.is_dead and len(test) == 0
+
+    # Test 3: clearing cancels every timer
+    fired.clear()
+    for ticks in (1, 100, 10 ** 9):
+        test.add(ticks, lambda: fired.append(1))
+    test.clear()
+    for tick in range(100):
+        test.advance()
+    assert len(test) == 0 and not fired and test.next_due() is None
+
+
+def test_interactions_Interactions() -> None:
+    """Unit-test for Interactions class"""
+    # Test 0: only registered pairs of types meet
+    test = interactions.INTERACTIONS.copy()
+    met: List[object] = []
+    test.register(objs.Bomb, objs.Bomb,
+                  lambda bomb, other, scene: met.append(other))
+    player = objs.Player((3, 3))
+    player.speed = (1, 0)
+    scene = interactions.Scene([player])
+    bomb, other = objs.Bomb((3, 3), 5), objs.Bomb((3, 3), 5)
+    index = interactions.tile_index([player], [other])
+    test.touch(bomb, index, scene)
+    assert met == [other] and player.pos == (2, 3)
+    assert (objs.Bomb, objs.Bomb) not in interactions.INTERACTIONS.handlers
+    interactions.INTERACTIONS.touch(objs.Gold((2, 3)), index, scene)
+    assert player.gold[0] == 1  # pushed player was filed under new tile
+
+    # Test 1: walls turn enemies back, explosions reach over the border
+    wall = objs.Wall((5, 5))
+    enemy = objs.Enemy((5, 5), (1, -1))
+    lost = objs.Enemy((-1, 4), (-1, 0))
+    index = interactions.tile_index([enemy, lost])
+    interactions.INTERACTIONS.touch(wall, index, scene)
+    assert enemy.pos == (4, 6) and enemy.speed == (-1, 1)
+    boom = objs.Explosion((0, 4), 1)
+    interactions.INTERACTIONS.touch(boom, index, scene)
+    assert lost.is_dead and not enemy.is_dead and not player.is_dead
+
+    # Test 2: enemies meet in order of the list and follow their tile
+    enemies = [objs.Enemy((5, 5), (1, 0)), objs.Enemy((5, 5), (-1, 0)),
+               objs.Enemy((4, 5), (0, 1))]
+    index = interactions.tile_index(enemies)
+    order = {id(enemy): idx for idx, enemy in enumerate(enemies)}
+    interactions.INTERACTIONS.follow(enemies[0], index, scene, order)
+    # the first one is turned back to (4, 5) and meets the third there
+    assert [enemy.pos for enemy in enemies] == [(5, 5), (6, 5), (4, 4)]
+    assert [enemy.speed for enemy in enemies] == [(1, 0), (1, 0), (0, -1)]
+    assert enemies[2] in index[(4, 4)]
+
+    # Test 3: subclasses use handlers of their base classes
+    class BigGold(objs.Gold):
+        pass
+
+    index = interactions.tile_index([player])
+    interactions.INTERACTIONS.touch(BigGold(player.pos, 5), index, scene)
+    assert player.gold[0] == 6
+    assert interactions.INTERACTIONS.resolved[BigGold, objs.Player] is \
+        interactions.take_gold
+
+
+def test_buffer_WorldBuffer() -> None:
+    """Unit-test for WorldBuffer class"""
+    # Test 0: views read the front state, writes are merged by commit
+    test = buffer.WorldBuffer()
+    player = objs.Player((3, 3))
+    player.speed = (1, 0)
+    view = test.view(player)
+    assert test.view(player) is view and isinstance(view, objs.Player)
+    scene = interactions.Scene([view])
+    for gold in (objs.Gold((3, 3), 2), objs.Gold((3, 3), 3)):
+        interactions.take_gold(gold, view, scene)
+    interactions.push_player(objs.Wall((3, 3)), view, scene)
+    interactions.push_player(objs.Bomb((3, 3)), view, scene)
+    view.is_dead = True
+    assert player.pos == (3, 3) and player.gold[0] == 0 and not view.is_dead
+    assert test.commit() == 3
+    assert player.pos == (2, 3) and player.gold[0] == 5 and player.is_dead
+
+    # Test 1: double-buffered games do not depend on order of enemies
+    def make_game(reverse: bool) -> modes.CollectorGame:
+        game = modes.CollectorGame(level_map=[], enemies=[], tempies=[])
+        game.buffer = buffer.WorldBuffer()
+        rng = random.Random(3)
+        game.level_map = [objs.Bomb((rng.randrange(10), rng.randrange(10)),
+                                    1000) for _ in range(10)]
+        game.enemies = [objs.Enemy((rng.randrange(10), rng.randrange(10)),
+                                   (rng.choice((-1, 1)), rng.choice((-1, 1))))
+                        for _ in range(40)]
+        if reverse:
+            game.enemies.reverse()
+        game.count_level()
+        return game
+
+    games = [make_game(False), make_game(True)]
+    rng = random.Random(7)
+    for tick in range(100):
+        action = env.ACTIONS[rng.randrange(len(env.ACTIONS))]
+        for game in games:
+            game.apply_controls(action[0], action[1] or game.player.sight,
+                                False)
+            game.action()
+            game.logic()
+            game.player.is_dead = False
+        states = [(sorted((enemy.pos, enemy.speed, enemy.is_dead)
+                          for enemy in game.enemies), game.player.pos)
+                  for game in games]
+        assert states[0] == states[1]
+
+    # Test 2: moves of steps are merged whole, by numbers
+    assert buffer.merge_any((0, 0), [(10, 3), (9, 3)]) == (9, 3)
+    enemy = objs.Enemy((8, 3), (1, 0))
+    test.begin()
+    test.view(enemy).pos, test.view(enemy).speed = (10, 3), (-1, 0)
+    test.begin()
+    test.view(enemy).pos = (9, 3)
+    test.commit()
+    assert enemy.pos == (9, 3) and enemy.speed == (1, 0)
+
+
+def test_forward_fast_forward() -> None:
+    """Unit-test for fast_forward function"""
+    # Test 0: timer wheel jumps to the tick before the nearest timer
+    test = timers.TimerWheel(bits=2, levels=2)
+    fired: List[int] = []
+    for ticks in (3, 40, 90):
+        test.add(ticks, lambda ticks=ticks: fired.append(ticks))
+    assert test.next_due() == 3
+    test.advance()
+    test.skip(1)
+    test.advance()
+    assert fired == [3] and test.next_due() == 40
+    test.skip(36)
+    for tick in range(52):
+        test.advance()
+    assert fired == [3, 40, 90] and test.next_due() is None
+
+    # Test 1: jumps end up the same as step-by-step games
+    def make_game(seed: int) -> modes.CollectorGame:
+        rng = random.Random(seed)
+
+        def pos() -> ut.Coord:
+            return rng.randrange(20), rng.randrange(20)
+
+        game = modes.CollectorGame(
+            level_map=[objs.Wall(pos()) for _ in range(15)] +
+            [objs.Gold(pos()) for _ in range(10)] +
+            [objs.Bomb(pos(), rng.randrange(5, 200)) for _ in range(4)],
+            enemies=[objs.Enemy(pos(), (rng.choice((-1, 0, 1)),
+                                        rng.choice((-1, 1))),
+                                rng.choice(list(ut.FieldBounds)))
+                     for _ in range(5)],
+            tempies=[])
+        game.player.pos = pos()
+        return game
+
+    def state(game: modes.CollectorGame) -> List[object]:
+        return [[(enemy.pos, enemy.speed, enemy.slow_count)
+                 for enemy in game.enemies],
+                [(obj.pos, getattr(obj, 'duration', None))
+                 for obj in game.level_map + game.tempies],
+                game.player.pos, game.player.is_dead, game.timers.now,
+                bytes(game.terrain.cells)]
+
+    skipped = 0
+    for seed in range(8):
+        games = [make_game(seed), make_game(seed)]
+        tick = 0
+        while tick < 200:
+            ticks = forward.fast_forward(games[0], 200 - tick)
+            for _ in range(ticks):
+                games[1].action()
+                games[1].logic()
+            tick += ticks + 1
+            skipped += ticks
+            for game in games:
+                game.action()
+                game.logic()
+            assert state(games[0]) == state(games[1])
+    assert skipped > 200
+
+    # Test 2: quiet games are mostly skipped
+    game = modes.CollectorGame(level_map=[objs.Wall((5, 5))],
+                               enemies=[objs.Enemy((3, 8), (1, 1))],
+                               tempies=[])
+    stepped, skipped = forward.run(game, 1000)
+    assert stepped + skipped == 1000 and skipped > 900
+
+    # Test 3: fuses of the previous level do not stop jumps
+    game = modes.CollectorGame(level_map=[objs.Bomb((5, 5), 100)],
+                               enemies=[], tempies=[],
+                               level_config=ut.LevelConfig(0, 1, 0))
+    game.action()
+    game.logic()
+    assert len(game.timers) == 1
+    game.init_level()
+    assert len(game.timers) == 0 and game.timers.next_due() is None
+    game.action()
+    game.logic()
+    assert forward.fast_forward(game, 600) == 600
+
+
+# tests for CollectorGame/ecs.py
+def test_ecs_World() -> None:
+    """Unit-test for World class"""
+    # Test 0: entities are stored in per-archetype columns
+    test = ecs.World()
+    enemy = test.spawn_object(objs.Enemy((0, 5), (-1, 1)))
+    gold = test.spawn_object(objs.Gold((3, 3), 2))
+    wall = test.spawn_object(objs.Wall((4, 4)))
+    wall2 = test.spawn_object(objs.Wall((6, 6)))
+    assert len(test.archetypes) == 3
+    assert test.get(gold, 'value') == 2
+
+    # Test 1: despawn keeps locations of moved rows consistent
+    test.despawn(wall)
+    assert test.is_alive(wall) is False
+    assert ecs.EntityView(test, wall2).pos == (6, 6)
+
+    # Test 2: movement and bounds systems bounce entities off the border
+    test.tick()
+    view = ecs.EntityView(test, enemy)
+    assert view.pos == (0, 6)
+    assert view.speed == (1, 1)
+
+    # Test 3: lifetime system kills expired entities
+    bomb = test.spawn_object(objs.Bomb((1, 1), 2))
+    test.tick()
+    assert test.is_alive(bomb) is True
+    test.tick()
+    assert test.is_alive(bomb) is False
+
+    # Test 4: contacts are dispatched by collider layers
+    collected: List[int] = []
+
+    def pickup(world: ecs.World, player: int, coin: int) -> None:
+        collected.append(world.get(coin, 'value'))
+        world.kill(coin)
+
+    test.on_contact(ecs.LAYER_PLAYER, ecs.LAYER_PICKUP, pickup)
+    player = test.spawn_object(objs.Player((3, 2)))
+    test.set(player, 'vy', 1)
+    test.tick()
+    assert collected == [2]
+    assert test.is_alive(gold) is False
+
+
+# tests for CollectorGame/env.py
+def test_env_CollectorEnv() -> None:
+    """Unit-test for CollectorEnv class"""
+    # Test 0: reset gives the same level for the same seed
+    test = env.CollectorEnv(max_ticks=50)
+    obs = test.reset(7).copy()
+    assert obs.shape == (env.CHANNELS, ut.BSIZE[1], ut.BSIZE[0])
+    assert obs[env.CH_PLAYER].sum() == 1
+    assert obs[env.CH_GOLD].sum() == 10
+    assert obs[env.CH_ENEMY].sum() == 5
+    assert (test.reset(7) == obs).all()
+
+    # Test 1: incremental updates match observation built from scratch
+    for action in [2, 4, 4, 5, 0, 0, 1, 3, 3, 0]:
+        obs, reward, done, info = test.step(action)
+        if done:
+            break
+    fresh = env.CollectorEnv()
+    fresh.game = test.game
+    fresh.sync()
+    assert (fresh.obs == test.obs).all()
+
+    # Test 2: reward for collected gold and the end of game
+    test.reset(7)
+    test.game.terrain.clear()
+    test.game.level_map = [objs.Gold((1, 0), 3)]
+    test.game.enemies = []
+    test.sync()
+    obs, reward, done, info = test.step(2)
+    assert reward == 3.0
+    assert obs[env.CH_GOLD].sum() == 0
+    assert done is False
+
+    test.game.level_map = [objs.Spikes((2, 0))]
+    test.sync()
+    obs, reward, done, info = test.step(2)
+    assert reward == env.REWARD_DEATH
+    assert done is True
+    assert info['is_dead'] is True
+
+    # Test 3: objects off the board do not spill into other tiles
+    test.reset(7)
+    test.game.level_map = []
+    test.game.enemies = [objs.Enemy()]
+    test.game.enemies[0].pos = ut.BSIZE[0], ut.BSIZE[1] - 1
+    test.sync()
+    assert test.cells(test.game.enemies[0], env.CH_ENEMY) == ()
+    assert test.obs[env.CH_ENEMY].sum() == 0
+    assert test.obs[env.CH_ENEMY + 1].sum() == 0
+
+
+def test_vecenv_VecEnv() -> None:
+    """Unit-test for VecEnv class"""
+    actions = [[(tick + idx) % len(env.ACTIONS) for idx in range(3)]
+               for tick in range(60)]
+    # Test 0: workers write the same data as environments of this process
+    single = [env.CollectorEnv(max_ticks=20) for _ in range(3)]
+    with vecenv.VecEnv(3, workers=2, max_ticks=20) as test:
+        obs = test.reset([5, 6, 7])
+        assert obs.shape == (3, env.CHANNELS, ut.BSIZE[1], ut.BSIZE[0])
+        for idx, environment in enumerate(single):
+            assert (environment.reset(5 + idx) == obs[idx]).all()
+
+        # Test 1: finished environments start again by themselves
+        finished = 0
+        for tick_actions in actions:
+            obs, rewards, dones, won = test.step(tick_actions)
+            for idx, environment in enumerate(single):
+                single_obs, reward, done, info = \
+                    environment.step(tick_actions[idx])
+                assert rewards[idx] == reward and dones[idx] == done
+                if done:
+                    assert test.ticks[idx] == info['tick']
+                    environment.reset()
+                assert (single_obs == obs[idx]).all()
+            finished += int(dones.sum())
+        assert finished >= 3
+
+    # Test 2: environments may run in this process too
+    with vecenv.VecEnv(2, workers=0, autoreset=False) as test:
+        test.reset()
+        obs, rewards, dones, won = test.step([5, 5])
+        assert obs[:, env.CH_BOMB].sum() == 2
+
+
+def test_batch_BatchGame() -> None:
+    """Unit-test for BatchGame class"""
+    # Test 0: boards start with the same levels as CollectorEnv
+    config = ut.LevelConfig(spikes=15, gold=10, enemies=8)
+    test = batch.BatchGame(24, config, max_ticks=100)
+    test.reset(list(range(24)))
+    games = []
+    for board in range(24):
+        single = env.CollectorEnv(max_ticks=100)
+        single.game.level_config = config
+        single.reset(board)
+        assert batch.game_state(single.game) == test.state(board)
+        if board % 2:  # walls are not generated, so put some by hand
+            for idx in range(10):
+                pos = ((board * 7 + idx * 3) % 20, (board + idx * 5) % 19 + 1)
+                single.game.terrain.add_wall(pos, idx % 3 == 0)
+            test.load(board, single.game)
+        games.append(single)
+
+    # Test 1: every tick boards are the same as games of object engine
+    rng = random.Random(3)
+    actions = [[rng.randrange(len(env.ACTIONS)) for board in range(24)]
+               for tick in range(200)]
+    for tick_actions in actions:
+        rewards, dones = test.step(tick_actions)
+        for board, single in enumerate(games):
+            game = single.game
+            if single.done:  # keep the game going after its episode
+                speed, sight, set_bomb = env.ACTIONS[tick_actions[board]]
+                game.apply_controls(speed, sight or game.player.sight,
+                                    set_bomb)
+                game.action()
+                game.logic()
+                reward, done = 0.0, True
+            else:
+                obs, reward, done, info = single.step(tick_actions[board])
+            assert batch.game_state(game) == test.state(board)
+            assert rewards[board] == reward and dones[board] == done
+    assert test.is_dead.sum() > 12 and (test.bombs < 3).sum() > 12
+    assert (test.enemies_left < 8).any() and test.done.all()
+
+    # Test 2: observations are the same as CollectorEnv makes
+    obs = test.observe()
+    for board, single in enumerate(games):
+        single.sync()
+        assert (single.obs == obs[board]).all()
+
+
+# tests for CollectorGame/server.py
+def test_server_GameServer() -> None:
+    """Unit-test for GameServer class"""
+    async def play() -> None:
+        game = server.ServerGame()
+        game.level_map = [objs.Gold((10, 10)), objs.Spikes((3, 5))]
+        game.enemies = [objs.Enemy((5, 10), (1, 0))]
+        game.tempies = []
+        game.count_level()
+        test = server.GameServer(tick_rate=500, game=game)
+        host, port = await test.start_tcp()
+        path = os.path.join(tempfile.mkdtemp(), 'collector.sock')
+        await test.start_unix(path)
+
+        conns = [await asyncio.open_connection(host, port)
+                 for _ in range(3)]
+        conns.append(await asyncio.open_unix_connection(path))
+        hellos = []
+        for reader, writer in conns:
+            hellos.append(json.loads(await reader.readline())['hello'])
+            writer.write(b'{"move": [1, 0]}\n')
+            await writer.drain()
+        await asyncio.sleep(0.05)
+
+        # Test 0: every client gets its own player
+        assert len(set(hellos)) == 4
+        assert len(test.game.players) == 4
+
+        # Test 1: deltas rebuild exactly the server state on clients
+        await test.run(30)
+        for reader, writer in conns:
+            state: dict = {}
+            frames = 0
+            while frames < 30:
+                server.apply_frame(state, json.loads(await reader.readline()))
+                frames += 1
+            assert state == test.encoder.state
+
+        # Test 2: input of client moves its player
+        assert test.game.players[0].pos == (ut.BSIZE[0]-1, 0)
+        assert test.encoder.state['p0'][1:3] == [ut.BSIZE[0]-1, 0]
+
+        # Test 3: JSON line, which is not an object, is skipped
+        reader, writer = conns[1]
+        writer.write(b'[1]\n"x"\n{"move": [0, 1]}\n')
+        await writer.drain()
+        await asyncio.sleep(0.05)
+        await test.run(3)
+        assert 1 in test.game.players
+        assert test.game.players[1].speed == (0, 1)
+
+        await test.stop()
+        for reader, writer in conns:
+            writer.close()
+
+    asyncio.run(play())
+
+    # Test 4: contacts are processed once per tick for all players
+    game = server.ServerGame()
+    spikes = objs.Spikes((3, 5), is_activated=False)
+    game.level_map = [spikes, objs.Gold((10, 10))]
+    game.enemies = []
+    game.tempies = []
+    game.count_level()
+    first, second = game.add_player(), game.add_player()
+    game.players[first].pos = (0, 0)
+    game.players[second].pos = spikes.pos
+    for tick in range(3):
+        game.action()
+        game.logic()
+    assert spikes.is_triggered and not spikes.is_activated
+    assert not game.players[second].is_dead
+    game.players[second].speed = (1, 0)
+    game.action()
+    game.logic()
+    assert spikes.is_activated
+
+    # Test 5: gold taken by any player counts as collected
+    golds: Dict[ut.Coord, ut.GameEvent] = {}
+    for event in (ut.GameEvent.GOLD_COLLECTED, ut.GameEvent.GOLD_LOST):
+        game.bus.subscribe(event, lambda event, src: golds.update({
+            src.pos: event}))
+    game.level_map.append(objs.Gold((7, 7)))
+    game.count_level()
+    game.players[first].pos = (7, 7)
+    game.tempies.append(objs.Explosion((10, 10)))
+    game.player.pos = (10, 10)
+    game.action()
+    game.logic()
+    assert golds == {(7, 7): ut.GameEvent.GOLD_COLLECTED,
+                     (10, 10): ut.GameEvent.GOLD_LOST}
+
+
+# tests for CollectorGame/spectate.py
+def test_spectate_SpectatorChannel() -> None:
+    """Unit-test for SpectatorChannel class"""
+    async def watch() -> None:
+        game = modes.CollectorGame()
+        game.rng.seed(5)
+        game.init_level()
+        test = spectate.SpectatorChannel(keyframe_every=10)
+        host, port = await test.start_tcp()
+        conns = [await asyncio.open_connection(host, port)
+                 for _ in range(20)]
+        await asyncio.sleep(0.05)
+        assert len(test.subscribers) == 20
+
+        # Test 0: every tick is encoded once, whatever the audience size
+        for tick in range(25):
+            game.action()
+            game.logic()
+            test.feed(game)
+        assert test.encoded == 25
+
+        # Test 1: spectators restore exact state from shared frames
+        for reader, writer in conns:
+            state: dict = {}
+            for tick in range(25):
+                server.apply_frame(state, json.loads(await reader.readline()))
+            assert state == test.encoder.state
+
+        await test.stop()
+        for reader, writer in conns:
+            writer.close()
+
+        # Test 2: slow subscriber is dropped to keyframe
+        slow = spectate.Subscriber(conns[0][1], 2)
+        slow.needs_keyframe = False
+        assert slow.offer(b'1') and slow.offer(b'2')
+        assert slow.offer(b'3') is False
+        assert slow.queue.empty() and slow.needs_keyframe
+        assert slow.dropped == 3
+
+    asyncio.run(watch())
+
+
+# tests for CollectorGame/capture.py
+def test_capture_FrameCapture() -> None:
+    """Unit-test for FrameCapture class"""
+    size = (40, 30)
+    screen = pygame.Surface(size)
+    screen.fill((10, 20, 30))
+    folder = tempfile.mkdtemp()
+
+    # Test 0: every frame is either written or dropped, never lost
+    test = capture.FrameCapture(folder, size, capture.FORMAT_PNG, 2)
+    for frame in range(10):
+        test.capture(screen)
+    test.close()
+    assert test.written + test.dropped == 10
+    assert len(os.listdir(folder)) == test.written
+
+    # Test 1: raw stream holds whole RGB frames in order
+    path = os.path.join(folder, 'video.rgb')
+    test = capture.FrameCapture(path, size, capture.FORMAT_RAW, 4)
+    for frame in range(5):
+        screen.fill((frame, 0, 0))
+        test.capture(screen)
+    test.close()
+    with open(path, 'rb') as video:
+        data = video.read()
+    frame_size = size[0] * size[1] * 3
+    assert len(data) == test.written * frame_size
+    reds = [data[idx * frame_size] for idx in range(test.written)]
+    assert reds == sorted(reds)
+
+    # Test 2: drop instead of waiting when the ring is busy
+    test = capture.FrameCapture(path, size, capture.FORMAT_RAW, 1)
+    test.free.get_nowait()
+    assert test.capture(screen) is False
+    assert test.dropped == 1
+    test.close()
+
+    # Test 3: ring follows resized screen, raw frames keep their size
+    test = capture.FrameCapture(folder, size, capture.FORMAT_PNG, 1)
+    test.capture(pygame.Surface((60, 50)))
+    test.close()
+    assert test.ring[0].get_size() == (60, 50)
+    test = capture.FrameCapture(path, size, capture.FORMAT_RAW, 1)
+    test.capture(pygame.Surface((60, 50)))
+    test.close()
+    assert test.ring[0].get_size() == size
+    assert os.path.getsize(path) == frame_size
+
+    # Test 4: errors of workers are raised by close()
+    test = capture.FrameCapture(os.path.join(folder, 'gone'), size,
+                                capture.FORMAT_PNG, 1)
+    os.rmdir(test.path)
+    test.capture(screen)
+    try:
+        test.close()
+    except (OSError, pygame.error):
+        pass
+    else:
+        assert False, 'error of worker is lost'
+
+
+# tests for CollectorGame/assets.py
+def test_assets_AssetLoader() -> None:
+    """Unit-test for AssetLoader class and lazy images"""
+    # Test 0: image resources are loaded once, on first access
+    assert images.load('WALL_SEQ') is images.WALL_SEQ
+    assert images.WALL_SEQ[0] is images.WALL_IMG
+    assert len(images.BOOM_IMG) == 7
+
+    # Test 1: background loader loads everything and reports progress
+    test = assets.AssetLoader()
+    test.start()
+    assert test.wait(30) is True
+    assert test.first_level_ready.is_set()
+    assert test.error is None
+    assert test.progress() == 1.0
+    for name in images.all_names():
+        assert images.is_loaded(name)
+
+    # Test 2: dialog fonts are cached
+    fonts = len(gui._fonts)
+    gui.CloseDialog()
+    assert len(gui._fonts) == fonts
+
+
+# tests for CollectorGame/animation.py
+def test_animation_AnimationClock() -> None:
+    """Unit-test for AnimationClock class"""
+    seq = images.MONEY_IMG
+    test = animation.AnimationClock(fps=10)
+    test.register(seq)
+
+    # Test 0: frames depend on time only, not on number of draws
+    test.tick(0)
+    assert test.frame(seq) is seq[0]
+    assert test.frame(seq, 2) is seq[2]
+    test.tick(99)
+    assert test.frame(seq) is seq[0]
+    test.tick(250)
+    assert test.frame(seq) is seq[2]
+    assert test.frame(seq, 5) is seq[1]
+
+    # Test 1: unregistered sequences are computed on the fly
+    other = images.ENEMY_IMG
+    assert test.frame(other) is other[2]
+    assert id(other) not in test.frames
+
+    # Test 2: objects with the same phase show the same frame
+    obj1 = objs.Gold((0, 6), 1)
+    obj2 = objs.Gold((3, 6), 1)
+    assert obj1.phase == obj2.phase == 0
+    assert not hasattr(obj1, 'draw_count')
+
+
+# tests for CollectorGame/render.py
+def test_render_RenderQueue() -> None:
+    """Unit-test for RenderQueue class"""
+    size = (ut.BSIZE[0] * ut.TILE, ut.BSIZE[1] * ut.TILE)
+    game_objects = [objs.Wall((1, 1)), objs.Gold((2, 2), 1),
+                    objs.Spikes((3, 3)), objs.Enemy((4, 4), (1, 0)),
+                    objs.Explosion((5, 5)), objs.Player((6, 6))]
+
+    # Test 0: batched drawing gives the same picture as object's draw()
+    expected = pygame.Surface(size)
+    for game_object in game_objects:
+        game_object.draw(expected)
+
+    for sort in (False, True):
+        test = render.RenderQueue(sort=sort)
+        for layer, game_object in enumerate(game_objects):
+            game_object.submit(test, min(layer, render.LAYERS - 1))
+        assert len(test) == 5 + 10  # centre of cross is drawn twice
+        result = pygame.Surface(size)
+        test.flush(result)
+        assert len(test) == 0
+        assert pygame.image.tobytes(result, 'RGB') == \
+            pygame.image.tobytes(expected, 'RGB')
+
+    # Test 1: upper layers are drawn over lower ones
+    test = render.RenderQueue()
+    test.add(render.LAYER_PLAYER, images.MAN_IMG[0], (0, 0))
+    test.add(render.LAYER_MAP, images.WALL_IMG, (0, 0))
+    result = pygame.Surface((ut.TILE, ut.TILE))
+    test.flush(result)
+    expected = pygame.Surface((ut.TILE, ut.TILE))
+    expected.blit(images.WALL_IMG, (0, 0))
+    expected.blit(images.MAN_IMG[0], (0, 0))
+    assert pygame.image.tobytes(result, 'RGB') == \
+        pygame.image.tobytes(expected, 'RGB')
+
+
+def test_render_scaled() -> None:
+    """Unit-test for cached scaling of sprites and GUI"""
+    tile = ut.TILE // 2
+
+    # Test 0: every sprite is scaled once per tile size
+    sprite = images.MONEY_IMG[0]
+    assert render.scaled(sprite, ut.TILE) is sprite
+    small = render.scaled(sprite, tile)
+    assert small.get_size() == (tile, tile)
+    assert render.scaled(sprite, tile) is small
+    render.prescale(tile)
+    assert render.scaled(sprite, tile) is small
+    render.prescale(tile + 1)
+    assert render.scaled(sprite, tile) is not small
+    render.prescale(tile)
+
+    # Test 1: game is drawn with scaled sprites and background
+    game = modes.CollectorGame()
+    game.resize(tile)
+    game.init()
+    assert game.back_img.get_size() == (ut.BSIZE[0]*tile, ut.BSIZE[1]*tile)
+    game.draw(pygame.Surface(game.back_img.get_size()))
+    game.resize(ut.TILE)
+    assert game.back_img.get_size() == gui.design_size()
+    with stress.board_size((3, 2)):
+        assert render.background(tile).get_size() == (3 * tile, 2 * tile)
+
+    # Test 2: GUI layouts are scaled
+    gui.set_scale((gui.design_size()[0], gui.design_size()[1] // 2))
+    assert gui.get_scale() == 0.5
+    button = gui.Button((100, 200), (100, 50), 'test', images.BUTT_CLS_IMG)
+    assert button.pos == (50, 100) and button.size == (50, 25)
+    assert button.image.get_size() == (50, 25)
+    dialog = gui.CloseDialog()
+    assert dialog.menu_img.get_size() == (200, 150)
+    gui.set_scale(gui.design_size())
+    assert gui.get_scale() == 1.0
+
+
+def test_frames_FrameRenderer() -> None:
+    """Unit-test for FrameRenderer class"""
+    game = modes.CollectorGame(level_map=[objs.Wall((1, 1)),
+                                          objs.Gold((2, 2))],
+                               enemies=[objs.Enemy((4, 4), (1, 0))],
+                               tempies=[objs.Explosion((5, 5))])
+    game.init_background()
+
+    # Test 0: frame is the same as the one drawn on the screen
+    expected = pygame.Surface(gui.design_size())
+    game.draw(expected)
+    test = frames.FrameRenderer(game)
+    frame = test.render()
+    assert frame.shape == (gui.design_size()[1], gui.design_size()[0], 4)
+    assert test.rgb.tobytes() == pygame.image.tobytes(expected, 'RGB')
+
+    # Test 1: frames are views of the same buffer, nothing is copied
+    pixel = frame[0, 0, :3].tolist()
+    game.player.pos = (1, 0)
+    assert test.render() is frame and test.frames == 2
+    assert frame[0, 0, :3].tolist() == pixel
+    assert frame[0, ut.TILE + 1, :3].tolist() != pixel
+    frame[0, 0, :3] = (1, 2, 3)
+    assert test.surface.get_at((0, 0))[:3] == (1, 2, 3)
+
+    # Test 2: with tile of one pixel every tile is a pixel
+    test = frames.FrameRenderer(game, tile=1)
+    frame = test.render()
+    assert frame.shape == (ut.BSIZE[1], ut.BSIZE[0], 4)
+    background = test.background.get_at((10, 10))[:3]
+    assert tuple(frame[10, 10, :3]) == background
+    assert tuple(frame[1, 1, :3]) != background
+
+
+# tests for CollectorGame/stress.py
+def test_stress_run() -> None:
+    """Unit-test for stress scenario generator and runner"""
+    scenario = stress.Scenario((60, 40), enemies=300, walls=200, bombs=30,
+                               gold=20, seed=1)
+
+    # Test 0: board size is switched only while scenario is built/run
+    with stress.board_size(scenario.size):
+        game = stress.generate(scenario)
+        assert ut.BSIZE == (60, 40)
+        assert gui.design_size() == (60 * ut.TILE, 40 * ut.TILE)
+        assert ecs.World().bsize == (60, 40)
+        assert server.spawn_point(1) == (59, 39)
+    assert ut.BSIZE == (20, 20)
+    assert len(game.enemies) == 300
+    assert sum(isinstance(obj, objs.Bomb) for obj in game.level_map) == 30
+    assert (game.terrain.width, game.terrain.height) == (60, 40)
+    assert max(enemy.pos[0] for enemy in game.enemies) >= 20
+
+    # Test 1: same seed gives the same level
+    with stress.board_size(scenario.size):
+        other = stress.generate(scenario)
+    assert [e.pos for e in other.enemies] == [e.pos for e in game.enemies]
+
+    # Test 2: report is filled in (rendered and headless)
+    for render_ticks in (False, True):
+        report = stress.run(scenario, ticks=5, render=render_ticks)
+        assert report.ticks == 5 and report.ticks_per_sec > 0
+        assert 0 < report.p50_ms <= report.p95_ms <= report.max_ms
+        assert report.peak_bytes > 0
+        assert len(stress.format_report(report).split()) == 11
+    game.init_background()
+    assert game.back_img.get_size() == (60 * game.tile, 40 * game.tile)
+    assert ut.BSIZE == (20, 20)
+
+    # Test 3: swarm of the target scale runs and records every tick
+    report = stress.run(stress.SWARM, ticks=3, trace_memory=False)
+    assert stress.SWARM.enemies >= 10000
+    assert len(report.times_ms) == 3 and report.p50_ms < 1000
+    assert abs(max(report.times_ms) - report.max_ms) < 1e-6
+
+
+# tests for CollectorGame/bus.py
+def test_bus_EventBus() -> None:
+    """Unit-test for EventBus class and win-lose counters"""
+    # Test 0: handlers get published events in order of subscription
+    test = bus.EventBus()
+    got: List[str] = []
+
+    def first(event: ut.GameEvent, source: int) -> None:
+        got.append('first:' + str(source))
+
+    test.subscribe(ut.GameEvent.ENEMY_KILLED, first)
+    test.subscribe(ut.GameEvent.ENEMY_KILLED,
+                   lambda event, source: got.append('second'))
+    test.publish(ut.GameEvent.ENEMY_KILLED, 1)
+    test.publish(ut.GameEvent.GOLD_LOST, 2)
+    assert got == ['first:1', 'second']
+    test.unsubscribe(ut.GameEvent.ENEMY_KILLED, first)
+    test.publish(ut.GameEvent.ENEMY_KILLED, 3)
+    assert got == ['first:1', 'second', 'second']
+
+    # Test 1: all neighbouring dead objects are removed at once
+    enemies = [objs.Enemy((x, 5), (0, 0)) for x in range(4)]
+    level = [objs.Gold((1, 1), 2), objs.Gold((2, 2), 3), objs.Wall((9, 9))]
+    game = modes.CollectorGame(level_map=level, enemies=enemies, tempies=[],
+                               win_mode=ut.WinCondition.KILL_ALL)
+    assert game.player.gold == (0, 5) and game.gold_left == 2
+    events: List[ut.GameEvent] = []
+    for event in ut.GameEvent:
+        game.bus.subscribe(event, lambda event, src: events.append(event))
+    for enemy in enemies:
+        enemy.is_dead = True
+    game.destroy()
+    assert game.enemies == [] and game.enemies_left == 0
+    assert events == [ut.GameEvent.ENEMY_KILLED] * 4
+
+    # Test 2: every win condition is tracked by counters
+    assert game.is_won()
+    game.win_mode = ut.WinCondition.COLLECT_ALL
+    game.player.pos = (1, 1)
+    game.logic()
+    assert events[-1] == ut.GameEvent.GOLD_COLLECTED
+    assert not game.is_won() and game.gold_left == 1
+    game.tempies.append(objs.Explosion((2, 2)))
+    game.logic()
+    assert events[-2:] == [ut.GameEvent.GOLD_LOST, ut.GameEvent.PLAYER_DIED]
+    assert game.gold_left == 0 and not game.is_won()
+    game.win_mode = ut.WinCondition.GET_GOAL
+    assert game.is_won()
+
+    # Test 3: player's death and level restart
+    events.clear()
+    game.tempies.clear()
+    game.player.is_dead = True
+    game.logic()
+    assert ut.GameEvent.PLAYER_DIED not in events
+    game.player.is_dead = False
+    game.tempies.append(objs.Explosion((1, 1)))
+    game.logic()
+    assert events[-1] == ut.GameEvent.PLAYER_DIED
+    game.reset()
+    assert game.gold_left == 2 and game.enemies_left == 4
+    assert game.player.gold == (0, 5)
+
+
+# tests for CollectorGame/telemetry.py
+def test_telemetry_FlightRecorder() -> None:
+    """Unit-test for FlightRecorder class"""
+    path = os.path.join(tempfile.mkdtemp(), 'flight.json')
+    test = telemetry.FlightRecorder(size=4, path=path)
+    row = array('q', bytes(8 * telemetry.STRIDE))
+
+    # Test 0: only the last ticks are kept, from the oldest to the newest
+    assert len(test) == 0 and test.entries() == []
+    for tick in range(6):
+        row[0] = tick
+        row[12] = telemetry.pack_input((1, -1), True)
+        test.record(row)
+    assert len(test) == 4
+    assert [entry['tick'] for entry in test.entries()] == [2, 3, 4, 5]
+    assert test.entries()[0]['input_state'] == 2 | 0 << 2 | 1 << 4
+
+    # Test 1: entries are dumped on demand and on signal
+    assert test.dump('test') == path
+    with open(path) as stream:
+        report = json.load(stream)
+    assert report['reason'] == 'test' and report['ticks_recorded'] == 6
+    assert len(report['entries']) == 4
+    if hasattr(signal, 'SIGUSR1'):
+        os.remove(path)
+        old_handler = signal.getsignal(signal.SIGUSR1)
+        assert test.install()
+        os.kill(os.getpid(), signal.SIGUSR1)
+        signal.signal(signal.SIGUSR1, old_handler)
+        with open(path) as stream:
+            assert json.load(stream)['reason'].startswith('signal')
+
+    # Test 2: game reports its entity counts and input
+    game = modes.CollectorGame()
+    game.init_level()
+    game.apply_controls((-1, 0), (-1, 0), True)
+    tiles = len(list(game.terrain.tiles()))
+    assert game.telemetry() == (tiles, 5, 0, 0 | 1 << 2 | 1 << 4)
+
+
+# tests for CollectorGame/memtrack.py
+def test_memtrack_MemoryTracker() -> None:
+    """Unit-test for MemoryTracker class"""
+    test = memtrack.MemoryTracker(interval=5)
+    test.start()
+    try:
+        # Test 0: snapshots are taken every interval ticks only
+        # (more objects, than free lists of tuples can hold)
+        kept = [objs.Wall((idx % 20, idx // 20 % 20)) for idx in range(8000)]
+        for tick in range(1, 11):
+            test.on_tick(tick)
+        assert [sample.tick for sample in test.samples] == [0, 5, 10]
+        assert test.samples[-1].traced > test.samples[0].traced
+        assert test.samples[-1].rss > 0
+
+        # Test 1: growing call sites of game modules are reported
+        growth = [site for site in test.growth(3)
+                  if site.site.startswith('objects.py:')]
+        assert growth and growth[0].count_diff >= len(kept) // 2
+        assert growth[0].site in test.report()
+    finally:
+        test.stop()
+    assert not tracemalloc.is_tracing()
+
+
+# tests for CollectorGame/bot.py
+def test_bot_AutoPilot() -> None:
+    """Unit-test for AutoPilot class"""
+    # Test 0: bot controls the player through keyboard events
+    game = modes.CollectorGame(level_map=[], enemies=[], tempies=[])
+    game.events(bot.control_events((1, -1), (0, -1)), None)
+    assert game.player.speed == (1, -1) and game.player.sight == (0, -1)
+    game.events(bot.control_events((0, 0), (-1, 0), True), None)
+    assert game.player.speed == (0, 0) and game.player.sight == (-1, 0)
+    assert game.player.set_bomb is True
+
+    # Test 1: bot blows up the wall between it and the gold
+    walls: List[objs.BasicObject] = [objs.Wall((5, y)) for y in range(20)]
+    game = modes.CollectorGame(level_map=walls + [objs.Gold((10, 10))],
+                               enemies=[objs.Enemy((15, 3), (0, 1))],
+                               tempies=[])
+    test = bot.AutoPilot()
+    won, ticks = bot.play(game, 500, test)
+    assert won is True
+    assert game.player.bombs[0] < game.player.bombs[1]
+    assert test.rebuilds < ticks  # distance maps are cached
+
+    # Test 2: bot wins most of generated levels
+    wins = 0
+    for seed in range(10):
+        game = modes.CollectorGame()
+        game.rng.seed(seed)
+        game.init_level()
+        wins += bot.play(game, 1000)[0]
+    assert wins >= 8
+
+
+def test_balance_estimate() -> None:
+    """Unit-test for estimate function"""
+    # Test 0: Wilson interval holds the rate and narrows with more games
+    low, high = balance.wilson(8, 10)
+    assert 0 < low < 0.8 < high < 1
+    assert balance.wilson(80, 100)[1] - balance.wilson(80, 100)[0] < \
+        high - low
+    assert balance.wilson(0, 0) == (0.0, 1.0)
+
+    # Test 1: level generator follows its config
+    config = ut.LevelConfig(spikes=3, gold=4, enemies=7)
+    game = modes.CollectorGame(level_config=config)
+    game.init_level()
+    assert len(game.enemies) == 7 and game.gold_left == 4
+
+    # Test 2: estimate is deterministic and stops early when it's sure
+    kwargs = dict(tolerance=0.2, min_games=8, max_games=32, batch=8,
+                  processes=0, max_ticks=500)
+    result = balance.estimate(config, **kwargs)
+    assert result == balance.estimate(config, **kwargs)
+    assert 8 <= result.games < 32
+    assert result.win_low <= result.win_rate <= result.win_high
+    assert result.wins == 0 or result.mean_ticks > 0
+
+    # Test 3: games on the same level differ only by bot's noise
+    same = balance.estimate(config, level_seed=1, noise=0.0, **kwargs)
+    assert same.wins in (0, same.games) and same.ticks_margin == 0
+
+    # Test 4: handmade level is rated as it is
+    level = modes.CollectorGame(level_map=[objs.Gold((0, 2)),
+                                           objs.Wall((5, 5))],
+                                enemies=[objs.Enemy((9, 9), (1, 0))],
+                                tempies=[])
+    assert balance.build(balance.level_of(level), config).gold_left == 1
+    kwargs['processes'] = 2
+    handmade = balance.estimate(config, level=level, noise=0.0, **kwargs)
+    assert handmade.wins == handmade.games and handmade.ticks_margin == 0
+
+
 # tests for CollectorGame/gui.py
 def test_gui_GuiObject() -> None:
     """Unit-test for GuiObject class"""
@@ -418,6 +1600,77 @@ def do_ultimate_check() -> None:
     # test objects.py
     test_objects_BasicObject()
     test_objects_Player()
+    test_objects_slots()
+
+    # test terrain.py
+    test_terrain_TerrainGrid()
+
+    # test schedule.py
+    test_schedule_ActiveSet()
+
+    # test timers.py
+    test_timers_TimerWheel()
+
+    # test interactions.py
+    test_interactions_Interactions()
+
+    # test buffer.py
+    test_buffer_WorldBuffer()
+
+    # test forward.py
+    test_forward_fast_forward()
+
+    # test ecs.py
+    test_ecs_World()
+
+    # test env.py
+    test_env_CollectorEnv()
+
+    # test vecenv.py
+    test_vecenv_VecEnv()
+
+    # test batch.py
+    test_batch_BatchGame()
+
+    # test server.py
+    test_server_GameServer()
+
+    # test spectate.py
+    test_spectate_SpectatorChannel()
+
+    # test capture.py
+    test_capture_FrameCapture()
+
+    # test assets.py
+    test_assets_AssetLoader()
+
+    # test animation.py
+    test_animation_AnimationClock()
+
+    # test render.py
+    test_render_RenderQueue()
+    test_render_scaled()
+
+    # test frames.py
+    test_frames_FrameRenderer()
+
+    # test stress.py
+    test_stress_run()
+
+    # test bus.py
+    test_bus_EventBus()
+
+    # test telemetry.py
+    test_telemetry_FlightRecorder()
+
+    # test memtrack.py
+    test_memtrack_MemoryTracker()
+
+    # test bot.py
+    test_bot_AutoPilot()
+
+    # test balance.py
+    test_balance_estimate()
 
     # test gui.py
     test_gui_GuiObject()
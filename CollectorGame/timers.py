@@ -0,0 +1,166 @@
+"""
+timers.py -- hierarchical timer wheel
+=====================================
+This is module, which counts ticks for game objects: bomb fuses, lifetimes
+of explosions and anything else, which has to happen after given number
+of ticks (e.g. end of bonus).
+
+Timers are kept in wheels of 64 slots: the first wheel has one slot per
+tick, the next one per 64 ticks and so on. Timers of far wheels are moved
+closer once per turn of the nearer wheel, so every tick touches only the
+timers, which expire now, however many timers are waiting.
+"""
+
+from typing import Callable, Iterator, List, Optional
+
+
+Callback = Callable[[], None]
+
+
+class Timer:
+    """One scheduled expiration"""
+    __slots__ = ('wheel', 'due', 'callback', 'is_active')
+
+    def __init__(self, wheel: 'TimerWheel', due: int,
+                 callback: Callback) -> None:
+        """Initialise timer, which calls callback at tick due"""
+        self.wheel: 'TimerWheel' = wheel
+        self.due: int = due
+        self.callback: Callback = callback
+        self.is_active: bool = True
+
+    def remaining(self) -> int:
+        """Get number of ticks left before expiration"""
+        return max(0, self.due - self.wheel.now)
+
+
+class TimerWheel:
+    """Hierarchical timing wheel counted in game ticks"""
+
+    def __init__(self, bits: int = 6, levels: int = 4) -> None:
+        """Initialise wheels of 2**bits slots each"""
+        self.bits: int = bits
+        self.mask: int = (1 << bits) - 1
+        self.wheels: List[List[List[Timer]]] = [
+            [[] for _ in range(1 << bits)] for _ in range(levels)]
+        self.overflow: List[Timer] = []  # too far even for the last wheel
+        self.now: int = 0
+        self.count: int = 0  # active timers
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, ticks: int, callback: Callback) -> Timer:
+        """Call callback after given number of ticks (at least one)"""
+        timer = Timer(self, self.now + max(1, ticks), callback)
+        self.insert(timer)
+        self.count += 1
+        return timer
+
+    def cancel(self, timer: Timer) -> None:
+        """Forget timer (it is dropped from its slot lazily)"""
+        if timer.is_active:
+            timer.is_active = False
+            self.count -= 1
+
+    def clear(self) -> None:
+        """Cancel all timers (e.g. of objects of the previous level)"""
+        for timer in self.timers():
+            timer.is_active = False
+        for wheel in self.wheels:
+            for slot in wheel:
+                slot.clear()
+        self.overflow = []
+        self.count = 0
+
+    def restart(self, timer: Timer, ticks: int) -> Timer:
+        """Replace timer with new one, which expires after ticks"""
+        self.cancel(timer)
+        return self.add(ticks, timer.callback)
+
+    def insert(self, timer: Timer) -> None:
+        """Put timer into the nearest wheel, which reaches its tick"""
+        delta = timer.due - self.now
+        for level, wheel in enumerate(self.wheels):
+            shift = self.bits * level
+            if delta < 1 << (shift + self.bits):
+                wheel[(timer.due >> shift) & self.mask].append(timer)
+                return
+        self.overflow.append(timer)
+
+    def advance(self) -> int:
+        """Move one tick forward and fire expired timers; return their number
+
+        Callbacks are called in order of scheduling.
+        """
+        self.now += 1
+        now = self.now
+        if now & self.mask == 0:
+            self.cascade()
+
+        slot = now & self.mask
+        expired = self.wheels[0][slot]
+        if not expired:
+            return 0
+        self.wheels[0][slot] = []
+        fired = 0
+        for timer in expired:
+            if timer.is_active:
+                timer.is_active = False
+                self.count -= 1
+                fired += 1
+                timer.callback()
+        return fired
+
+    def cascade(self) -> None:
+        """Move timers of far wheels, whose turn has come, closer"""
+        now = self.now
+        levels = len(self.wheels)
+        if now & ((1 << (self.bits * levels)) - 1) == 0 and self.overflow:
+            waiting, self.overflow = self.overflow, []
+            for timer in waiting:
+                if timer.is_active:
+                    self.insert(timer)
+        # far wheels go first, as their timers may fall into nearer slots,
+        # which are taken right after them
+        for level in range(levels - 1, 0, -1):
+            shift = self.bits * level
+            if now & ((1 << shift) - 1):
+                continue
+            slot = (now >> shift) & self.mask
+            waiting = self.wheels[level][slot]
+            if not waiting:
+                continue
+            self.wheels[level][slot] = []
+            for timer in waiting:
+                if timer.is_active:
+                    self.insert(timer)
+
+    def timers(self) -> Iterator[Timer]:
+        """Iterate all active timers"""
+        for wheel in self.wheels:
+            for slot in wheel:
+                for timer in slot:
+                    if timer.is_active:
+                        yield timer
+        for timer in self.overflow:
+            if timer.is_active:
+                yield timer
+
+    def next_due(self) -> Optional[int]:
+        """Get tick of the nearest expiration (None without timers)"""
+        return min((timer.due for timer in self.timers()), default=None)
+
+    def skip(self, ticks: int) -> None:
+        """Move given number of ticks forward at once
+
+        No timer may expire on the way (see next_due).
+        """
+        waiting = list(self.timers())
+        for wheel in self.wheels:
+            for idx in range(len(wheel)):
+                wheel[idx] = []
+        self.overflow = []
+        self.now += ticks
+        for timer in waiting:
+            self.insert(timer)
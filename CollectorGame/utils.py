@@ -6,13 +6,13 @@ This is module, which mainly consists of constants and utility functions.
 
 import pygame  # type: ignore
 from enum import Enum
-from typing import Tuple, List
+from typing import List, NamedTuple, Tuple
 from os.path import abspath, dirname
 
 BSIZE: Tuple[int, int] = (20, 20)
 TILE: int = 40
 FPS: int = 70
-ANIMATION_ITER: float = 0.5
+ANIMATION_FPS: float = 7.0  # sprite frames per second
 ENEMY_SLOW: int = 2
 
 Coord = Tuple[int, int]
@@ -22,8 +22,18 @@ Event = pygame.event.Event
 Clock = pygame.time.Clock
 Trigger = Tuple[str, int, int]
 
+NO_SPEED: Coord = (0, 0)  # shared by every motionless object
+
 PLAYER_CONFIG = ((0, 0), (3, 3), (0, 10))
 
+
+class LevelConfig(NamedTuple):
+    """Parameters of generated level"""
+    spikes: int = 10
+    gold: int = 10
+    enemies: int = 5
+
+
 GAME_FONT = dirname(abspath(__file__))+'/FortunataCYR.ttf'
 
 UselessAdvices: List[str] = [
@@ -59,6 +69,15 @@ class ExplosionType(Enum):
     CIRCLE = 1
 
 
+class GameEvent(Enum):
+    GOLD_COLLECTED = 0,
+    GOLD_LOST = 1,
+    ENEMY_KILLED = 2,
+    WALL_DESTROYED = 3,
+    BOMB_EXPLODED = 4,
+    PLAYER_DIED = 5
+
+
 def bfunc_minc(trigger_val: int, trigger_max_val: int) -> int:
     """Button trigger update function: increase value with module"""
     return (trigger_val+1) % trigger_max_val
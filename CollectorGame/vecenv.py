@@ -0,0 +1,245 @@
+"""
+vecenv.py -- vectorized environments in worker processes
+========================================================
+This is module, which runs many CollectorEnv instances in worker processes
+and steps all of them at once.
+
+Observations, rewards and done flags of all environments live in one block
+of shared memory, viewed as NumPy arrays. Every environment writes its
+observation right into its own slot, and actions are read from the same
+block, so nothing is pickled on step: the main process and workers only
+meet at a barrier twice per step.
+"""
+
+import multiprocessing
+import threading
+import traceback
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # numpy is needed only for this module
+    np = None
+
+import CollectorGame.utils as ut
+import CollectorGame.env as env
+
+
+# commands of the main process to workers
+CMD_STEP: int = 0
+CMD_RESET: int = 1
+CMD_CLOSE: int = 2
+
+NO_SEED: int = -1
+
+Buffers = Dict[str, Any]  # name -> np.ndarray view of shared memory
+VecStepResult = Tuple[Any, Any, Any, Any]
+
+
+def layout(num_envs: int) -> List[Tuple[str, str, Tuple[int, ...]]]:
+    """Get (name, dtype, shape) of every shared buffer"""
+    obs_shape = (num_envs, env.CHANNELS, ut.BSIZE[1], ut.BSIZE[0])
+    return [('command', 'int64', (1,)),
+            ('actions', 'int64', (num_envs,)),
+            ('seeds', 'int64', (num_envs,)),
+            ('rewards', 'float32', (num_envs,)),
+            ('ticks', 'int32', (num_envs,)),  # ticks of the last episode
+            ('dones', 'bool', (num_envs,)),
+            ('won', 'bool', (num_envs,)),
+            ('obs', 'uint8', obs_shape)]
+
+
+def buffer_size(num_envs: int) -> int:
+    """Get size of shared memory block in bytes"""
+    size = 0
+    for name, dtype, shape in layout(num_envs):
+        size = -(-size // 8) * 8  # every buffer is 8-byte aligned
+        size += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return size
+
+
+def buffers(buf: memoryview, num_envs: int) -> Buffers:
+    """Make NumPy views of shared memory block"""
+    views = {}
+    offset = 0
+    for name, dtype, shape in layout(num_envs):
+        offset = -(-offset // 8) * 8
+        views[name] = np.ndarray(shape, dtype=dtype, buffer=buf,
+                                 offset=offset)
+        offset += views[name].nbytes
+    return views
+
+
+class EnvGroup:
+    """Environments of one worker, writing into shared buffers"""
+
+    def __init__(self, views: Buffers, first: int, last: int,
+                 max_ticks: int, win_mode: ut.WinCondition,
+                 autoreset: bool) -> None:
+        """Initialise environments with indices from first to last-1"""
+        self.views: Buffers = views
+        self.first: int = first
+        self.autoreset: bool = autoreset
+        self.envs: List[env.CollectorEnv] = [
+            env.CollectorEnv(max_ticks, win_mode, views['obs'][idx])
+            for idx in range(first, last)]
+
+    def execute(self, command: int) -> None:
+        """Perform command on all environments of the group"""
+        views = self.views
+        actions, seeds = views['actions'], views['seeds']
+        rewards, dones = views['rewards'], views['dones']
+        won, ticks = views['won'], views['ticks']
+        for idx, environment in enumerate(self.envs, self.first):
+            if command == CMD_RESET:
+                seed = int(seeds[idx])
+                environment.reset(None if seed == NO_SEED else seed)
+                rewards[idx], dones[idx], won[idx] = 0.0, False, False
+                continue
+            obs, reward, done, info = environment.step(int(actions[idx]))
+            rewards[idx], dones[idx] = reward, done
+            if done:
+                won[idx], ticks[idx] = info['is_won'], info['tick']
+                if self.autoreset:
+                    environment.reset()
+
+
+def work(name: str, num_envs: int, first: int, last: int,
+         max_ticks: int, win_mode: ut.WinCondition, autoreset: bool,
+         start: Any, finish: Any) -> None:
+    """Run environments of one worker process until told to close"""
+    block = shared_memory.SharedMemory(name=name)
+    views: Buffers = {}
+    group = None
+    try:
+        views = buffers(block.buf, num_envs)
+        group = EnvGroup(views, first, last, max_ticks, win_mode, autoreset)
+        while True:
+            start.wait()
+            command = int(views['command'][0])
+            if command == CMD_CLOSE:
+                break
+            group.execute(command)
+            finish.wait()
+    except threading.BrokenBarrierError:
+        pass  # main process has gone
+    except BaseException:
+        traceback.print_exc()
+        start.abort()
+        finish.abort()
+    finally:
+        del views, group
+        block.close()
+
+
+class VecEnv:
+    """Batch of CollectorEnv instances stepped together"""
+
+    def __init__(self, num_envs: int, workers: Optional[int] = None,
+                 max_ticks: int = 1000,
+                 win_mode: ut.WinCondition = ut.WinCondition.COLLECT_ALL,
+                 autoreset: bool = True) -> None:
+        """Initialise environments and start worker processes
+
+        Workers is number of processes (None means one per CPU, 0 means
+        running all environments in this process). With autoreset finished
+        environments start new level at once; done, won and ticks tell how
+        their episodes ended.
+        """
+        if np is None:
+            raise ImportError('VecEnv requires numpy')
+
+        self.num_envs: int = num_envs
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        workers = min(workers, num_envs)
+
+        self.block = shared_memory.SharedMemory(
+            create=True, size=buffer_size(num_envs))
+        self.views: Buffers = buffers(self.block.buf, num_envs)
+        self.views['seeds'][:] = NO_SEED
+        self.obs = self.views['obs']
+        self.rewards = self.views['rewards']
+        self.dones = self.views['dones']
+        self.won = self.views['won']
+        self.ticks = self.views['ticks']
+
+        bounds = [num_envs * idx // max(1, workers)
+                  for idx in range(workers + 1)]
+        self.local: Optional[EnvGroup] = None
+        self.processes: List[multiprocessing.Process] = []
+        if workers == 0:
+            self.local = EnvGroup(self.views, 0, num_envs, max_ticks,
+                                  win_mode, autoreset)
+            return
+
+        self.start_barrier = multiprocessing.Barrier(workers + 1)
+        self.finish_barrier = multiprocessing.Barrier(workers + 1)
+        for first, last in zip(bounds, bounds[1:]):
+            process = multiprocessing.Process(
+                target=work, daemon=True,
+                args=(self.block.name, num_envs, first, last, max_ticks,
+                      win_mode, autoreset, self.start_barrier,
+                      self.finish_barrier))
+            process.start()
+            self.processes.append(process)
+
+    def execute(self, command: int) -> None:
+        """Let all environments perform command and wait for them"""
+        self.views['command'][0] = command
+        if self.local is not None:
+            self.local.execute(command)
+            return
+        try:
+            self.start_barrier.wait()
+            self.finish_barrier.wait()
+        except threading.BrokenBarrierError:
+            raise RuntimeError('worker process of VecEnv failed')
+
+    def reset(self, seeds: Optional[Sequence[int]] = None) -> Any:
+        """Start new levels in all environments; return observations"""
+        self.views['seeds'][:] = NO_SEED if seeds is None else seeds
+        self.execute(CMD_RESET)
+        return self.obs
+
+    def step(self, actions: Sequence[int]) -> VecStepResult:
+        """Perform one tick in every environment
+
+        Returns (observations, rewards, dones, won). Arrays are views of
+        shared memory, which are overwritten on the next step.
+        """
+        self.views['actions'][:] = actions
+        self.execute(CMD_STEP)
+        return self.obs, self.rewards, self.dones, self.won
+
+    def close(self) -> None:
+        """Stop workers and free shared memory"""
+        if self.block is None:
+            return
+        if self.processes:
+            self.views['command'][0] = CMD_CLOSE
+            try:
+                self.start_barrier.wait(timeout=5)
+            except threading.BrokenBarrierError:
+                pass
+            for process in self.processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            self.processes = []
+        self.local = None
+        self.views = {}
+        self.obs = self.rewards = self.dones = self.won = self.ticks = None
+        try:
+            self.block.close()
+        except BufferError:
+            pass  # arrays are still used outside, memory goes with them
+        self.block.unlink()
+        self.block = None
+
+    def __enter__(self) -> 'VecEnv':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -27,5 +27,5 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     install_requires=requires,
-    python_requires='>=3.6',
+    python_requires='>=3.7',
 )